@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Measures what each extra DDPClient costs: resident memory, objects
+tracked by the garbage collector, open file descriptors and construction
+time.
+
+    $ python benchmarks/client_memory.py --clients 500
+    $ python benchmarks/client_memory.py --clients 200 --connect
+    $ python benchmarks/client_memory.py --clients 200 --connect --suspend
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import time
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp import DDPClient
+from ddp.bench import resident_memory
+
+from end_to_end import start_server
+
+
+def file_descriptors():
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def measure(clients, connect, suspend=False):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    process, url = start_server(0) if connect else (None, 'ws://x/websocket')
+    try:
+        # Leave out what the first client loads and builds once.
+        warm_up = DDPClient(loop, url, heartbeat_interval=None)
+        if connect:
+            loop.run_until_complete(warm_up.connect())
+        gc.collect()
+        objects = len(gc.get_objects())
+        memory = resident_memory()
+        descriptors = file_descriptors()
+        idle_timeout = 0.5 if suspend else None
+        start = time.time()
+        created = [DDPClient(loop, url, heartbeat_interval=None,
+                             idle_timeout=idle_timeout)
+                   for _ in range(clients)]
+        elapsed = time.time() - start
+        if connect:
+            loop.run_until_complete(asyncio.gather(
+                    *[client.connect() for client in created], loop=loop))
+        if suspend:
+            while any(client.is_connected() for client in created):
+                loop.run_until_complete(asyncio.sleep(0.1, loop=loop))
+        gc.collect()
+        result = {
+            'clients': clients,
+            'connected': connect,
+            'suspended': suspend,
+            'objects_per_client': (len(gc.get_objects()) - objects)
+                                  / clients,
+            'descriptors_per_client': (
+                    None if descriptors is None
+                    else (file_descriptors() - descriptors) / clients),
+            'bytes_per_client': (None if memory is None
+                                 else (resident_memory() - memory) / clients),
+            'construction_us': elapsed / clients * 1e6,
+        }
+        if connect:
+            loop.run_until_complete(asyncio.gather(
+                    *[client.close() for client in created + [warm_up]],
+                    loop=loop))
+        return result
+    finally:
+        loop.close()
+        if process is not None:
+            process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--connect', action='store_true',
+                        help='also connect each client to a local server')
+    parser.add_argument('--suspend', action='store_true',
+                        help='with --connect, let each client suspend while '
+                             'idle before measuring')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args()
+
+    result = measure(args.clients, args.connect, args.suspend)
+    if args.json:
+        print(json.dumps(result, indent=2, sort_keys=True))
+        return
+    print('{clients} clients: {objects_per_client:.0f} objects, '
+          '{construction_us:.0f} us to construct'.format(**result), end='')
+    if result['bytes_per_client'] is not None:
+        print(', {:.1f} KiB'.format(result['bytes_per_client'] / 1024),
+              end='')
+    if result['descriptors_per_client'] is not None:
+        print(', {:.1f} file descriptors'.format(
+                result['descriptors_per_client']), end='')
+    print(' per client')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''End-to-end benchmarks of DDPClient and ConcurrentDDPClient against the
+local DDPServer, which runs in its own process.
+
+    $ python benchmarks/end_to_end.py --calls 20000 --docs 50000
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From, Return
+
+from ddp import ConcurrentDDPClient, DDPClient
+from ddp.pubsub import LatencyHistogram, wait_all
+from ddp.testing import DDPServer
+
+
+def serve(connection, delay):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = DDPServer(loop)
+    server.add_echo_method(delay=delay)
+    server.add_flood_publication()
+    loop.run_until_complete(server.start())
+    connection.send(server.url)
+    loop.run_forever()
+
+
+def start_server(delay):
+    connection, child_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve,
+                                      args=(child_connection, delay))
+    process.daemon = True
+    process.start()
+    return process, connection.recv()
+
+
+def summarize(name, calls, elapsed, latencies, docs, ingest_elapsed):
+    return {
+        'client': name,
+        'calls': calls,
+        'calls_per_second': calls / elapsed,
+        'latency_p50_ms': latencies.percentile(50) * 1000,
+        'latency_p99_ms': latencies.percentile(99) * 1000,
+        'latency_p999_ms': latencies.percentile(99.9) * 1000,
+        'docs': docs,
+        'docs_per_second': docs / ingest_elapsed,
+    }
+
+
+def bench_ddp_client(url, calls, concurrency, docs, changes):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    client = DDPClient(loop, url, heartbeat_interval=None)
+    latencies = LatencyHistogram()
+    remaining = [calls]
+
+    @asyncio.coroutine
+    def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.time()
+            yield From(client.call_async('echo', remaining[0]))
+            latencies.record(time.time() - start)
+
+    @asyncio.coroutine
+    def run():
+        yield From(client.connect())
+        start = time.time()
+        yield From(asyncio.gather(*[worker() for _ in range(concurrency)],
+                                  loop=loop))
+        elapsed = time.time() - start
+        start = time.time()
+        yield From(client.subscribe_async('flood', docs, changes))
+        ingest_elapsed = time.time() - start
+        yield From(client.close())
+        raise Return(summarize('DDPClient', calls, elapsed, latencies, docs,
+                               ingest_elapsed))
+
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+
+def bench_concurrent_ddp_client(url, calls, concurrency, docs, changes):
+    client = ConcurrentDDPClient(url, heartbeat_interval=None)
+    client.start()
+    latencies = LatencyHistogram()
+    # Wait until connected.
+    client.call('echo').get(timeout=10)
+    start = time.time()
+    for batch_start in range(0, calls, concurrency):
+        batch_size = min(concurrency, calls - batch_start)
+        sent_at = time.time()
+        futures = client.call_many('echo', [[index]
+                                            for index in range(batch_size)])
+        for future in wait_all(futures, timeout=60):
+            latencies.record(time.time() - sent_at)
+    elapsed = time.time() - start
+    start = time.time()
+    client.subscribe('flood', docs, changes).get(timeout=600)
+    ingest_elapsed = time.time() - start
+    client.stop()
+    client.join()
+    return summarize('ConcurrentDDPClient', calls, elapsed, latencies, docs,
+                     ingest_elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--calls', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=100,
+                        help='calls in flight at once')
+    parser.add_argument('--delay', type=float, default=0,
+                        help='seconds the server waits before replying')
+    parser.add_argument('--docs', type=int, default=10000)
+    parser.add_argument('--changes', type=int, default=0,
+                        help='times each document is changed')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args()
+
+    process, url = start_server(args.delay)
+    try:
+        results = [
+            bench(url, args.calls, args.concurrency, args.docs, args.changes)
+            for bench in (bench_ddp_client, bench_concurrent_ddp_client)
+        ]
+    finally:
+        process.terminate()
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print('{client}: {calls_per_second:.0f} calls/s, latency p50 '
+              '{latency_p50_ms:.2f} ms, p99 {latency_p99_ms:.2f} ms, p99.9 '
+              '{latency_p999_ms:.2f} ms; {docs_per_second:.0f} docs/s'
+              .format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Times how long importing parts of ddp takes, each in a fresh
+interpreter, and how many modules each import loads.
+
+    $ python benchmarks/import_time.py --repeat 20 --json
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = [
+    'import ddp',
+    'import ddp.messages',
+    'from ddp.messages import MethodMessage',
+    'import ddp.pubsub',
+    'from ddp.pubsub import MessageBoard',
+    'from ddp import DDPClient',
+    'from ddp import ConcurrentDDPClient',
+]
+
+# Prints the seconds the statement took and the modules it loaded.
+TIMER = '''\
+import sys, time
+modules = len(sys.modules)
+start = time.time()
+%s
+sys.stdout.write('%%r %%d' %% (time.time() - start,
+                             len(sys.modules) - modules))
+'''
+
+
+def time_import(statement):
+    output = subprocess.check_output(
+            [sys.executable, '-c', TIMER % statement], cwd=ROOT)
+    seconds, modules = output.split()
+    return float(seconds), int(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\\n')[0])
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='interpreters to start per statement; the '
+                        'median is reported')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    for statement in STATEMENTS:
+        times = []
+        for _ in range(args.repeat):
+            seconds, modules = time_import(statement)
+            times.append(seconds)
+        times.sort()
+        results.append({
+            'statement': statement,
+            'median_ms': times[len(times) // 2] * 1000,
+            'min_ms': times[0] * 1000,
+            'modules': modules,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print('{statement:<40} {median_ms:>8.1f} ms {modules:>5} modules'
+              .format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Microbenchmarks of the hot path: message parsers and serializers, pod
+(JSON) parsing and serialization, topics and message board dispatch.
+
+Results can be written as JSON and compared with a stored baseline; the
+script exits with status 1 if any benchmark is slower than the baseline by
+more than the threshold.
+
+    $ python benchmarks/micro.py --output results.json
+    $ python benchmarks/micro.py --save-baseline
+
+Baselines are only comparable on the same machine and Python, so save one
+before changing the code and compare with it afterwards.
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp import messages
+from ddp.messages import (
+    AddedBeforeMessage,
+    AddedMessage,
+    ChangedMessage,
+    ConnectMessage,
+    ConnectedMessage,
+    ErrorMessage,
+    FailedMessage,
+    MethodMessage,
+    MovedBeforeMessage,
+    NosubMessage,
+    PingMessage,
+    PongMessage,
+    ReadyMessage,
+    RemovedMessage,
+    ResultMessage,
+    SubMessage,
+    UnsubMessage,
+    UpdatedMessage,
+)
+from ddp.pod.pod_message_parser import PodMessageParser
+from ddp.pod.pod_message_serializer import PodMessageSerializer
+from ddp.pubsub import MessageBoard, Topic
+from ddp.pubsub import pod_message_parser, pod_message_serializer
+from ddp.pubsub.topics import (MessageReceived, PodReceived, PodSend,
+                               RawReceived, RawSend)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'micro_baseline.json')
+
+
+# Corpora
+
+def document(size):
+    '''A document whose JSON is about ``size`` bytes.'''
+    fields = {'title': 'Document', 'done': False, 'rank': 3, 'tags': []}
+    index = 0
+    while len(json.dumps(fields)) < size:
+        fields['field{}'.format(index)] = 'x' * 64
+        index += 1
+    return fields
+
+
+SMALL = {'name': 'Ada', 'count': 3}
+DOCUMENT = document(10 * 1024)
+RESULT = [document(1024) for _ in range(1024)]
+
+# (name, message) pairs; every message type is represented at least once.
+MESSAGES = [
+    ('added_small', AddedMessage('tasks', 'a1', fields=SMALL)),
+    ('added_10kb', AddedMessage('tasks', 'a1', fields=DOCUMENT)),
+    ('added_before_small', AddedBeforeMessage('tasks', 'a1', 'a2',
+                                              fields=SMALL)),
+    ('changed_small', ChangedMessage('tasks', 'a1', cleared=['rank'],
+                                     fields=SMALL)),
+    ('changed_10kb', ChangedMessage('tasks', 'a1', fields=DOCUMENT)),
+    ('connect', ConnectMessage('1', support=['1', 'pre2', 'pre1'])),
+    ('connected', ConnectedMessage('s1')),
+    ('error', ErrorMessage('Already connected', {'msg': 'connect'})),
+    ('failed', FailedMessage('1')),
+    ('method_small', MethodMessage('1', 'upper', ['Hello, World!'])),
+    ('method_10kb', MethodMessage('1', 'insert', [DOCUMENT])),
+    ('moved_before', MovedBeforeMessage('tasks', 'a1', 'a2')),
+    ('nosub', NosubMessage('1')),
+    ('ping', PingMessage(id='1')),
+    ('pong', PongMessage(id='1')),
+    ('ready', ReadyMessage(['1', '2'])),
+    ('removed', RemovedMessage('tasks', 'a1')),
+    ('result_small', ResultMessage('1', result='HELLO, WORLD!')),
+    ('result_1mb', ResultMessage('1', result=RESULT)),
+    ('sub', SubMessage('1', 'tasks', params=[{'owner': 'a1'}])),
+    ('unsub', UnsubMessage('1')),
+    ('updated', UpdatedMessage(['1', '2'])),
+]
+
+
+def codec(message, suffix):
+    return getattr(messages, type(message).__name__ + suffix)()
+
+
+def pods():
+    return [(name, codec(message, 'Serializer').serialize(message))
+            for name, message in MESSAGES]
+
+
+def raws():
+    return [(name, json.dumps(pod)) for name, pod in pods()
+            if name in ('method_small', 'added_10kb', 'result_1mb')]
+
+
+# Benchmarks
+#
+# Each benchmark is a function that is called with the number of times to
+# run the operation being measured.
+
+def loop_over(operation, *args):
+    def bench(number):
+        for _ in xrange(number):
+            operation(*args)
+    return bench
+
+
+def drain(loop):
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+
+
+def board_bench(loop, board, topic, value, batch=1000):
+    def bench(number):
+        while number > 0:
+            for _ in xrange(min(number, batch)):
+                board.publish(topic, value)
+            drain(loop)
+            number -= batch
+    return bench
+
+
+def message_benchmarks():
+    for name, pod in pods():
+        parser = codec(dict(MESSAGES)[name], 'Parser')
+        yield 'parse_message_' + name, loop_over(parser.parse, pod)
+    for name, message in MESSAGES:
+        serializer = codec(message, 'Serializer')
+        yield 'serialize_message_' + name, loop_over(serializer.serialize,
+                                                     message)
+
+
+def pod_benchmarks():
+    parser = PodMessageParser()
+    serializer = PodMessageSerializer()
+    for name, raw in raws():
+        yield 'parse_pod_' + name, loop_over(parser.parse, raw)
+        yield 'serialize_pod_' + name, loop_over(serializer.serialize,
+                                                 json.loads(raw))
+
+
+def topic_benchmarks():
+    parent = MessageReceived
+    topic = MessageReceived + 'added'
+    yield 'topic_construct', loop_over(Topic, 'added', parent)
+    yield 'topic_add', loop_over(parent.__add__, 'added')
+    yield 'topic_hash', loop_over(hash, topic)
+    yield 'topic_eq', loop_over(topic.__eq__, MessageReceived + 'added')
+    yield 'topic_iter', loop_over(list, topic)
+
+
+def board_benchmarks(loop):
+    topic = MessageReceived + 'added'
+    for count in (0, 1, 10):
+        board = MessageBoard(loop)
+        for _ in range(count):
+            board.subscribe(topic, lambda topic, value: None)
+        yield ('board_dispatch_{}_subscribers'.format(count),
+               board_bench(loop, board, topic, None))
+
+    board = MessageBoard(loop)
+    for ancestor in topic:
+        board.subscribe(ancestor, lambda topic, value: None)
+    yield 'board_dispatch_ancestors', board_bench(loop, board, topic, None)
+
+    for name, raw in raws():
+        board = MessageBoard(loop)
+        pod_message_parser.PodMessageParser(board,
+                                            PodMessageParser()).subscribe()
+        board.subscribe(PodReceived, lambda topic, pod: None)
+        yield ('board_pod_message_parser_' + name,
+               board_bench(loop, board, RawReceived, raw))
+
+        board = MessageBoard(loop)
+        pod_message_serializer.PodMessageSerializer(
+                board, PodMessageSerializer()).subscribe()
+        board.subscribe(RawSend, lambda topic, raw: None)
+        yield ('board_pod_message_serializer_' + name,
+               board_bench(loop, board, PodSend, json.loads(raw)))
+
+
+def benchmarks(loop):
+    for group in (message_benchmarks(), pod_benchmarks(), topic_benchmarks(),
+                  board_benchmarks(loop)):
+        for name, bench in group:
+            yield name, bench
+
+
+# Running
+
+def time_bench(bench, min_time, repeat):
+    '''Return the best time per operation, in seconds, over ``repeat`` runs
+    each lasting at least ``min_time`` seconds.
+    '''
+    number = 1
+    while True:
+        start = time.time()
+        bench(number)
+        elapsed = time.time() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.time()
+        bench(number)
+        best = min(best, (time.time() - start) / number)
+    return best, number
+
+
+def run(names_filter, min_time, repeat):
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for name, bench in benchmarks(loop):
+            if names_filter and names_filter not in name:
+                continue
+            seconds, number = time_bench(bench, min_time, repeat)
+            results[name] = {'seconds': seconds, 'number': number}
+    finally:
+        loop.close()
+    return {
+        'python': platform.python_implementation() + ' ' +
+                  platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': results,
+    }
+
+
+def compare(results, baseline, threshold):
+    '''Return ``(name, baseline seconds, seconds, ratio)`` for each
+    benchmark in both, and the names of those slower than the baseline by
+    more than ``threshold``.
+    '''
+    rows = []
+    regressions = []
+    old = baseline['benchmarks']
+    for name, result in sorted(results['benchmarks'].items()):
+        if name not in old:
+            continue
+        ratio = result['seconds'] / old[name]['seconds']
+        rows.append((name, old[name]['seconds'], result['seconds'], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * scale >= 1:
+            return '{:.2f} {}'.format(seconds * scale, unit)
+    return '{:.0f} ns'.format(seconds * 1e9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--filter', help='only run benchmarks whose name '
+                        'contains this')
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help='seconds each timed run lasts at least')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per benchmark, the best is kept')
+    parser.add_argument('--output', help='write the results as JSON here')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='results to compare with')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results to the baseline instead of '
+                        'comparing with it')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fraction slower than the baseline that counts '
+                        'as a regression')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.min_time, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+        return
+
+    if not os.path.exists(args.baseline):
+        for name, result in sorted(results['benchmarks'].items()):
+            print('{:<48} {:>12}'.format(name,
+                                         format_seconds(result['seconds'])))
+        return
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    rows, regressions = compare(results, baseline, args.threshold)
+    for name, old, new, ratio in rows:
+        print('{:<48} {:>12} {:>12} {:>7.2f}x{}'.format(
+                name, format_seconds(old), format_seconds(new), ratio,
+                ' REGRESSION' if name in regressions else ''))
+    if regressions:
+        print('{} of {} benchmarks regressed by more than {:.0%}'.format(
+                len(regressions), len(rows), args.threshold))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
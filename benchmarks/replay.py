@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Replays a traffic capture through a DDPClient, with no server, and
+reports how long parsing, dispatch and store updates took. Record a capture
+by passing ``record_path`` to a client.
+
+    $ python benchmarks/replay.py traffic.cap --repeat 5
+    $ python benchmarks/replay.py traffic.cap --profile --sort tottime
+    $ python benchmarks/replay.py traffic.cap --board-profile
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import cProfile
+import pstats
+import time
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp import DDPClient
+
+
+def replay(path, realtime, speed, board_profile=False):
+    '''Replay the capture at ``path`` into a new client and return the
+    number of messages and the seconds they took.
+
+    If ``board_profile`` is true, the client's board is profiled and the
+    report printed.
+    '''
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        client = DDPClient(loop, 'ws://replay/websocket',
+                           heartbeat_interval=None)
+        if board_profile:
+            client.start_profiling()
+        start = time.time()
+        count = loop.run_until_complete(
+                client.replay_async(path, realtime=realtime, speed=speed))
+        elapsed = time.time() - start
+        if board_profile:
+            print(client.stop_profiling().report())
+        return count, elapsed
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='capture written by a client with '
+                        'record_path')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='replays to run, the best is reported')
+    parser.add_argument('--realtime', action='store_true',
+                        help='keep the gaps between messages')
+    parser.add_argument('--speed', type=float, default=1,
+                        help='with --realtime, replay this many times faster')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile one replay and print the statistics')
+    parser.add_argument('--board-profile', action='store_true',
+                        help='print the time spent in each subscriber')
+    parser.add_argument('--sort', default='cumulative',
+                        help='order of the profile statistics')
+    parser.add_argument('--limit', type=int, default=30,
+                        help='number of profile lines to print')
+    args = parser.parse_args()
+
+    if args.profile:
+        profile = cProfile.Profile()
+        profile.enable()
+        count, elapsed = replay(args.path, args.realtime, args.speed)
+        profile.disable()
+        pstats.Stats(profile).sort_stats(args.sort).print_stats(args.limit)
+        return
+
+    if args.board_profile:
+        replay(args.path, args.realtime, args.speed, board_profile=True)
+        return
+
+    best = None
+    for _ in range(args.repeat):
+        count, elapsed = replay(args.path, args.realtime, args.speed)
+        best = elapsed if best is None else min(best, elapsed)
+    print('{} messages in {:.3f} s, {:.0f} messages/s'.format(
+            count, best, count / best if best else float('inf')))
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .ddp_client import *
-from .concurrent_ddp_client import *
+from ddp.utils import lazy_exports
 
+lazy_exports(__name__, {
+    '.ddp_client': ['DDPClient'],
+    '.concurrent_ddp_client': ['ConcurrentDDPClient'],
+    '.ddp_client_hub': ['DDPClientHub'],
+    '.ddp_client_pool': [
+        'DDPClientPool',
+        'ROUTE_LEAST_IN_FLIGHT',
+        'ROUTE_ROUND_ROBIN',
+    ],
+    '.loop_thread': ['LoopThread'],
+    '.metrics_exporter': ['MetricsExporter'],
+    '.sharded_ddp_client': ['ShardedDDPClient'],
+})
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Load generator: runs many DDPClients against a server and reports
+throughput, latency percentiles, reconnections and memory per client.
+
+    $ python -m ddp.bench ws://127.0.0.1:3000/websocket --clients 100 \\
+          --threads 4 --method echo --params '["hello"]' --rate 2000
+'''
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From
+
+from .ddp_client import DDPClient
+from .pubsub import LatencyHistogram
+
+__all__ = ['LoadGenerator', 'main', 'resident_memory', 'run', 'summarize']
+
+
+class LoadGenerator(object):
+    '''Drives ``clients`` DDPClients on one loop.
+
+    Calls are made either in a closed loop, each client keeping
+    ``concurrency`` calls in flight, or, if ``rate`` is given, in an open
+    loop at ``rate`` calls per second over all clients. In the open loop a
+    call's latency is measured from when it was due to be sent, so a slow
+    client does not hide its own queueing.
+
+    :param subscriptions: ``(name, params)`` pairs each client subscribes
+                          to, and waits to be ready, before calls start.
+    '''
+
+    def __init__(self, loop, url, clients, method, params=(), concurrency=1,
+                 rate=None, subscriptions=(), client_kwargs=None):
+        super(LoadGenerator, self).__init__()
+        self._loop = loop
+        self._method = method
+        self._params = list(params)
+        self._concurrency = concurrency
+        self._rate = rate
+        self._subscriptions = list(subscriptions)
+        self._clients = [DDPClient(loop, url, **(client_kwargs or {}))
+                         for _ in range(clients)]
+        self._latencies = LatencyHistogram()
+        self._calls = 0
+        self._errors = 0
+        self._failures = 0
+
+    @asyncio.coroutine
+    def connect(self):
+        yield From(asyncio.gather(*[client.connect()
+                                    for client in self._clients],
+                                  loop=self._loop))
+        for name, params in self._subscriptions:
+            yield From(asyncio.gather(*[client.subscribe_async(name, *params)
+                                        for client in self._clients],
+                                      loop=self._loop))
+
+    @asyncio.coroutine
+    def run(self, duration):
+        '''Make calls for ``duration`` seconds, then wait for the calls still
+        in flight.
+        '''
+        deadline = self._loop.time() + duration
+        if self._rate is None:
+            workers = [self._closed_loop(client, deadline)
+                       for client in self._clients
+                       for _ in range(self._concurrency)]
+        else:
+            workers = [self._open_loop(deadline)]
+        yield From(asyncio.gather(*workers, loop=self._loop))
+
+    @asyncio.coroutine
+    def close(self):
+        yield From(asyncio.gather(*[client.close()
+                                    for client in self._clients],
+                                  loop=self._loop))
+
+    @asyncio.coroutine
+    def _closed_loop(self, client, deadline):
+        while self._loop.time() < deadline:
+            yield From(self._call(client, self._loop.time()))
+
+    @asyncio.coroutine
+    def _open_loop(self, deadline):
+        interval = 1 / self._rate
+        due = self._loop.time()
+        calls = []
+        index = 0
+        while due < deadline:
+            delay = due - self._loop.time()
+            if delay > 0:
+                yield From(asyncio.sleep(delay, loop=self._loop))
+            client = self._clients[index % len(self._clients)]
+            calls.append(asyncio.Task(self._call(client, due),
+                                      loop=self._loop))
+            index += 1
+            due += interval
+        if calls:
+            yield From(asyncio.wait(calls, loop=self._loop))
+
+    @asyncio.coroutine
+    def _call(self, client, start):
+        try:
+            result_message = yield From(client.call_async(self._method,
+                                                          *self._params))
+        except Exception:
+            self._failures += 1
+            return
+        self._latencies.record(self._loop.time() - start)
+        self._calls += 1
+        if result_message.has_error():
+            self._errors += 1
+
+    def result(self):
+        reconnects = 0
+        for client in self._clients:
+            stats = client.stats()
+            reconnects += stats['reconnect_attempts']
+        return {
+            'clients': len(self._clients),
+            'calls': self._calls,
+            'errors': self._errors,
+            'failures': self._failures,
+            'latencies': self._latencies,
+            'reconnects': reconnects,
+        }
+
+
+def resident_memory():
+    '''Return the resident set size of this process in bytes, or ``None``
+    if it cannot be read.
+    '''
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is the peak, in kilobytes on Linux and bytes on OS X.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if os.uname()[0] == 'Darwin' else maxrss * 1024
+
+
+def _run_worker(url, clients, options, rss_before=None):
+    '''Run a LoadGenerator on a new loop and return its result, with the
+    process's memory before the clients were created and once they had
+    connected.
+    '''
+    if rss_before is None:
+        rss_before = resident_memory()
+    rate = options['rate_per_client']
+    loop = asyncio.new_event_loop()
+    # autobahn uses the current loop.
+    asyncio.set_event_loop(loop)
+    generator = LoadGenerator(loop, url, clients, options['method'],
+                              params=options['params'],
+                              concurrency=options['concurrency'],
+                              rate=None if rate is None else rate * clients,
+                              subscriptions=options['subscriptions'],
+                              client_kwargs=options['client_kwargs'])
+    try:
+        loop.run_until_complete(generator.connect())
+        rss_connected = resident_memory()
+        start = time.time()
+        loop.run_until_complete(generator.run(options['duration']))
+        elapsed = time.time() - start
+        loop.run_until_complete(generator.close())
+    finally:
+        loop.close()
+    result = generator.result()
+    result.update(elapsed=elapsed, pid=os.getpid(), rss_before=rss_before,
+                  rss_connected=rss_connected)
+    return result
+
+
+def _run_threads(url, clients, options, threads):
+    '''Run ``clients`` over ``threads`` threads (on this thread if
+    ``threads`` is 0) and return their results.
+    '''
+    rss_before = resident_memory()
+    if not threads:
+        return [_run_worker(url, clients, options, rss_before)]
+    results = []
+    def target(count):
+        results.append(_run_worker(url, count, options, rss_before))
+    workers = [threading.Thread(target=target, args=(count,))
+               for count in _split(clients, threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def _run_process(connection, url, clients, options, threads):
+    try:
+        connection.send(_run_threads(url, clients, options, threads))
+    finally:
+        connection.close()
+
+
+def _split(total, parts):
+    '''Split ``total`` into ``parts`` (at most ``total``) near-equal
+    positive numbers.
+    '''
+    parts = max(1, min(parts, total))
+    return [total // parts + (index < total % parts)
+            for index in range(parts)]
+
+
+def run(url, clients=1, processes=0, threads=0, method='echo', params=(),
+        concurrency=1, rate=None, duration=10, subscriptions=(),
+        client_kwargs=None):
+    '''Run the load and return a summary of the results.
+
+    Clients are spread over ``processes`` processes (this one if 0) and,
+    within each, over ``threads`` threads with a loop each (this thread if
+    0). ``rate`` is for all clients together.
+    '''
+    options = {
+        'method': method,
+        'params': list(params),
+        'concurrency': concurrency,
+        'rate_per_client': None if rate is None else rate / clients,
+        'duration': duration,
+        'subscriptions': list(subscriptions),
+        'client_kwargs': client_kwargs,
+    }
+    if not processes:
+        return summarize(_run_threads(url, clients, options, threads))
+    children = []
+    for count in _split(clients, processes):
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+                target=_run_process,
+                args=(child_connection, url, count, options, threads))
+        process.start()
+        children.append((process, connection))
+    results = []
+    for process, connection in children:
+        results.extend(connection.recv())
+        process.join()
+    return summarize(results)
+
+
+def summarize(results):
+    '''Combine the results of each loop into one summary.'''
+    latencies = LatencyHistogram()
+    for result in results:
+        latencies.merge(result['latencies'])
+
+    # Memory is per process; threads share theirs.
+    memory = {}
+    for result in results:
+        before, connected = result['rss_before'], result['rss_connected']
+        if before is None or connected is None:
+            memory = None
+            break
+        memory[result['pid']] = max(memory.get(result['pid'], 0),
+                                    connected - before)
+
+    def total(key):
+        return sum(result[key] for result in results)
+
+    def milliseconds(value):
+        return None if value is None else value * 1000
+
+    clients = total('clients')
+    elapsed = max(result['elapsed'] for result in results)
+    return {
+        'clients': clients,
+        'calls': total('calls'),
+        'errors': total('errors'),
+        'failures': total('failures'),
+        'calls_per_second': total('calls') / elapsed,
+        'latency_p50_ms': milliseconds(latencies.percentile(50)),
+        'latency_p99_ms': milliseconds(latencies.percentile(99)),
+        'latency_p999_ms': milliseconds(latencies.percentile(99.9)),
+        'latency_max_ms': milliseconds(latencies.max),
+        'reconnects': total('reconnects'),
+        'memory_per_client': (None if memory is None
+                              else sum(memory.values()) / clients),
+    }
+
+
+def _subscription(values):
+    if len(values) > 2:
+        raise argparse.ArgumentTypeError('expected NAME [PARAMS]')
+    params = json.loads(values[1]) if len(values) == 2 else []
+    return values[0], params
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('url', help='e.g., ws://127.0.0.1:3000/websocket')
+    parser.add_argument('--clients', type=int, default=1)
+    parser.add_argument('--processes', type=int, default=0,
+                        help='processes to spread clients over (default: '
+                        'run in this one)')
+    parser.add_argument('--threads', type=int, default=0,
+                        help='threads, each with its own loop, to spread '
+                        'each process\'s clients over (default: one loop)')
+    parser.add_argument('--method', default='echo')
+    parser.add_argument('--params', type=json.loads, default=[],
+                        help='JSON list of parameters')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='calls each client keeps in flight (closed '
+                        'loop)')
+    parser.add_argument('--rate', type=float,
+                        help='calls per second over all clients (open loop, '
+                        'ignores --concurrency)')
+    parser.add_argument('--duration', type=float, default=10,
+                        help='seconds to make calls for')
+    parser.add_argument('--subscribe', nargs='+', action='append',
+                        default=[], metavar=('NAME', 'PARAMS'),
+                        help='subscribe each client to NAME, with an '
+                        'optional JSON list of parameters, before calling')
+    parser.add_argument('--heartbeat-interval', type=float, default=17.5)
+    parser.add_argument('--json', action='store_true',
+                        help='print the summary as JSON')
+    args = parser.parse_args(args)
+
+    try:
+        subscriptions = [_subscription(values) for values in args.subscribe]
+    except (argparse.ArgumentTypeError, ValueError) as error:
+        parser.error('--subscribe: {}'.format(error))
+
+    summary = run(args.url, clients=args.clients, processes=args.processes,
+                  threads=args.threads, method=args.method,
+                  params=args.params, concurrency=args.concurrency,
+                  rate=args.rate, duration=args.duration,
+                  subscriptions=subscriptions,
+                  client_kwargs={
+                      'heartbeat_interval': args.heartbeat_interval,
+                  })
+
+    if args.json:
+        print(json.dumps(summary, indent=2, sort_keys=True))
+        return
+    print('{clients} clients: {calls} calls ({errors} errors, {failures} '
+          'failed), {calls_per_second:.0f} calls/s'.format(**summary))
+    if summary['calls']:
+        print('latency p50 {latency_p50_ms:.2f} ms, p99 {latency_p99_ms:.2f} '
+              'ms, p99.9 {latency_p999_ms:.2f} ms, max {latency_max_ms:.2f} '
+              'ms'.format(**summary))
+    print('{} reconnects'.format(summary['reconnects']))
+    if summary['memory_per_client'] is not None:
+        print('{:.1f} KiB per client'.format(
+                summary['memory_per_client'] / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -19,61 +19,149 @@ from __future__ import division
 from __future__ import print_function
 
 import threading
-
-from .utils import ensure_asyncio
-ensure_asyncio()
-import asyncio
+from collections import deque
 
 from .ddp_client import DDPClient
+from .loop_thread import LoopThread
 from .pubsub.future import Future
 
 __all__ = ['ConcurrentDDPClient']
 
 
 class ConcurrentDDPClient(object):
-    def __init__(self, url, debug=False):
+    '''A ``DDPClient`` running on a background thread, with blocking
+    calls.
+
+    Each client runs its own thread unless given a ``loop_thread`` (see
+    ``LoopThread`` and ``DDPClientHub``) to share with other clients. A
+    client on a shared thread is started and stopped without affecting the
+    others; stopping it closes its connection.
+    '''
+
+    def __init__(self, url, debug=False, loop_thread=None, **kwargs):
         self._client = None
-        self._condition = threading.Condition()
-        self._loop = None
-        self._ready = False
-        self._thread = threading.Thread(
-            target=self._run,
-            name='DDPClient',
-            args=(url, debug),
-        )
-
-    def _run(self, url, debug):
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        self._client = DDPClient(self._loop, url, debug=debug)
+        self._client_args = (url, debug, kwargs)
+        self._closed = None
+        self._owns_thread = loop_thread is None
+        if loop_thread is None:
+            loop_thread = LoopThread()
+        self._loop = loop_thread.loop
+        self._loop_thread = loop_thread
+        self._submit_lock = threading.Lock()
+        self._submitted = deque()
+        self._submit_scheduled = False
+
+    def _open(self):
+        url, debug, kwargs = self._client_args
+        self._client = DDPClient(self._loop, url, debug=debug, **kwargs)
         self._client.open()
-        with self._condition:
-            self._ready = True
-            self._condition.notify_all()
-        self._loop.run_forever()
+
+    def _close(self):
+        self._client.stop_profiling()
+        return self._client.close(drain=False)
 
     def start(self):
-        with self._condition:
-            self._thread.start()
-            while not self._ready:
-                self._condition.wait()
+        if self._owns_thread:
+            self._loop_thread.start()
+        self._loop_thread.call(self._open).get()
 
     def stop(self):
-        self._loop.stop()
+        if self._owns_thread:
+            self._loop_thread.stop()
+        else:
+            self._closed = self._loop_thread.call(self._close)
 
     def join(self):
-        self._thread.join()
-        self._loop.close()
+        if self._owns_thread:
+            self._loop_thread.join()
+        else:
+            self._closed.get()
 
-    def call(self, method, *params):
-        async_future = asyncio.Future(loop=self._loop)
-        self._call_soon(self._client.call, async_future, method, *params)
+    def call(self, method, *params, **kwargs):
         future = Future()
-        def callback(async_future):
-            future.set(async_future.result())
-        async_future.add_done_callback(callback)
+        self._submit([(future, method, params, kwargs)])
         return future
 
+    def call_many(self, method, params_iterable, **kwargs):
+        '''Call a method once for each sequence of parameters and return a
+        list of futures, handing the calls to the loop thread in one go.
+        '''
+        calls = [(Future(), method, params, kwargs)
+                 for params in params_iterable]
+        self._submit(calls)
+        return [call[0] for call in calls]
+
+    def subscribe(self, name, *params):
+        '''Subscribe and return a future for the subscription's ID that is
+        done once the subscription is ready.
+        '''
+        return self._loop_thread.call(self._client.subscribe_async, name,
+                                      *params)
+
+    def unsubscribe(self, id):
+        self._call_soon(self._client.unsubscribe, id)
+
+    def cache_method(self, method, ttl):
+        self._call_soon(self._client.cache_method, method, ttl)
+
+    def uncache_method(self, method):
+        self._call_soon(self._client.uncache_method, method)
+
+    def reconnect_now(self):
+        self._call_soon(self._client.reconnect_now)
+
+    def warm_up(self):
+        '''Reconnect a client suspended while idle (see ``idle_timeout``)
+        ahead of calls expected soon, and return a future that is done once
+        it is connected.
+        '''
+        return self._loop_thread.call(self._client.connect)
+
+    def stats(self):
+        return self._loop_thread.call(self._client.stats).get()
+
+    @property
+    def metrics(self):
+        return self._loop_thread.call(lambda: self._client.metrics).get()
+
+    def serve_metrics(self, host='127.0.0.1', port=9464):
+        return self._client.serve_metrics(host=host, port=port)
+
+    def start_profiling(self, sample_rate=0, report_interval=None,
+                        on_report=print):
+        self._call_soon(self._client.start_profiling, sample_rate,
+                        report_interval, on_report)
+
+    def stop_profiling(self):
+        self._call_soon(self._client.stop_profiling)
+
+    def profile_report(self, limit=20):
+        '''Return the profiler's report, or ``None`` if not profiling.'''
+        def report():
+            profiler = self._client.profiler
+            return None if profiler is None else profiler.report(limit)
+        return self._loop_thread.call(report).get()
+
     def _call_soon(self, *args, **kwargs):
         return self._loop.call_soon_threadsafe(*args, **kwargs)
 
+    def _submit(self, calls):
+        # Wake the loop once per batch, rather than once per call.
+        with self._submit_lock:
+            self._submitted.extend(calls)
+            if self._submit_scheduled or not self._submitted:
+                return
+            self._submit_scheduled = True
+        self._call_soon(self._drain_submitted)
+
+    def _drain_submitted(self):
+        with self._submit_lock:
+            calls = list(self._submitted)
+            self._submitted.clear()
+            self._submit_scheduled = False
+        for future, method, params, kwargs in calls:
+            try:
+                self._client.call(future, method, *params, **kwargs)
+            except Exception as error:
+                future.set_exception(error)
+
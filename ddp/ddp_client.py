@@ -18,9 +18,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+
 from ddp.utils import ensure_asyncio
 ensure_asyncio()
 
+import asyncio
+from asyncio import From, Return
+
 from autobahn.asyncio.websocket import WebSocketClientFactory
 
 from ddp import pubsub
@@ -58,61 +63,391 @@ from ddp.pod import (
     PodMessageSerializer,
 )
 
+from ddp.metrics_exporter import MetricsExporter
+from ddp.store import SQLiteSnapshot, Store
+
 __all__ = ['DDPClient']
 
 
+# Parsers and serializers are stateless, so every client shares them.
+_PARSERS = pubsub.MessageParsers.table([
+    AddedBeforeMessageParser(),
+    AddedMessageParser(),
+    ChangedMessageParser(),
+    ConnectedMessageParser(),
+    ErrorMessageParser(),
+    FailedMessageParser(),
+    MovedBeforeMessageParser(),
+    NosubMessageParser(),
+    PingMessageParser(),
+    PongMessageParser(),
+    ReadyMessageParser(),
+    RemovedMessageParser(),
+    ResultMessageParser(),
+    UpdatedMessageParser(),
+])
+
+_SERIALIZERS = pubsub.MessageSerializers.table([
+    ConnectMessageSerializer(),
+    MethodMessageSerializer(),
+    PingMessageSerializer(),
+    PongMessageSerializer(),
+    SubMessageSerializer(),
+    UnsubMessageSerializer(),
+])
+
+_POD_MESSAGE_FILTER = PodMessageFilter()
+_POD_MESSAGE_PARSER = PodMessageParser()
+_POD_MESSAGE_SERIALIZER = PodMessageSerializer()
+
+
 class DDPClient(object):
-    def __init__(self, loop, url, debug=False):
+    def __init__(self, loop, url, debug=False, snapshot_path=None,
+                 snapshot_interval=60, max_in_flight=None,
+                 adaptive_window=False, call_timeout=None,
+                 on_disconnect=pubsub.DISCONNECT_RESEND, backoff=None,
+                 heartbeat_interval=17.5, heartbeat_timeout=15,
+                 parse_offload_threshold=None, parse_executor=None,
+                 cache_max_entries=1024, cache_max_bytes=16 * 1024 * 1024,
+                 coalesce_calls=False, method_metrics=False,
+                 record_path=None, idle_timeout=None):
         super(DDPClient, self).__init__()
         ids = build_id_generator()
         self._board = board = pubsub.MessageBoard(loop)
-        self._caller = pubsub.MethodCaller(board, MethodMessageFactory(ids))
+        self._cache = pubsub.ResultCache(max_entries=cache_max_entries,
+                                         max_bytes=cache_max_bytes)
+        # A connection that is still being opened when the client is
+        # closed is closed as soon as it opens.
+        self._closer = pubsub.Subscriber(board, {
+                pubsub.SocketOpened: self._on_opened_while_closing})
+        self._closing = False
+        self._loop = loop
+        self._metrics = pubsub.MethodMetrics() if method_metrics else None
+        self._opened = False
+        self._profile_handle = None
+        self._recorder = None
+        self._snapshotter = None
+        self._state = pubsub.ConnectionState(board)
+        self._caller = pubsub.MethodCaller(
+                board, MethodMessageFactory(ids),
+                window=self._build_window(max_in_flight, adaptive_window),
+                loop=loop, timeout=call_timeout, on_disconnect=on_disconnect,
+                cache=self._cache, coalesce=coalesce_calls,
+                metrics=self._metrics)
+        self._store = store = Store()
+        self._subs = pubsub.SubscriptionManager(board, ids)
+        updater = pubsub.StoreUpdater(
+                board, store, has_subscriptions=self._subs.has_subscriptions)
+        self._reconnector = pubsub.SocketReconnector(board, loop,
+                                                     backoff=backoff)
+        self._suspender = None
+        if idle_timeout is not None:
+            self._suspender = pubsub.IdleSuspender(
+                    board, loop, self._reconnector, self._caller,
+                    self._is_busy, idle_timeout)
+        self._heartbeat = None
+        if heartbeat_interval is not None:
+            self._heartbeat = pubsub.Heartbeat(board, loop,
+                                               interval=heartbeat_interval,
+                                               timeout=heartbeat_timeout)
         factory = WebSocketClientFactory(url=url, loop=loop)
         factory.protocol = pubsub.SocketPublisherFactory(board)
         subscribers = [
             self._caller,
+            self._state,
+            self._subs,
+            updater,
             pubsub.DDPConnector(board),
             pubsub.Ponger(board),
             pubsub.Outbox(board),
-            pubsub.SocketReconnector(board),
+            self._reconnector,
             pubsub.SocketConnector(board, loop, factory),
 
-            pubsub.MessageParser(board, AddedBeforeMessageParser()),
-            pubsub.MessageParser(board, AddedMessageParser()),
-            pubsub.MessageParser(board, ChangedMessageParser()),
-            pubsub.MessageParser(board, ConnectedMessageParser()),
-            pubsub.MessageParser(board, ErrorMessageParser()),
-            pubsub.MessageParser(board, FailedMessageParser()),
-            pubsub.MessageParser(board, MovedBeforeMessageParser()),
-            pubsub.MessageParser(board, NosubMessageParser()),
-            pubsub.MessageParser(board, PingMessageParser()),
-            pubsub.MessageParser(board, PongMessageParser()),
-            pubsub.MessageParser(board, ReadyMessageParser()),
-            pubsub.MessageParser(board, RemovedMessageParser()),
-            pubsub.MessageParser(board, ResultMessageParser()),
-            pubsub.MessageParser(board, UpdatedMessageParser()),
-
-            pubsub.MessageSerializer(board, ConnectMessageSerializer()),
-            pubsub.MessageSerializer(board, MethodMessageSerializer()),
-            pubsub.MessageSerializer(board, PingMessageSerializer()),
-            pubsub.MessageSerializer(board, PongMessageSerializer()),
-            pubsub.MessageSerializer(board, SubMessageSerializer()),
-            pubsub.MessageSerializer(board, UnsubMessageSerializer()),
-
-            pubsub.PodMessageFilter(board, PodMessageFilter()),
-            pubsub.PodMessageParser(board, PodMessageParser()),
-            pubsub.PodMessageSerializer(board, PodMessageSerializer()),
+            pubsub.MessageParsers(board, _PARSERS),
+            pubsub.MessageSerializers(board, _SERIALIZERS),
+
+            pubsub.PodMessageFilter(board, _POD_MESSAGE_FILTER),
+            pubsub.PodMessageParser(board, _POD_MESSAGE_PARSER, loop=loop,
+                                    offload_threshold=parse_offload_threshold,
+                                    executor=parse_executor),
+            pubsub.PodMessageSerializer(board, _POD_MESSAGE_SERIALIZER),
         ]
 
+        if self._heartbeat is not None:
+            subscribers.append(self._heartbeat)
+
+        if self._suspender is not None:
+            subscribers.append(self._suspender)
+
+        if snapshot_path is not None:
+            snapshot = SQLiteSnapshot(snapshot_path)
+            if snapshot.load(store):
+                updater.begin_resync()
+            self._snapshotter = pubsub.Snapshotter(board, loop, store,
+                                                   snapshot, snapshot_interval)
+            subscribers.append(self._snapshotter)
+
+        if record_path is not None:
+            record_file = open(record_path, 'ab')
+            record_file.seek(0, os.SEEK_END)
+            self._recorder = pubsub.TrafficRecorder(board, record_file)
+            subscribers.append(self._recorder)
+
         if debug:
             subscribers.append(pubsub.Logger(board))
 
         for subscriber in subscribers:
             subscriber.subscribe()
 
+    @staticmethod
+    def _build_window(max_in_flight, adaptive):
+        if max_in_flight is None:
+            return None
+        if adaptive:
+            return pubsub.AdaptiveWindow(initial=min(16, max_in_flight),
+                                         maximum=max_in_flight)
+        return pubsub.FixedWindow(max_in_flight)
+
     def open(self):
+        '''Open the connection, if not already open.'''
+        if self._closing:
+            raise RuntimeError('a closed client cannot be opened again')
+        if self._opened:
+            return
+        self._opened = True
         self._board.publish(pubsub.SocketOpen)
 
-    def call(self, future, method, *params):
-        self._caller.call(future, method, list(params))
+    def connect(self):
+        '''Open the connection, if not already open, and return a future
+        that is done once the client is connected.
+
+        A client suspended while idle is resumed, so this also warms the
+        connection up ahead of calls expected soon.
+        '''
+        self._touch()
+        future = asyncio.Future(loop=self._loop)
+        self._state.when_connected(lambda: _set_result(future, None))
+        if not self._opened:
+            self.open()
+        return future
+
+    def close(self, drain=True):
+        '''Stop reconnecting and close the connection.
+
+        If ``drain`` is true, the connection is closed once every call has
+        its result (or has failed). Calls still without a result, and calls
+        made after closing, fail with ``ConnectionLostError``. Returns a
+        future that is done once the socket has closed.
+        '''
+        future = asyncio.Future(loop=self._loop)
+        def on_closed():
+            _set_result(future, None)
+        def wait_closed():
+            if (self._state.is_socket_open()
+                    or self._state.is_socket_opening()):
+                self._state.when_closed(on_closed)
+            else:
+                on_closed()
+        def shut_down():
+            if not self._closing:
+                self._closer.subscribe()
+            self._closing = True
+            self._caller.fail_all(_closed_error())
+            if self._suspender is not None:
+                self._suspender.unsubscribe()
+            self._reconnector.unsubscribe()
+            if self._heartbeat is not None:
+                self._heartbeat.unsubscribe()
+            if self._snapshotter is not None:
+                self._snapshotter.save()
+                self._snapshotter.unsubscribe()
+            if self._state.is_socket_open():
+                self._state.when_closed(on_closed)
+                self._board.publish(pubsub.SocketClose)
+            else:
+                # Once any SocketOpen already published has been seen.
+                self._loop.call_soon(wait_closed)
+        if drain:
+            self._caller.when_drained(shut_down)
+        else:
+            shut_down()
+        if self._recorder is not None:
+            future.add_done_callback(lambda future: self._recorder.close())
+        return future
+
+    def _on_opened_while_closing(self, topic):
+        self._board.publish(pubsub.SocketClose)
+
+    def is_connected(self):
+        return self._state.is_connected()
+
+    def is_suspended(self):
+        '''Whether the connection is closed because the client was idle
+        (see ``idle_timeout``).
+        '''
+        return self._suspender is not None and self._suspender.is_suspended()
+
+    def _is_busy(self):
+        return bool(self._caller.in_flight or self._caller.queued
+                    or self._subs.has_subscriptions())
+
+    def _touch(self):
+        if self._suspender is not None and not self._closing:
+            self._suspender.touch()
+
+    def reconnect_now(self):
+        self._reconnector.retry_now()
+
+    def call(self, future, method, *params, **kwargs):
+        timeout = kwargs.pop('timeout', None)
+        on_disconnect = kwargs.pop('on_disconnect', None)
+        if kwargs:
+            raise TypeError('unexpected keyword arguments: {}'.format(
+                    ', '.join(sorted(kwargs))))
+        if self._closing:
+            future.set_exception(_closed_error())
+            return
+        self._touch()
+        self._caller.call(future, method, list(params), timeout=timeout,
+                          on_disconnect=on_disconnect)
+
+    def cache_method(self, method, ttl):
+        '''Cache the results of ``method`` for ``ttl`` seconds; calls with
+        the same parameters meanwhile are answered without the server.
+        '''
+        self._caller.cache_method(method, ttl)
+
+    def uncache_method(self, method):
+        self._caller.uncache_method(method)
+
+    def call_async(self, method, *params, **kwargs):
+        '''Call a method and return a future for its result message.'''
+        future = asyncio.Future(loop=self._loop)
+        self.call(future, method, *params, **kwargs)
+        return future
+
+    def subscribe(self, name, *params):
+        self._touch()
+        return self._subs.sub(name, list(params))
+
+    def subscribe_async(self, name, *params):
+        '''Subscribe and return a future for the subscription's ID that is
+        done once the subscription is ready.
+        '''
+        self._touch()
+        future = asyncio.Future(loop=self._loop)
+        self._subs.sub(name, list(params), future=future)
+        return future
+
+    def unsubscribe(self, id):
+        self._subs.unsub(id)
+
+    def replay_async(self, path, realtime=False, speed=1):
+        '''Feed the messages received in a capture, written with
+        ``record_path``, through this client as if they came from a server.
+        Returns a future for the number of messages replayed.
+
+        The client should not be opened, and should be created with
+        ``heartbeat_interval=None`` unless the capture has pongs for its
+        pings.
+        '''
+        @asyncio.coroutine
+        def replay():
+            replayer = pubsub.TrafficReplayer(self._board, self._loop)
+            with open(path, 'rb') as capture:
+                count = yield From(replayer.replay(
+                        pubsub.read_traffic(capture), realtime=realtime,
+                        speed=speed))
+            raise Return(count)
+        return asyncio.Task(replay(), loop=self._loop)
+
+    @property
+    def metrics(self):
+        '''The ``MethodMetrics``, if ``method_metrics`` is true.'''
+        return self._metrics
+
+    def serve_metrics(self, host='127.0.0.1', port=9464):
+        '''Start serving the method metrics over HTTP for Prometheus and
+        return the ``MetricsExporter``.
+        '''
+        if self._metrics is None:
+            raise RuntimeError('method_metrics must be true to serve them')
+        exporter = MetricsExporter(self._metrics.prometheus, host=host,
+                                   port=port)
+        exporter.start()
+        return exporter
+
+    def start_profiling(self, sample_rate=0, report_interval=None,
+                        on_report=print):
+        '''Time every subscriber the board calls, sampling ``sample_rate``
+        of the calls with cProfile, and return the ``BoardProfiler``.
+
+        If ``report_interval`` is given, ``on_report`` is called with the
+        profiler's report every ``report_interval`` seconds.
+        '''
+        self.stop_profiling()
+        profiler = pubsub.BoardProfiler(sample_rate=sample_rate)
+        self._board.set_profiler(profiler)
+        if report_interval is not None:
+            def report():
+                on_report(profiler.report())
+                self._profile_handle = self._loop.call_later(
+                        report_interval, report)
+            self._profile_handle = self._loop.call_later(report_interval,
+                                                         report)
+        return profiler
+
+    def stop_profiling(self):
+        '''Stop profiling and return the profiler, if any, which keeps what
+        it recorded.
+        '''
+        if self._profile_handle is not None:
+            self._profile_handle.cancel()
+            self._profile_handle = None
+        profiler = self._board.profiler
+        self._board.set_profiler(None)
+        return profiler
+
+    @property
+    def profiler(self):
+        return self._board.profiler
+
+    @property
+    def board(self):
+        return self._board
+
+    @property
+    def store(self):
+        return self._store
+
+    def stats(self):
+        return {
+            'method_calls_awaiting_resend': self._caller.awaiting_resend,
+            'method_calls_coalesced': self._caller.coalesced,
+            'method_calls_in_flight': self._caller.in_flight,
+            'method_calls_queued': self._caller.queued,
+            'method_calls_timed_out': self._caller.timed_out,
+            'method_call_window': self._caller.window_limit,
+            'method_cache_bytes': self._cache.bytes,
+            'method_cache_entries': len(self._cache),
+            'method_cache_hits': self._cache.hits,
+            'method_cache_misses': self._cache.misses,
+            'reconnect_attempts': self._reconnector.attempts,
+            'reconnect_failures': self._reconnector.failures,
+            'heartbeat_latency': (None if self._heartbeat is None
+                                  else self._heartbeat.latency),
+            'heartbeat_timeouts': (0 if self._heartbeat is None
+                                   else self._heartbeat.timeouts),
+            'idle_suspended': self.is_suspended(),
+            'idle_suspensions': (0 if self._suspender is None
+                                 else self._suspender.suspensions),
+        }
+
+
+def _closed_error():
+    return pubsub.ConnectionLostError('the client is closed')
+
 
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+import threading
+
+from .concurrent_ddp_client import ConcurrentDDPClient
+from .loop_thread import LoopThread
+
+__all__ = ['DDPClientHub']
+
+
+class DDPClientHub(object):
+    '''Hosts many ``ConcurrentDDPClient``s on a fixed number of shared
+    loop threads, rather than one thread per client.
+
+    ``client`` returns a new client on one of the ``threads`` loop threads,
+    which are dealt out in turn. Each client is started and stopped as
+    usual, and has the same blocking API. Stopping the hub stops its
+    threads, along with any clients still running on them.
+
+    Extra keyword arguments are passed to each client, and can be
+    overridden per client.
+    '''
+
+    def __init__(self, threads=1, **kwargs):
+        if threads < 1:
+            raise ValueError('threads must be at least 1')
+        super(DDPClientHub, self).__init__()
+        self._client_kwargs = kwargs
+        self._lock = threading.Lock()
+        self._loop_threads = [LoopThread(name='DDPClientHub-{}'.format(index))
+                              for index in range(threads)]
+        self._next = itertools.cycle(self._loop_threads)
+
+    def start(self):
+        for loop_thread in self._loop_threads:
+            loop_thread.start()
+
+    def stop(self):
+        for loop_thread in self._loop_threads:
+            loop_thread.stop()
+
+    def join(self):
+        for loop_thread in self._loop_threads:
+            loop_thread.join()
+
+    def client(self, url, **kwargs):
+        '''Return a new, unstarted ``ConcurrentDDPClient`` on one of the
+        hub's threads.
+        '''
+        client_kwargs = dict(self._client_kwargs, **kwargs)
+        with self._lock:
+            loop_thread = next(self._next)
+        return ConcurrentDDPClient(url, loop_thread=loop_thread,
+                                   **client_kwargs)
+
+    @property
+    def loop_threads(self):
+        return list(self._loop_threads)
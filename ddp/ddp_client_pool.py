@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from .ddp_client import DDPClient
+
+__all__ = [
+    'DDPClientPool',
+    'ROUTE_LEAST_IN_FLIGHT',
+    'ROUTE_ROUND_ROBIN',
+]
+
+ROUTE_LEAST_IN_FLIGHT = 'least_in_flight'
+ROUTE_ROUND_ROBIN = 'round_robin'
+
+
+class DDPClientPool(object):
+    '''Spreads method calls over several connections to the same server.
+
+    Meteor runs a connection's methods one at a time (unless a method
+    calls ``this.unblock()``), so one slow method holds up every call
+    behind it on that connection. A pool of ``size`` clients lets other
+    calls carry on over the other connections.
+
+    Calls go to the connected client with the fewest unfinished calls
+    (``ROUTE_LEAST_IN_FLIGHT``) or to each client in turn
+    (``ROUTE_ROUND_ROBIN``). Calls given a ``key`` always go to the same
+    client, so calls with the same key run in order.
+
+    A client that stays disconnected for ``replace_after`` seconds is
+    closed and replaced by a new one, and its unfinished calls are made
+    again on the new one. A client suspended while idle (see
+    ``idle_timeout``) is not replaced.
+
+    Extra keyword arguments are passed to each ``DDPClient``. Pass
+    ``client_factory``, a callable taking no arguments, to build the
+    clients some other way.
+    '''
+
+    def __init__(self, loop, url, size=4, routing=ROUTE_LEAST_IN_FLIGHT,
+                 replace_after=30, client_factory=None, **kwargs):
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        if routing not in (ROUTE_LEAST_IN_FLIGHT, ROUTE_ROUND_ROBIN):
+            raise ValueError('routing must be ROUTE_LEAST_IN_FLIGHT or '
+                             'ROUTE_ROUND_ROBIN, not {!r}'.format(routing))
+        super(DDPClientPool, self).__init__()
+        if client_factory is None:
+            client_factory = lambda: DDPClient(loop, url, **kwargs)
+        self._check_handle = None
+        self._client_factory = client_factory
+        self._closing = False
+        self._down_since = [None] * size
+        self._loop = loop
+        self._next = 0
+        self._opened = False
+        self._pending = [{} for _ in range(size)]
+        self._replace_after = replace_after
+        self._replacements = 0
+        self._routing = routing
+        self._clients = [client_factory() for _ in range(size)]
+
+    def open(self):
+        if self._closing:
+            raise RuntimeError('a closed pool cannot be opened again')
+        self._opened = True
+        now = self._loop.time()
+        for index, client in enumerate(self._clients):
+            client.open()
+            self._down_since[index] = now
+        self._schedule_check()
+
+    def connect(self):
+        '''Open the pool, if not already open, and return a future that is
+        done once every client is connected.
+        '''
+        if not self._opened:
+            self.open()
+        futures = [client.connect() for client in self._clients]
+        return asyncio.gather(*futures, loop=self._loop)
+
+    def close(self, drain=True):
+        '''Close every client (see ``DDPClient.close``) and return a
+        future that is done once they have all closed.
+        '''
+        self._closing = True
+        if self._check_handle is not None:
+            self._check_handle.cancel()
+            self._check_handle = None
+        futures = [client.close(drain=drain) for client in self._clients]
+        return asyncio.gather(*futures, loop=self._loop)
+
+    def is_connected(self):
+        '''Whether any client is connected.'''
+        return any(client.is_connected() for client in self._clients)
+
+    def call(self, future, method, *params, **kwargs):
+        '''Call a method on one of the clients (see ``DDPClient.call``).
+
+        :param key: Calls with the same key go to the same client.
+        '''
+        key = kwargs.pop('key', None)
+        if key is None:
+            index = self._route()
+        else:
+            index = hash(key) % len(self._clients)
+        self._call(index, future, method, params, kwargs)
+
+    def call_async(self, method, *params, **kwargs):
+        '''Call a method and return a future for its result message.'''
+        future = asyncio.Future(loop=self._loop)
+        self.call(future, method, *params, **kwargs)
+        return future
+
+    @property
+    def clients(self):
+        return list(self._clients)
+
+    def stats(self):
+        return {
+            'clients': [client.stats() for client in self._clients],
+            'clients_connected': sum(1 for client in self._clients
+                                     if client.is_connected()),
+            'clients_replaced': self._replacements,
+            'method_calls_pending': [len(pending)
+                                     for pending in self._pending],
+        }
+
+    def _call(self, index, future, method, params, kwargs):
+        # The client completes a future of the pool's own, so that the call
+        # can be taken from it if it is replaced (and closing it fails its
+        # calls).
+        client_future = asyncio.Future(loop=self._loop)
+        # Check the arguments before tracking the call.
+        self._clients[index].call(client_future, method, *params, **kwargs)
+        pending = self._pending[index]
+        pending[client_future] = (future, method, params, kwargs)
+        client_future.add_done_callback(
+                lambda client_future: _on_call_done(pending, client_future))
+
+    def _route(self):
+        size = len(self._clients)
+        candidates = [(self._next + offset) % size for offset in range(size)]
+        connected = [index for index in candidates
+                     if self._clients[index].is_connected()]
+        if connected:
+            candidates = connected
+        if self._routing == ROUTE_ROUND_ROBIN:
+            index = candidates[0]
+        else:
+            # Ties go to whichever client is next in turn.
+            index = min(candidates,
+                        key=lambda index: len(self._pending[index]))
+        self._next = (index + 1) % size
+        return index
+
+    def _schedule_check(self):
+        if self._replace_after is None or self._closing:
+            return
+        self._check_handle = self._loop.call_later(self._replace_after / 2,
+                                                   self._check)
+
+    def _check(self):
+        self._check_handle = None
+        now = self._loop.time()
+        for index, client in enumerate(self._clients):
+            # A client suspended while idle is not down.
+            if client.is_connected() or client.is_suspended():
+                self._down_since[index] = None
+            elif self._down_since[index] is None:
+                self._down_since[index] = now
+            elif now - self._down_since[index] >= self._replace_after:
+                self._replace(index)
+        self._schedule_check()
+
+    def _replace(self, index):
+        old_client = self._clients[index]
+        calls = list(self._pending[index].values())
+        self._pending[index].clear()
+        self._clients[index] = client = self._client_factory()
+        self._pending[index] = {}
+        self._down_since[index] = self._loop.time()
+        self._replacements += 1
+        client.open()
+        old_client.close(drain=False)
+        for future, method, params, kwargs in calls:
+            if not future.done():
+                self._call(index, future, method, params, kwargs)
+
+
+def _on_call_done(pending, client_future):
+    call = pending.pop(client_future, None)
+    if call is None or call[0].done():
+        return
+    future = call[0]
+    if client_future.cancelled():
+        future.cancel()
+    elif client_future.exception() is not None:
+        future.set_exception(client_future.exception())
+    else:
+        future.set_result(client_future.result())
+
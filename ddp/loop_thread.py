@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+from .utils import ensure_asyncio
+ensure_asyncio()
+import asyncio
+
+from .pubsub.future import Future
+
+__all__ = ['LoopThread']
+
+
+class LoopThread(object):
+    '''Runs an event loop on a background thread.
+
+    Any number of ``ConcurrentDDPClient``s can share one (pass it as
+    ``loop_thread``), rather than each running a thread of its own.
+    '''
+
+    def __init__(self, name='DDPClient'):
+        super(LoopThread, self).__init__()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def join(self):
+        self._thread.join()
+        self._loop.close()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def call_soon(self, callback, *args):
+        return self._loop.call_soon_threadsafe(callback, *args)
+
+    def call(self, function, *args):
+        '''Call a function on the loop thread and return a future for its
+        result.
+
+        If the function returns a coroutine or an asyncio future, the
+        future is for the outcome of that instead.
+        '''
+        future = Future()
+        def call():
+            try:
+                result = function(*args)
+            except Exception as error:
+                future.set_exception(error)
+                return
+            if asyncio.iscoroutine(result):
+                result = asyncio.Task(result, loop=self._loop)
+            if isinstance(result, asyncio.Future):
+                result.add_done_callback(
+                        lambda result: _copy_outcome(result, future))
+            else:
+                future.set_result(result)
+        self.call_soon(call)
+        return future
+
+    @property
+    def loop(self):
+        return self._loop
+
+
+def _copy_outcome(source, destination):
+    if source.cancelled():
+        destination.cancel()
+    elif source.exception() is not None:
+        destination.set_exception(source.exception())
+    else:
+        destination.set_result(source.result())
@@ -18,18 +18,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .message import *
-from .message_parser import *
-from .message_serializer import *
+from ddp.utils import lazy_exports
 
-from .ping_message import *
-from .ping_message_parser import *
-from .ping_message_serializer import *
+lazy_exports(__name__, {
+    '.message': ['Message'],
+    '.message_parser': ['MessageParser'],
+    '.message_serializer': ['MessageSerializer'],
 
-from .pong_message import *
-from .pong_message_parser import *
-from .pong_message_serializer import*
+    '.ping_message': ['PingMessage'],
+    '.ping_message_parser': ['PingMessageParser'],
+    '.ping_message_serializer': ['PingMessageSerializer'],
 
-from .client import *
-from .server import *
+    '.pong_message': ['PongMessage'],
+    '.pong_message_parser': ['PongMessageParser'],
+    '.pong_message_serializer': ['PongMessageSerializer'],
 
+    '.client': '*',
+    '.server': '*',
+})
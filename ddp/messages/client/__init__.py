@@ -18,26 +18,29 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .constants import *
+from ddp.utils import lazy_exports
 
-from .client_message import *
-from .client_message_parser import *
-from .client_message_serializer import *
+lazy_exports(__name__, {
+    '.constants': ['MSG_CONNECT', 'MSG_METHOD', 'MSG_SUB', 'MSG_UNSUB'],
 
-from .connect_message import *
-from .connect_message_parser import *
-from .connect_message_serializer import *
+    '.client_message': ['ClientMessage'],
+    '.client_message_parser': ['ClientMessageParser'],
+    '.client_message_serializer': ['ClientMessageSerializer'],
 
-from .method_message import *
-from .method_message_factory import *
-from .method_message_parser import *
-from .method_message_serializer import *
+    '.connect_message': ['ConnectMessage'],
+    '.connect_message_parser': ['ConnectMessageParser'],
+    '.connect_message_serializer': ['ConnectMessageSerializer'],
 
-from .sub_message import *
-from .sub_message_parser import *
-from .sub_message_serializer import *
+    '.method_message': ['MethodMessage'],
+    '.method_message_factory': ['MethodMessageFactory'],
+    '.method_message_parser': ['MethodMessageParser'],
+    '.method_message_serializer': ['MethodMessageSerializer'],
 
-from .unsub_message import *
-from .unsub_message_parser import *
-from .unsub_message_serializer import *
+    '.sub_message': ['SubMessage'],
+    '.sub_message_parser': ['SubMessageParser'],
+    '.sub_message_serializer': ['SubMessageSerializer'],
 
+    '.unsub_message': ['UnsubMessage'],
+    '.unsub_message_parser': ['UnsubMessageParser'],
+    '.unsub_message_serializer': ['UnsubMessageSerializer'],
+})
@@ -18,57 +18,73 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .constants import *
-
-from .server_message import *
-from .server_message_parser import *
-from .server_message_serializer import *
-
-from .added_message import *
-from .added_message_parser import *
-from .added_message_serializer import *
-
-from .added_before_message import *
-from .added_before_message_parser import *
-from .added_before_message_serializer import *
-
-from .changed_message import *
-from .changed_message_parser import *
-from .changed_message_serializer import *
-
-from .connected_message import *
-from .connected_message_parser import *
-from .connected_message_serializer import *
-
-from .error_message import *
-from .error_message_parser import *
-from .error_message_serializer import *
-
-from .failed_message import *
-from .failed_message_parser import *
-from .failed_message_serializer import *
-
-from .moved_before_message import *
-from .moved_before_message_parse import *
-from .moved_before_message_serializer import *
-
-from .nosub_message import *
-from .nosub_message_parser import *
-from .nosub_message_serializer import *
-
-from .ready_message import *
-from .ready_message_parser import *
-from .ready_message_serializer import *
-
-from .removed_message import *
-from .removed_message_parser import *
-from .removed_message_serializer import *
-
-from .result_message import *
-from .result_message_parser import *
-from .result_message_serializer import *
-
-from .updated_message import *
-from .updated_message_parser import *
-from .updated_message_serializer import *
-
+from ddp.utils import lazy_exports
+
+lazy_exports(__name__, {
+    '.constants': [
+        'MSG_ADDED',
+        'MSG_ADDED_BEFORE',
+        'MSG_CHANGED',
+        'MSG_CONNECTED',
+        'MSG_ERROR',
+        'MSG_FAILED',
+        'MSG_MOVED_BEFORE',
+        'MSG_NOSUB',
+        'MSG_READY',
+        'MSG_REMOVED',
+        'MSG_RESULT',
+        'MSG_UPDATED',
+    ],
+
+    '.server_message': ['ServerMessage'],
+    '.server_message_parser': ['ServerMessageParser'],
+    '.server_message_serializer': ['ServerMessageSerializer'],
+
+    '.added_message': ['AddedMessage'],
+    '.added_message_parser': ['AddedMessageParser'],
+    '.added_message_serializer': ['AddedMessageSerializer'],
+
+    '.added_before_message': ['AddedBeforeMessage'],
+    '.added_before_message_parser': ['AddedBeforeMessageParser'],
+    '.added_before_message_serializer': ['AddedBeforeMessageSerializer'],
+
+    '.changed_message': ['ChangedMessage'],
+    '.changed_message_parser': ['ChangedMessageParser'],
+    '.changed_message_serializer': ['ChangedMessageSerializer'],
+
+    '.connected_message': ['ConnectedMessage'],
+    '.connected_message_parser': ['ConnectedMessageParser'],
+    '.connected_message_serializer': ['ConnectedMessageSerializer'],
+
+    '.error_message': ['ErrorMessage'],
+    '.error_message_parser': ['ErrorMessageParser'],
+    '.error_message_serializer': ['ErrorMessageSerializer'],
+
+    '.failed_message': ['FailedMessage'],
+    '.failed_message_parser': ['FailedMessageParser'],
+    '.failed_message_serializer': ['FailedMessageSerializer'],
+
+    '.moved_before_message': ['MovedBeforeMessage'],
+    '.moved_before_message_parse': ['MovedBeforeMessageParser'],
+    '.moved_before_message_serializer': ['MovedBeforeMessageSerializer'],
+
+    '.nosub_message': ['NosubMessage'],
+    '.nosub_message_parser': ['NosubMessageParser'],
+    '.nosub_message_serializer': ['NosubMessageSerializer'],
+
+    '.ready_message': ['ReadyMessage'],
+    '.ready_message_parser': ['ReadyMessageParser'],
+    '.ready_message_serializer': ['ReadyMessageSerializer'],
+
+    '.removed_message': ['RemovedMessage'],
+    '.removed_message_parser': ['RemovedMessageParser'],
+    '.removed_message_serializer': ['RemovedMessageSerializer'],
+
+    '.result_message': ['ResultMessage'],
+    '.result_message_parser': ['ResultMessageParser'],
+    '.result_message_serializer': ['ResultMessageSerializer'],
+
+    '.updated_message': ['UpdatedMessage'],
+    '.updated_message_parser': ['UpdatedMessageParser'],
+    '.updated_message_serializer': ['UpdatedMessageSerializer'],
+})
@@ -32,6 +32,6 @@ class AddedBeforeMessageParser(ServerMessageParser):
             pod['collection'],
             pod['id'],
             pod['before'],
-            feilds=pod.get('fields'),
+            fields=pod.get('fields'),
         )
 
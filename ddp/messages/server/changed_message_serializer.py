@@ -29,8 +29,8 @@ class ChangedMessageSerializer(ServerMessageSerializer):
 
     def serialize_fields(self, message):
         fields = {'collection': message.collection, 'id': message.id}
-        if message.has_clear():
-            fields['clear'] = message.clear
+        if message.has_cleared():
+            fields['cleared'] = message.cleared
         if message.has_fields():
             fields['fields'] = message.fields
         return fields
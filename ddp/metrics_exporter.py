@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+__all__ = ['MetricsExporter']
+
+
+class MetricsExporter(object):
+    '''Serves metrics over HTTP in the Prometheus text format, from a
+    background thread.
+
+    :param metrics: A callable that returns the text to serve (e.g., the
+                    ``prometheus`` method of a ``MethodMetrics``).
+    :param port: The port to listen on, or 0 to pick a free one.
+    '''
+
+    def __init__(self, metrics, host='127.0.0.1', port=9464):
+        super(MetricsExporter, self).__init__()
+        self._server = HTTPServer((host, port), _build_handler(metrics))
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='MetricsExporter')
+        self._thread.daemon = True
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def _build_handler(metrics):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
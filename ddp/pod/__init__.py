@@ -18,7 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .pod_message_filter import *
-from .pod_message_parser import *
-from .pod_message_serializer import *
+from ddp.utils import lazy_exports
 
+lazy_exports(__name__, {
+    '.pod_message_filter': ['PodMessageFilter'],
+    '.pod_message_parser': ['PodMessageParser'],
+    '.pod_message_serializer': ['PodMessageSerializer'],
+})
@@ -18,8 +18,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from ddp.pubsub.subscriber import Subscriber
-
 __all__ = ['PodMessageFilter']
 
 
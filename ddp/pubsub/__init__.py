@@ -18,25 +18,104 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from .ddp_connector import *
-from .future import *
-from .logger import *
-from .message_board import *
-from .message_parser import *
-from .message_serializer import *
-from .method_caller import *
-from .outbox import *
-from .pod_message_filter import *
-from .pod_message_parser import *
-from .pod_message_serializer import *
-from .ponger import *
-from .socket_connector import *
-from .socket_publisher import *
-from .socket_publisher_factory import *
-from .socket_reconnector import *
-from .subscriber import *
-from .timeout import *
-from .timeout_error import *
-from .topic import *
-from .topics import *
+from ddp.utils import lazy_exports
 
+lazy_exports(__name__, {
+    '.adaptive_window': ['AdaptiveWindow'],
+    '.as_completed': ['as_completed'],
+    '.backoff': ['Backoff'],
+    '.board_profiler': ['BoardProfiler'],
+    '.call_key': ['call_key'],
+    '.connection_lost_error': ['ConnectionLostError'],
+    '.connection_state': ['ConnectionState'],
+    '.constants': [
+        'DDP_VERSIONS',
+        'DISCONNECT_FAIL',
+        'DISCONNECT_RESEND',
+        'TRAFFIC_FRAME_FORMAT',
+        'TRAFFIC_MAGIC',
+        'TRAFFIC_RECEIVED',
+        'TRAFFIC_SENT',
+    ],
+    '.ddp_connector': ['DDPConnector'],
+    '.deadline_heap': ['DeadlineHeap'],
+    '.fixed_window': ['FixedWindow'],
+    '.future': ['Future'],
+    '.heartbeat': ['Heartbeat'],
+    '.idle_suspender': ['IdleSuspender'],
+    '.interruptible_condition': ['InterruptibleCondition'],
+    '.latency_histogram': ['LatencyHistogram'],
+    '.logger': ['Logger'],
+    '.message_board': ['MessageBoard'],
+    '.message_parser': ['MessageParser'],
+    '.message_parsers': ['MessageParsers'],
+    '.message_serializer': ['MessageSerializer'],
+    '.message_serializers': ['MessageSerializers'],
+    '.method_caller': ['MethodCaller'],
+    '.method_metrics': ['MethodMetrics'],
+    '.outbox': ['Outbox'],
+    '.pod_message_filter': ['PodMessageFilter'],
+    '.pod_message_parser': ['PodMessageParser'],
+    '.pod_message_serializer': ['PodMessageSerializer'],
+    '.ponger': ['Ponger'],
+    '.read_traffic': ['read_traffic'],
+    '.result_cache': ['ResultCache'],
+    '.snapshotter': ['Snapshotter'],
+    '.socket_connector': ['SocketConnector'],
+    '.socket_publisher': ['SocketPublisher'],
+    '.socket_publisher_factory': ['SocketPublisherFactory'],
+    '.socket_reconnector': ['SocketReconnector'],
+    '.store_updater': ['StoreUpdater'],
+    '.subscriber': ['Subscriber'],
+    '.subscription_error': ['SubscriptionError'],
+    '.subscription_manager': ['SubscriptionManager'],
+    '.timeout': ['Timeout'],
+    '.timeout_error': ['TimeoutError'],
+    '.topic': ['RootTopic', 'Topic'],
+    '.topics': [
+        'Document',
+        'DocumentAdded',
+        'DocumentChanged',
+        'DocumentRemoved',
+        'Message',
+        'MessageReceived',
+        'MessageReceivedAdded',
+        'MessageReceivedChanged',
+        'MessageReceivedConnected',
+        'MessageReceivedFailed',
+        'MessageReceivedMethod',
+        'MessageReceivedNosub',
+        'MessageReceivedPing',
+        'MessageReceivedPong',
+        'MessageReceivedReady',
+        'MessageReceivedRemoved',
+        'MessageReceivedResult',
+        'MessageSend',
+        'MessageSendConnect',
+        'MessageSendMethod',
+        'MessageSendPing',
+        'MessageSendPong',
+        'MessageSendSub',
+        'MessageSendUnsub',
+        'Pod',
+        'PodAccepted',
+        'PodReceived',
+        'PodRejected',
+        'PodSend',
+        'Raw',
+        'RawReceived',
+        'RawSend',
+        'Socket',
+        'SocketAbort',
+        'SocketClose',
+        'SocketClosed',
+        'SocketError',
+        'SocketOpen',
+        'SocketOpened',
+        'Subscriptions',
+        'SubscriptionsReady',
+    ],
+    '.traffic_recorder': ['TrafficRecorder'],
+    '.traffic_replayer': ['TrafficReplayer'],
+    '.wait_all': ['wait_all'],
+})
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+__all__ = ['AdaptiveWindow']
+
+
+class AdaptiveWindow(object):
+    '''Adjusts the number of method calls allowed in flight by round-trip
+    time.
+
+    Each method's round-trip times are smoothed (an exponentially weighted
+    moving average with weight ``smoothing``) and compared with the lowest
+    one seen for that method, which is re-estimated every ``period``
+    results. So naturally slow methods, a lasting change in the server's
+    speed and one unusually fast reply do not skew the comparison for long.
+    The window grows by roughly one call per window's worth of results
+    while smoothed times stay within ``tolerance`` times the lowest, and
+    shrinks by ``backoff``, at most once per window's worth of results,
+    while they do not, i.e., when the server starts queuing calls.
+    '''
+
+    def __init__(self, initial=16, minimum=1, maximum=1024, tolerance=2.0,
+                 backoff=0.9, smoothing=0.2, period=100):
+        super(AdaptiveWindow, self).__init__()
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError('must have 1 <= minimum <= initial <= maximum')
+        self._backoff = backoff
+        self._estimates = {}
+        self._limit = float(initial)
+        self._maximum = maximum
+        self._minimum = minimum
+        self._period = period
+        self._since_backoff = 0
+        self._smoothing = smoothing
+        self._tolerance = tolerance
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def min_rtt(self, method):
+        '''The lowest recent round-trip time of ``method``, or ``None`` if
+        it has not been called.
+        '''
+        estimate = self._estimates.get(method)
+        return None if estimate is None else estimate.min_rtt
+
+    def update(self, method, rtt):
+        estimate = self._estimates.get(method)
+        if estimate is None:
+            estimate = _RttEstimate(self._smoothing, self._period)
+            self._estimates[method] = estimate
+        estimate.add(rtt)
+        self._since_backoff += 1
+        if estimate.smoothed > estimate.min_rtt * self._tolerance:
+            if self._since_backoff >= self._limit:
+                self._since_backoff = 0
+                self._limit = max(self._minimum, self._limit * self._backoff)
+        else:
+            self._limit = min(self._maximum, self._limit + 1 / self._limit)
+
+
+class _RttEstimate(object):
+    def __init__(self, smoothing, period):
+        super(_RttEstimate, self).__init__()
+        self.min_rtt = None
+        self.smoothed = None
+        self._period = period
+        self._period_min = None
+        self._samples = 0
+        self._smoothing = smoothing
+
+    def add(self, rtt):
+        if self.smoothed is None:
+            self.smoothed = rtt
+        else:
+            self.smoothed += self._smoothing * (rtt - self.smoothed)
+        if self.min_rtt is None or rtt < self.min_rtt:
+            self.min_rtt = rtt
+        if self._period_min is None or rtt < self._period_min:
+            self._period_min = rtt
+        self._samples += 1
+        if self._samples == self._period:
+            # Start again from the last period alone, so that the minimum
+            # can rise.
+            self.min_rtt = self._period_min
+            self._period_min = None
+            self._samples = 0
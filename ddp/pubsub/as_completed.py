@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import deque
+
+from .interruptible_condition import InterruptibleCondition
+from .timeout import Timeout
+
+__all__ = ['as_completed']
+
+
+def as_completed(futures, timeout=None):
+    '''Yield futures as they complete.
+
+    Works with any futures that have ``add_done_callback``. However many
+    futures are given, the calling thread waits on a single condition
+    and wakes once per batch of completions rather than once per future.
+
+    :raises TimeoutError: If ``timeout`` seconds pass before all of the
+                          futures complete.
+    '''
+    futures = set(futures)
+    condition = InterruptibleCondition()
+    completed = deque()
+
+    def on_done(future):
+        with condition:
+            completed.append(future)
+            condition.notify_all()
+
+    for future in futures:
+        future.add_done_callback(on_done)
+
+    get_remaining = None if timeout is None else Timeout(timeout).get_remaining
+    remaining = len(futures)
+    while remaining:
+        with condition:
+            while not completed:
+                condition.wait(None if get_remaining is None
+                               else get_remaining())
+            batch = list(completed)
+            completed.clear()
+        remaining -= len(batch)
+        for future in batch:
+            yield future
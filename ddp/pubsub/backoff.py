@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import random
+
+__all__ = ['Backoff']
+
+
+class Backoff(object):
+    '''Exponential back-off with optional full jitter.
+
+    The n-th consecutive delay is at most ``initial * multiplier ** n``,
+    capped at ``maximum``. With jitter, the delay is drawn uniformly
+    between zero and that bound, which spreads out clients that all lost
+    their connections at the same time.
+    '''
+
+    def __init__(self, initial=0.1, maximum=60, multiplier=2, jitter=True):
+        super(Backoff, self).__init__()
+        if not 0 <= initial <= maximum:
+            raise ValueError('must have 0 <= initial <= maximum')
+        if multiplier < 1:
+            raise ValueError('multiplier must be at least 1')
+        self._attempts = 0
+        self._initial = initial
+        self._jitter = jitter
+        self._maximum = maximum
+        self._multiplier = multiplier
+
+    @property
+    def attempts(self):
+        '''The number of delays since the last reset.'''
+        return self._attempts
+
+    def next_delay(self):
+        bound = self._initial * self._multiplier ** self._attempts
+        bound = min(self._maximum, bound)
+        self._attempts += 1
+        if self._jitter:
+            return random.uniform(0, bound)
+        return bound
+
+    def reset(self):
+        self._attempts = 0
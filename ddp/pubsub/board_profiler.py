@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import cProfile
+import pstats
+import random
+import threading
+import time
+from StringIO import StringIO
+
+__all__ = ['BoardProfiler']
+
+
+class BoardProfiler(object):
+    '''Times each call of a subscriber by a ``MessageBoard`` and totals the
+    time by subscriber and topic.
+
+    A ``sample_rate`` fraction of calls is also run under ``cProfile``, to
+    show where within the subscribers the time goes.
+
+    The board records to it on the loop; it may be read from any thread.
+    '''
+
+    def __init__(self, sample_rate=0, clock=time.time):
+        super(BoardProfiler, self).__init__()
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._profile = None
+        # Reading a cProfile.Profile's stats disables it, so never while
+        # it is running a call.
+        self._profile_lock = threading.RLock()
+        self._sample_rate = sample_rate
+        self._sampled = 0
+
+    def dispatch(self, subscriber, topic, *args, **kwargs):
+        '''Call ``subscriber`` as the board would, and record how long it
+        took.
+        '''
+        sampled = (self._sample_rate
+                   and random.random() < self._sample_rate)
+        start = self._clock()
+        if sampled:
+            with self._profile_lock:
+                if self._profile is None:
+                    self._profile = cProfile.Profile()
+                self._profile.runcall(subscriber, topic, *args, **kwargs)
+        else:
+            subscriber(topic, *args, **kwargs)
+        elapsed = self._clock() - start
+        key = (_name(subscriber), str(topic))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+            if sampled:
+                self._sampled += 1
+
+    def entries(self):
+        '''Return a dictionary for each subscriber and topic, slowest (in
+        total) first.
+        '''
+        with self._lock:
+            entries = [{'subscriber': subscriber, 'topic': topic,
+                        'calls': calls, 'total': total, 'max': maximum}
+                       for (subscriber, topic), (calls, total, maximum)
+                       in self._entries.iteritems()]
+        entries.sort(key=lambda entry: entry['total'], reverse=True)
+        return entries
+
+    def report(self, limit=20):
+        '''Return a table of the ``limit`` slowest subscribers and topics
+        and, if calls were sampled, the functions they spent longest in.
+        '''
+        row = '{:>10} {:>8} {:>10} {:>10}  {}'
+        lines = [row.format('total ms', 'calls', 'mean us', 'max ms',
+                            'subscriber (topic)')]
+        row = '{:>10.2f} {:>8} {:>10.1f} {:>10.2f}  {} ({})'
+        for entry in self.entries()[:limit]:
+            lines.append(row.format(
+                    entry['total'] * 1e3, entry['calls'],
+                    entry['total'] / entry['calls'] * 1e6,
+                    entry['max'] * 1e3, entry['subscriber'], entry['topic']))
+        with self._lock:
+            profile = self._profile
+            sampled = self._sampled
+        if profile is not None and sampled:
+            output = StringIO()
+            with self._profile_lock:
+                stats = pstats.Stats(profile, stream=output)
+            stats.sort_stats('tottime').print_stats(limit)
+            lines.append('')
+            lines.append('Sampled {} calls:'.format(sampled))
+            lines.append(output.getvalue().rstrip())
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._profile = None
+            self._sampled = 0
+
+
+def _name(subscriber):
+    '''Name a subscriber by its class and method, or module and function.'''
+    owner = getattr(subscriber, '__self__', None)
+    if owner is not None:
+        return '{}.{}'.format(type(owner).__name__, subscriber.__name__)
+    name = getattr(subscriber, '__name__', None)
+    if name is None:
+        return type(subscriber).__name__
+    return '{}.{}'.format(getattr(subscriber, '__module__', '?'), name)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+
+__all__ = ['call_key']
+
+
+def call_key(method, params):
+    '''Return a string that is the same for calls to the same method with
+    equal parameters (e.g., regardless of the order of dictionary keys).
+    '''
+    return json.dumps([method, params], sort_keys=True,
+                      separators=(',', ':'))
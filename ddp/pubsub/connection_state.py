@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .subscriber import Subscriber
+from .topics import (DDPConnected, SocketClosed, SocketError, SocketOpen,
+                     SocketOpened)
+
+__all__ = ['ConnectionState']
+
+
+class ConnectionState(Subscriber):
+    '''Tracks whether the socket is opening or open and the DDP session
+    connected.
+    '''
+
+    def __init__(self, board):
+        super(ConnectionState, self).__init__(board, {
+                DDPConnected: self._on_connected,
+                SocketClosed: self._on_closed,
+                SocketError: self._on_error,
+                SocketOpen: self._on_open,
+                SocketOpened: self._on_opened})
+        self._closed_callbacks = []
+        self._connected = False
+        self._connected_callbacks = []
+        self._socket_open = False
+        self._socket_opening = False
+
+    def _on_open(self, topic):
+        self._socket_opening = True
+
+    def _on_opened(self, topic):
+        self._socket_opening = False
+        self._socket_open = True
+
+    def _on_connected(self, topic):
+        self._connected = True
+        callbacks = self._connected_callbacks
+        self._connected_callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        self._connected = False
+        self._socket_open = False
+        self._socket_opening = False
+        self._call_closed_callbacks()
+
+    def _on_error(self, topic, error):
+        # The socket failed to open.
+        self._socket_opening = False
+        self._call_closed_callbacks()
+
+    def _call_closed_callbacks(self):
+        callbacks = self._closed_callbacks
+        self._closed_callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def is_connected(self):
+        return self._connected
+
+    def is_socket_open(self):
+        return self._socket_open
+
+    def is_socket_opening(self):
+        return self._socket_opening
+
+    def when_connected(self, callback):
+        '''Call ``callback`` once connected (now, if already connected).'''
+        if self._connected:
+            callback()
+        else:
+            self._connected_callbacks.append(callback)
+
+    def when_closed(self, callback):
+        '''Call ``callback`` once the socket next closes (or fails to
+        open).
+        '''
+        self._closed_callbacks.append(callback)
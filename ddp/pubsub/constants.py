@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+__all__ = [
+    'DDP_VERSIONS',
+    'DISCONNECT_FAIL',
+    'DISCONNECT_RESEND',
+    'TRAFFIC_FRAME_FORMAT',
+    'TRAFFIC_MAGIC',
+    'TRAFFIC_RECEIVED',
+    'TRAFFIC_SENT',
+]
+
+
+DDP_VERSIONS = ('1', 'pre2', 'pre1')
+
+DISCONNECT_FAIL   = 'fail'
+DISCONNECT_RESEND = 'resend'
+
+# Traffic captures start with TRAFFIC_MAGIC, followed by frames. Each frame
+# is a header (timestamp, direction, length of the message in bytes) and
+# the message, UTF-8 encoded.
+TRAFFIC_FRAME_FORMAT = '<dBI'
+TRAFFIC_MAGIC        = b'PYDDPCAP\x01'
+TRAFFIC_RECEIVED     = 0
+TRAFFIC_SENT         = 1
@@ -19,10 +19,12 @@ from __future__ import division
 from __future__ import print_function
 
 from ddp.messages.client.connect_message import ConnectMessage
+from .constants import DDP_VERSIONS
 from .subscriber import Subscriber
 from .topics import (
     DDPConnected,
     MessageReceivedConnected,
+    MessageReceivedFailed,
     MessageSendConnect,
     SocketOpened,
 )
@@ -31,18 +33,33 @@ __all__ = ['DDPConnector']
 
 
 class DDPConnector(Subscriber):
-    def __init__(self, board, session=None):
+    def __init__(self, board, session=None, versions=None):
         super(DDPConnector, self).__init__(board, {
                 SocketOpened: self._on_socket_opened,
-                MessageReceivedConnected: self._on_ddp_connected})
+                MessageReceivedConnected: self._on_ddp_connected,
+                MessageReceivedFailed: self._on_failed})
         self._board = board
         self._session = session
+        self._versions = list(DDP_VERSIONS if versions is None
+                              else versions)
+        self._version = self._versions[0]
 
     def _on_socket_opened(self, topic):
         self._board.publish(MessageSendConnect,
-                            ConnectMessage('pre2', session=self._session))
+                            ConnectMessage(self._version,
+                                           support=self._versions,
+                                           session=self._session))
 
     def _on_ddp_connected(self, topic, message):
         self._session = message.session
         self._board.publish(DDPConnected)
 
+    def _on_failed(self, topic, message):
+        # The server closes the connection after sending failed, so the
+        # version it suggested is used when the client reconnects.
+        if message.version in self._versions:
+            self._version = message.version
+
+    @property
+    def version(self):
+        return self._version
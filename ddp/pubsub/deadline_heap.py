@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import heapq
+
+__all__ = ['DeadlineHeap']
+
+
+class DeadlineHeap(object):
+    '''Calls ``on_expired(keys)`` with the keys whose deadlines have passed.
+
+    Deadlines are kept in a heap and a single timer is scheduled on the
+    loop for the earliest one, however many keys there are. Discarded
+    keys are removed from the heap lazily.
+    '''
+
+    def __init__(self, loop, on_expired):
+        super(DeadlineHeap, self).__init__()
+        self._deadlines = {}
+        self._handle = None
+        self._handle_when = None
+        self._heap = []
+        self._loop = loop
+        self._on_expired = on_expired
+
+    def __contains__(self, key):
+        return key in self._deadlines
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def add(self, key, timeout):
+        deadline = self._loop.time() + timeout
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        self._schedule()
+
+    def discard(self, key):
+        if self._deadlines.pop(key, None) is None:
+            return
+        # Rebuild the heap once most of its entries are discarded ones.
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, key)
+                          for key, deadline in self._deadlines.iteritems()]
+            heapq.heapify(self._heap)
+
+    def clear(self):
+        self._deadlines = {}
+        self._heap = []
+        self._schedule()
+
+    def _schedule(self):
+        if not self._heap:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = self._handle_when = None
+            return
+        when = self._heap[0][0]
+        if self._handle is not None:
+            if self._handle_when <= when:
+                return
+            self._handle.cancel()
+        self._handle = self._loop.call_at(when, self._on_timer)
+        self._handle_when = when
+
+    def _on_timer(self):
+        self._handle = self._handle_when = None
+        now = self._loop.time()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                expired.append(key)
+        self._schedule()
+        if expired:
+            self._on_expired(expired)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+__all__ = ['FixedWindow']
+
+
+class FixedWindow(object):
+    '''Allows a fixed number of method calls to be in flight.'''
+
+    def __init__(self, limit):
+        super(FixedWindow, self).__init__()
+        if limit < 1:
+            raise ValueError('limit must be at least 1')
+        self._limit = limit
+
+    @property
+    def limit(self):
+        return self._limit
+
+    def update(self, method, rtt):
+        pass
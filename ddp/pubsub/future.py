@@ -18,48 +18,48 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import threading
+from concurrent import futures
 
+from .interruptible_condition import InterruptibleCondition
 from .timeout import Timeout
 
 __all__ = ['Future']
 
 
-class Future(object):
-    def __init__(self, condition=None, poll_interval=0.01):
-        if condition is None:
-            condition = threading.Condition()
-        self._condition = condition
-        self._has_result = False
-        self._poll_interval = poll_interval
-        self._result = None
+class Future(futures.Future):
+    '''A ``concurrent.futures.Future`` that waits without polling.
 
-    def _wait_result(self, get_timeout):
-        with self._condition:
-            while not self._has_result:
-                self._condition.wait(get_timeout())
+    Waiting in the main thread can still be interrupted (see
+    ``InterruptibleCondition``). As a ``concurrent.futures.Future``, it
+    supports ``add_done_callback``, ``set_exception``, ``cancel`` and
+    works with ``concurrent.futures.wait`` and ``as_completed``.
+
+    :param condition: The ``threading.Condition`` guarding the future's
+                      state, if it should be shared.
+    '''
+
+    def __init__(self, condition=None):
+        super(Future, self).__init__()
+        self._condition = InterruptibleCondition(condition)
 
     def has_result(self):
-        with self._condition:
-            return self._has_result
+        return self.done()
 
     def get(self, timeout=None):
-        # Always use a timeout (even when one is not passed) so that
-        # this method is interruptible. However, if the timeout elapses
-        # and a one was not passed, just keep looping. Polling isn't
-        # ideal but that's threading in Python.
-        if timeout is None:
-            get_timeout = lambda: self._poll_interval
-        else:
-            get_timeout = Timeout(timeout).get_remaining
+        '''Wait for and return the result (or raise the exception).
 
-        self._wait_result(get_timeout)
-        return self._result
-
-    def set(self, result):
-        assert not self._has_result
+        :raises TimeoutError: If ``timeout`` seconds pass first.
+        '''
+        get_remaining = (None if timeout is None
+                         else Timeout(timeout).get_remaining)
         with self._condition:
-            self._result = result
-            self._has_result = True
-            self._condition.notify_all()
+            # The condition may be shared, so a wake-up can be for another
+            # future.
+            while not self.done():
+                self._condition.wait(None if get_remaining is None
+                                     else get_remaining())
+        return self.result(timeout=0)
 
+    def set(self, result):
+        assert not self.done()
+        self.set_result(result)
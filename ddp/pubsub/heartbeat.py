@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+from ddp.id_generator import build_id_generator
+from ddp.messages.ping_message import PingMessage
+from .subscriber import Subscriber
+from .topics import (
+    DDPConnected,
+    MessageReceivedPong,
+    MessageSendConnect,
+    MessageSendPing,
+    RawReceived,
+    SocketAbort,
+    SocketClosed,
+)
+
+__all__ = ['Heartbeat']
+
+
+class Heartbeat(Subscriber):
+    '''Detects dead connections by pinging the server when it is quiet.
+
+    If nothing is received for ``interval`` seconds, a ping is sent. If
+    the matching pong does not arrive within ``timeout`` seconds, the
+    socket is aborted so that the client reconnects. The round-trip time
+    of the last pong is kept as ``latency``.
+
+    Pings are only sent when the negotiated DDP version supports them,
+    i.e., not for ``pre1``.
+    '''
+
+    def __init__(self, board, loop, interval=17.5, timeout=15):
+        super(Heartbeat, self).__init__(board, {
+                DDPConnected: self._on_connected,
+                MessageReceivedPong: self._on_pong,
+                MessageSendConnect: self._on_send_connect,
+                RawReceived: self._on_received,
+                SocketClosed: self._on_closed})
+        self._active = False
+        self._board = board
+        self._ids = build_id_generator()
+        self._idle_handle = None
+        self._interval = interval
+        self._last_received = None
+        self._latency = None
+        self._loop = loop
+        self._ping_id = None
+        self._ping_sent_at = None
+        self._pong_handle = None
+        self._timeout = timeout
+        self._timeouts = 0
+        self._version = None
+
+    def _on_send_connect(self, topic, message):
+        self._version = message.version
+
+    def _on_connected(self, topic):
+        self._active = self._version != 'pre1'
+        self._reset_idle()
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        self._active = False
+        self._cancel()
+
+    def _on_received(self, topic, raw):
+        # Anything from the server shows the connection is alive, so
+        # only ping once it has been quiet for a whole interval. This is
+        # called for every message, so it only records the time; the idle
+        # timer checks it when it runs out.
+        self._last_received = self._loop.time()
+
+    def _on_pong(self, topic, message):
+        if self._ping_id is None or message.id != self._ping_id:
+            return
+        self._latency = time.time() - self._ping_sent_at
+        self._ping_id = None
+        self._pong_handle.cancel()
+        self._pong_handle = None
+        self._reset_idle()
+
+    def _on_idle(self):
+        self._idle_handle = None
+        quiet = self._loop.time() - self._last_received
+        if quiet < self._interval:
+            self._idle_handle = self._loop.call_later(
+                    self._interval - quiet, self._on_idle)
+            return
+        self._ping_id = next(self._ids)
+        self._ping_sent_at = time.time()
+        self._board.publish(MessageSendPing, PingMessage(id=self._ping_id))
+        self._pong_handle = self._loop.call_later(self._timeout,
+                                                  self._on_pong_timeout)
+
+    def _on_pong_timeout(self):
+        self._pong_handle = None
+        self._ping_id = None
+        self._timeouts += 1
+        self._board.publish(SocketAbort)
+
+    def _reset_idle(self):
+        self._last_received = self._loop.time()
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._active:
+            self._idle_handle = self._loop.call_later(self._interval,
+                                                      self._on_idle)
+
+    def _cancel(self):
+        for handle in [self._idle_handle, self._pong_handle]:
+            if handle is not None:
+                handle.cancel()
+        self._idle_handle = self._pong_handle = self._ping_id = None
+
+    @property
+    def latency(self):
+        '''The round-trip time of the last ping in seconds, if any.'''
+        return self._latency
+
+    @property
+    def timeouts(self):
+        '''The number of pings that went unanswered.'''
+        return self._timeouts
+
+    def unsubscribe(self):
+        self._active = False
+        self._cancel()
+        super(Heartbeat, self).unsubscribe()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .subscriber import Subscriber
+from .topics import (DDPConnected, MessageReceivedResult, SocketClose,
+                     SocketClosed, SocketOpen)
+
+__all__ = ['IdleSuspender']
+
+
+class IdleSuspender(Subscriber):
+    '''Closes the socket once the client has been idle for ``timeout``
+    seconds, and opens it again when the client is next used.
+
+    The client is idle when ``is_busy()`` is false, i.e., no calls are
+    queued or in flight and there are no subscriptions, and no call has
+    been made or answered for ``timeout`` seconds. While suspended the
+    ``SocketReconnector`` is unsubscribed so that the closed socket is not
+    reopened. ``resume`` (called when the client is used) subscribes it
+    again and opens the socket. Calls made meanwhile, including while the
+    socket is still closing, wait in the ``MethodCaller`` until the client
+    is connected.
+    '''
+
+    def __init__(self, board, loop, reconnector, caller, is_busy, timeout):
+        super(IdleSuspender, self).__init__(board, {
+                DDPConnected: self._on_connected,
+                MessageReceivedResult: self._on_result,
+                SocketClosed: self._on_closed})
+        self._board = board
+        self._caller = caller
+        self._handle = None
+        self._is_busy = is_busy
+        self._last_active = loop.time()
+        self._loop = loop
+        self._reconnector = reconnector
+        self._reopen_handle = None
+        self._resume_when_closed = False
+        self._suspending = False
+        self._suspended = False
+        self._suspensions = 0
+        self._timeout = timeout
+
+    def _on_connected(self, topic):
+        self._schedule(self._timeout)
+
+    def _on_result(self, topic, result):
+        self._last_active = self._loop.time()
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        self._cancel()
+        if not self._suspending:
+            return
+        self._suspending = False
+        self._suspended = True
+        if self._resume_when_closed:
+            self._resume_when_closed = False
+            self.resume()
+
+    def _schedule(self, delay):
+        self._cancel()
+        self._handle = self._loop.call_later(delay, self._on_timeout)
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _on_timeout(self):
+        # Activity only records the time, so that calls cost nothing more;
+        # the check is made when the timer runs out.
+        self._handle = None
+        if self._is_busy():
+            self._schedule(self._timeout)
+            return
+        idle = self._loop.time() - self._last_active
+        if idle < self._timeout:
+            self._schedule(self._timeout - idle)
+            return
+        self._suspending = True
+        self._suspensions += 1
+        self._reconnector.unsubscribe()
+        self._caller.hold()
+        self._board.publish(SocketClose)
+
+    def touch(self):
+        '''Record that the client was used, resuming it if suspended.'''
+        self._last_active = self._loop.time()
+        if self._suspended or self._suspending:
+            self.resume()
+
+    def resume(self):
+        '''Open the socket again, if suspended.
+
+        If the socket is still closing, it is opened once closed.
+        '''
+        if self._suspending:
+            self._resume_when_closed = True
+            return
+        if not self._suspended:
+            return
+        self._suspended = False
+        self._last_active = self._loop.time()
+        # Not while SocketClosed is being dispatched, or the reconnector
+        # would get it too.
+        self._reopen_handle = self._loop.call_soon(self._reopen)
+
+    def _reopen(self):
+        self._reopen_handle = None
+        self._reconnector.subscribe()
+        self._board.publish(SocketOpen)
+
+    def is_suspended(self):
+        return self._suspended or self._suspending
+
+    @property
+    def suspensions(self):
+        '''The number of times the client has been suspended.'''
+        return self._suspensions
+
+    def unsubscribe(self):
+        self._cancel()
+        if self._reopen_handle is not None:
+            self._reopen_handle.cancel()
+            self._reopen_handle = None
+        super(IdleSuspender, self).unsubscribe()
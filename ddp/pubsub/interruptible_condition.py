@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import errno
+import os
+import select
+import threading
+
+from .timeout import Timeout
+from .timeout_error import TimeoutError
+
+__all__ = ['InterruptibleCondition']
+
+
+class InterruptibleCondition(object):
+    '''A condition variable whose ``wait`` can be interrupted in the main
+    thread.
+
+    In Python 2, waiting on a ``threading.Condition`` without a timeout
+    cannot be interrupted (e.g., by Ctrl-C) and waiting with a timeout
+    polls. Other threads do not receive signals, so they wait on the
+    wrapped condition as normal, which blocks without polling. The main
+    thread instead waits on a pipe with ``select``, which blocks without
+    polling and is interrupted by signals. ``notify_all`` writes to the
+    pipes of any such waiters.
+
+    :param condition: The ``threading.Condition`` to wrap. A new one is
+                      created if none is given.
+    '''
+
+    def __init__(self, condition=None):
+        super(InterruptibleCondition, self).__init__()
+        if condition is None:
+            condition = threading.Condition()
+        self._condition = condition
+        self._pipes = []
+
+    def __enter__(self):
+        return self._condition.__enter__()
+
+    def __exit__(self, *args):
+        return self._condition.__exit__(*args)
+
+    def acquire(self, *args):
+        return self._condition.acquire(*args)
+
+    def release(self):
+        self._condition.release()
+
+    def wait(self, timeout=None):
+        # Only the main thread receives signals.
+        if not isinstance(threading.current_thread(), threading._MainThread):
+            self._condition.wait(timeout)
+            return
+        read_fd, write_fd = os.pipe()
+        self._pipes.append(write_fd)
+        # Fully release the lock, even if acquired recursively, as
+        # Condition.wait does.
+        saved_state = self._condition._release_save()
+        try:
+            _select(read_fd, timeout)
+        finally:
+            self._condition._acquire_restore(saved_state)
+            self._pipes.remove(write_fd)
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def notify_all(self):
+        self._condition.notify_all()
+        for write_fd in self._pipes:
+            os.write(write_fd, b'.')
+
+
+def _select(fd, timeout):
+    get_remaining = None if timeout is None else Timeout(timeout).get_remaining
+    while True:
+        try:
+            remaining = None if get_remaining is None else get_remaining()
+        except TimeoutError:
+            return
+        try:
+            select.select([fd], [], [], remaining)
+            return
+        except (select.error, OSError) as error:
+            # Signals whose handlers do not raise interrupt select too.
+            if error.args[0] != errno.EINTR:
+                raise
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import math
+
+__all__ = ['LatencyHistogram']
+
+
+class LatencyHistogram(object):
+    '''Counts values in logarithmic buckets, so that percentiles are
+    accurate to within ``precision`` (relative), like an HdrHistogram,
+    while using memory proportional to the range of values seen.
+
+    :param precision: The largest relative error of a percentile.
+    :param lowest: Values below this (e.g., zero) are counted as this.
+    '''
+
+    def __init__(self, precision=0.01, lowest=1e-6):
+        super(LatencyHistogram, self).__init__()
+        self._counts = {}
+        self._gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = math.log(self._gamma)
+        self._lowest = lowest
+        self.count = 0
+        self.max = None
+        self.min = None
+        self.sum = 0
+
+    def record(self, value):
+        bucket = int(math.ceil(math.log(max(value, self._lowest))
+                               / self._log_gamma))
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def merge(self, other):
+        '''Add the values counted by ``other``, which must have the same
+        precision, to this histogram.
+        '''
+        if other._gamma != self._gamma:
+            raise ValueError('histograms must have the same precision')
+        for bucket, count in other._counts.iteritems():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is None:
+                continue
+            if self.max is None or value > self.max:
+                self.max = value
+            if self.min is None or value < self.min:
+                self.min = value
+
+    def percentile(self, percentile):
+        '''Return the value below which ``percentile`` percent of the
+        values fall, or ``None`` if there are no values.
+        '''
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                break
+        # The middle of the bucket (in terms of relative error), clamped to
+        # the values actually seen.
+        value = 2 * self._gamma ** bucket / (self._gamma + 1)
+        return min(max(value, self.min), self.max)
@@ -27,15 +27,38 @@ class MessageBoard(object):
     def __init__(self, loop):
         super(MessageBoard, self).__init__()
         self._loop = loop
+        self._pending = 0
+        self._profiler = None
         self._subscribers = {}
 
+    @property
+    def pending(self):
+        '''The number of messages published but not yet dispatched.'''
+        return self._pending
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    def set_profiler(self, profiler):
+        '''Time every call of a subscriber with ``profiler`` (e.g., a
+        ``BoardProfiler``), or stop if ``profiler`` is ``None``.
+        '''
+        self._profiler = profiler
+
     def _call_subscribers(self, topic, *args, **kwargs):
+        self._pending -= 1
+        profiler = self._profiler
         for ancestor_topic in topic:
             if ancestor_topic in self._subscribers:
                 for subscriber in self._subscribers[ancestor_topic]:
-                    subscriber(topic, *args, **kwargs)
+                    if profiler is None:
+                        subscriber(topic, *args, **kwargs)
+                    else:
+                        profiler.dispatch(subscriber, topic, *args, **kwargs)
 
     def publish(self, topic, *args, **kwargs):
+        self._pending += 1
         self._loop.call_soon(partial(self._call_subscribers, topic, *args,
                                      **kwargs))
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .subscriber import Subscriber
+from .topics import MessageReceived, PodAccepted
+
+__all__ = ['MessageParsers']
+
+
+class MessageParsers(Subscriber):
+    '''Parses accepted pods of every type in ``table`` into messages.
+
+    Parsers are stateless, so one table, from ``MessageParsers.table``, can
+    be shared by every board in a process.
+    '''
+
+    def __init__(self, board, table):
+        super(MessageParsers, self).__init__(board, {
+                PodAccepted: self._on_accepted})
+        self._board = board
+        self._table = table
+
+    @staticmethod
+    def table(parsers):
+        '''Return a table, which must not be modified, of the topic a pod
+        of each parser's type is accepted on to the parser and the topic
+        its message is published on.
+        '''
+        return {PodAccepted + parser.MESSAGE_TYPE:
+                (parser, MessageReceived + parser.MESSAGE_TYPE)
+                for parser in parsers}
+
+    def _on_accepted(self, topic, pod):
+        entry = self._table.get(topic)
+        if entry is not None:
+            parser, received = entry
+            self._board.publish(received, parser.parse(pod))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .subscriber import Subscriber
+from .topics import MessageSend, PodSend
+
+__all__ = ['MessageSerializers']
+
+
+class MessageSerializers(Subscriber):
+    '''Serializes messages of every type in ``table`` into pods.
+
+    Serializers are stateless, so one table, from
+    ``MessageSerializers.table``, can be shared by every board in a
+    process.
+    '''
+
+    def __init__(self, board, table):
+        super(MessageSerializers, self).__init__(board, {
+                MessageSend: self._on_send})
+        self._board = board
+        self._table = table
+
+    @staticmethod
+    def table(serializers):
+        '''Return a table, which must not be modified, of the topic a
+        message of each serializer's type is sent on to the serializer and
+        the topic its pod is published on.
+        '''
+        return {MessageSend + serializer.MESSAGE_TYPE:
+                (serializer, PodSend + serializer.MESSAGE_TYPE)
+                for serializer in serializers}
+
+    def _on_send(self, topic, message):
+        entry = self._table.get(topic)
+        if entry is not None:
+            serializer, send = entry
+            self._board.publish(send, serializer.serialize(message))
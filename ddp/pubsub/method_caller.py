@@ -18,29 +18,314 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
+import time
+from collections import deque
+
+from .call_key import call_key
+from .connection_lost_error import ConnectionLostError
+from .constants import DISCONNECT_FAIL, DISCONNECT_RESEND
+from .deadline_heap import DeadlineHeap
 from .subscriber import Subscriber
-from .topics import MessageReceivedResult, MessageSendMethod
+from .timeout_error import TimeoutError
+from .topics import (
+    DDPConnected,
+    MessageReceivedResult,
+    MessageSendMethod,
+    SocketClosed,
+)
 
 __all__ = ['MethodCaller']
 
 
 class MethodCaller(Subscriber):
-    def __init__(self, board, method_message_factroy):
+    '''Sends method calls and completes their futures with the results.
+
+    Calls are only sent while connected. What happens to calls that are
+    awaiting a result when the socket closes depends on their
+    ``on_disconnect`` policy. With ``DISCONNECT_RESEND`` they are sent
+    again, with the same ID, once the client reconnects (so a method may
+    run more than once). With ``DISCONNECT_FAIL`` their futures fail with
+    ``ConnectionLostError``.
+
+    Given a ``ResultCache``, the results of methods registered with
+    ``cache_method`` are cached, and calls with equal parameters are
+    completed from the cache without being sent.
+
+    With ``coalesce``, a call to the same method with equal parameters as
+    a call that is queued or awaiting its result is not sent; its future
+    is completed along with the earlier call's (so it shares that call's
+    timeout and ``on_disconnect`` policy). Only use it if the methods
+    called have no side effects.
+
+    Given a ``MethodMetrics``, the latency of each result and the calls
+    that fail or are in flight are recorded for each method.
+    '''
+
+    def __init__(self, board, method_message_factroy, window=None, loop=None,
+                 timeout=None, on_disconnect=DISCONNECT_RESEND, cache=None,
+                 coalesce=False, metrics=None):
+        if timeout is not None and loop is None:
+            raise ValueError('loop must be given to use timeouts')
+        _check_policy(on_disconnect)
         super(MethodCaller, self).__init__(board, {
-                MessageReceivedResult: self._on_result})
+                DDPConnected: self._on_connected,
+                MessageReceivedResult: self._on_result,
+                SocketClosed: self._on_closed})
         self._board = board
+        self._cache = cache
+        self._cache_keys = {}
+        self._cache_ttls = {}
+        self._coalesce = coalesce
+        self._coalesce_keys = {}
+        self._coalesced = 0
+        self._coalescing = {}
+        self._connected = False
+        self._deadlines = None
+        self._drained_callbacks = []
+        if loop is not None:
+            self._deadlines = DeadlineHeap(loop, self._on_expired)
         self._factory = method_message_factroy
+        self._followers = {}
         self._futures = {}
+        self._messages = {}
+        self._metrics = metrics
+        self._on_disconnect = on_disconnect
+        self._policies = {}
+        self._queue = deque()
+        self._resend = []
+        self._sent_at = {}
+        self._skipped = 0
+        self._timed_out = 0
+        self._timeout = timeout
+        self._window = window
+
+    def _on_connected(self, topic):
+        self._connected = True
+        resend = self._resend
+        self._resend = []
+        for id in resend:
+            if id in self._sent_at:
+                self._send(self._messages[id])
+        self._send_queued()
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        self._connected = False
+        failed = []
+        self._resend = []
+        for id in sorted(self._sent_at, key=self._sent_at.get):
+            if self._policies.get(id, self._on_disconnect) == DISCONNECT_FAIL:
+                failed.append(id)
+            else:
+                self._resend.append(id)
+        for id in failed:
+            del self._sent_at[id]
+            if self._metrics is not None:
+                self._metrics.failed(self._messages[id].method, sent=True)
+            error = ConnectionLostError(
+                    'connection lost during method call {}'.format(id))
+            for future in self._forget(id):
+                if not future.done():
+                    future.set_exception(error)
+        self._check_drained()
+
+    def _forget(self, id):
+        '''Forget a call and return its future and those of any calls
+        coalesced with it.
+        '''
+        futures = [self._futures.pop(id)]
+        futures.extend(self._followers.pop(id, ()))
+        key = self._coalesce_keys.pop(id, None)
+        if key is not None:
+            del self._coalescing[key]
+        self._cache_keys.pop(id, None)
+        self._messages.pop(id, None)
+        self._policies.pop(id, None)
+        if self._deadlines is not None:
+            self._deadlines.discard(id)
+        return futures
 
     def _on_result(self, topic, result):
-        if result.id in self._futures:
-            future = self._futures[result.id]
-            del self._futures[result.id]
-            future.set_result(result)
+        if result.id in self._futures and result.id in self._sent_at:
+            cached = self._cache_keys.get(result.id)
+            if cached is not None and not result.has_error():
+                key, ttl = cached
+                self._cache.put(key, result, ttl,
+                                len(json.dumps(result.result)))
+            message = self._messages[result.id]
+            futures = self._forget(result.id)
+            rtt = time.time() - self._sent_at.pop(result.id)
+            if self._window is not None:
+                self._window.update(message.method, rtt)
+            if self._metrics is not None:
+                self._metrics.result(message.method, rtt, result.has_error())
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+            self._send_queued()
+            self._check_drained()
+
+    def _on_expired(self, ids):
+        for id in ids:
+            if id not in self._futures:
+                continue
+            method = self._messages[id].method
+            futures = self._forget(id)
+            self._timed_out += 1
+            sent = self._sent_at.pop(id, None) is not None
+            if not sent:
+                # Queued calls are skipped when they reach the front of
+                # the queue.
+                self._skipped += 1
+            if self._metrics is not None:
+                self._metrics.failed(method, sent)
+            error = TimeoutError('method call {} timed out'.format(id))
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+        self._send_queued()
+        self._check_drained()
+
+    def _check_drained(self):
+        if self._futures or not self._drained_callbacks:
+            return
+        callbacks = self._drained_callbacks
+        self._drained_callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def _can_send(self):
+        return self._connected and (self._window is None
+                                    or len(self._sent_at) < self._window.limit)
+
+    def _send(self, message):
+        # Calls sent again after reconnecting are still in _sent_at.
+        if self._metrics is not None and message.id not in self._sent_at:
+            self._metrics.sent(message.method)
+        self._sent_at[message.id] = time.time()
+        self._board.publish(MessageSendMethod, message)
+
+    def _send_queued(self):
+        while self._queue and self._can_send():
+            message = self._queue.popleft()
+            if message.id in self._futures:
+                self._send(message)
+            else:
+                self._skipped -= 1
 
-    def call(self, future, method, params):
+    def call(self, future, method, params, timeout=None,
+             on_disconnect=None):
+        if timeout is None:
+            timeout = self._timeout
+        if timeout is not None and self._deadlines is None:
+            raise ValueError('loop must be given to use timeouts')
+        if on_disconnect is not None:
+            _check_policy(on_disconnect)
+        key = None
+        if method in self._cache_ttls:
+            key = call_key(method, params)
+            result = self._cache.get(key)
+            if result is not None:
+                future.set_result(result)
+                return future
+        if self._coalesce:
+            if key is None:
+                key = call_key(method, params)
+            leader = self._coalescing.get(key)
+            if leader is not None:
+                self._followers.setdefault(leader, []).append(future)
+                self._coalesced += 1
+                return future
         message = self._factory.build(method, params)
         self._futures[message.id] = future
-        self._board.publish(MessageSendMethod, message)
+        self._messages[message.id] = message
+        if method in self._cache_ttls:
+            self._cache_keys[message.id] = (key, self._cache_ttls[method])
+        if self._coalesce:
+            self._coalescing[key] = message.id
+            self._coalesce_keys[message.id] = key
+        if on_disconnect not in (None, self._on_disconnect):
+            self._policies[message.id] = on_disconnect
+        if timeout is not None:
+            self._deadlines.add(message.id, timeout)
+        if self._queue or not self._can_send():
+            self._queue.append(message)
+        else:
+            self._send(message)
         return future
 
+    def cache_method(self, method, ttl):
+        '''Cache the results of ``method`` for ``ttl`` seconds.
+
+        Only cache methods whose results depend on nothing but their
+        parameters.
+        '''
+        if self._cache is None:
+            raise ValueError('a cache must be given to cache methods')
+        self._cache_ttls[method] = ttl
+
+    def uncache_method(self, method):
+        self._cache_ttls.pop(method, None)
+
+    def when_drained(self, callback):
+        '''Call ``callback`` once no calls are queued or in flight.'''
+        self._drained_callbacks.append(callback)
+        self._check_drained()
+
+    def fail_all(self, error):
+        '''Fail every call that is queued, in flight or awaiting resend
+        with ``error``.
+        '''
+        for id in list(self._futures):
+            method = self._messages[id].method
+            sent = self._sent_at.pop(id, None) is not None
+            if self._metrics is not None:
+                self._metrics.failed(method, sent)
+            for future in self._forget(id):
+                if not future.done():
+                    future.set_exception(error)
+        self._queue.clear()
+        self._resend = []
+        self._skipped = 0
+        self._check_drained()
+
+    def hold(self):
+        '''Queue calls instead of sending them until the client is next
+        connected, e.g., because the socket is being closed.
+        '''
+        self._connected = False
+
+    @property
+    def awaiting_resend(self):
+        '''The number of calls to send again once reconnected.'''
+        return sum(1 for id in self._resend if id in self._sent_at)
+
+    @property
+    def coalesced(self):
+        '''The number of calls completed along with an identical call.'''
+        return self._coalesced
+
+    @property
+    def in_flight(self):
+        '''The number of calls sent that are awaiting a result.'''
+        return len(self._sent_at)
+
+    @property
+    def queued(self):
+        '''The number of calls waiting for room in the window.'''
+        return len(self._queue) - self._skipped
+
+    @property
+    def timed_out(self):
+        '''The number of calls that have timed out.'''
+        return self._timed_out
+
+    @property
+    def window_limit(self):
+        return None if self._window is None else self._window.limit
+
+
+def _check_policy(on_disconnect):
+    if on_disconnect not in (DISCONNECT_FAIL, DISCONNECT_RESEND):
+        raise ValueError('on_disconnect must be DISCONNECT_FAIL or '
+                         'DISCONNECT_RESEND, not {!r}'.format(on_disconnect))
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+from .latency_histogram import LatencyHistogram
+
+__all__ = ['MethodMetrics']
+
+_QUANTILES = (0.5, 0.99, 0.999)
+
+
+class MethodMetrics(object):
+    '''Latency histograms, error counts and in-flight gauges for each
+    method called.
+
+    ``MethodCaller`` records to it on the loop; it may be read from any
+    thread.
+    '''
+
+    def __init__(self):
+        super(MethodMetrics, self).__init__()
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def _get(self, method):
+        metrics = self._methods.get(method)
+        if metrics is None:
+            metrics = self._methods[method] = _Metrics()
+        return metrics
+
+    def sent(self, method):
+        with self._lock:
+            self._get(method).in_flight += 1
+
+    def result(self, method, latency, error):
+        '''Record a result that arrived ``latency`` seconds after its call
+        was sent.
+        '''
+        with self._lock:
+            metrics = self._get(method)
+            metrics.in_flight -= 1
+            metrics.latencies.record(latency)
+            if error:
+                metrics.errors += 1
+
+    def failed(self, method, sent):
+        '''Record a call that timed out or lost its connection.'''
+        with self._lock:
+            metrics = self._get(method)
+            if sent:
+                metrics.in_flight -= 1
+            metrics.failures += 1
+
+    def snapshot(self):
+        '''Return a dictionary of the metrics of each method.'''
+        with self._lock:
+            return {method: metrics.snapshot()
+                    for method, metrics in self._methods.iteritems()}
+
+    def prometheus(self, prefix='ddp_'):
+        '''Return the metrics in the Prometheus text exposition format.'''
+        snapshot = self.snapshot()
+        name = prefix + 'method_call_duration_seconds'
+        lines = [
+            '# HELP {} Time from sending a method call to its result.'
+                .format(name),
+            '# TYPE {} summary'.format(name),
+        ]
+        for method, metrics in sorted(snapshot.iteritems()):
+            label = _escape(method)
+            for quantile in _QUANTILES:
+                value = metrics['p{}'.format(_format(quantile * 100))]
+                lines.append('{}{{method="{}",quantile="{}"}} {}'.format(
+                        name, label, quantile,
+                        'NaN' if value is None else repr(value)))
+            lines.append('{}_sum{{method="{}"}} {!r}'.format(
+                    name, label, metrics['sum']))
+            lines.append('{}_count{{method="{}"}} {}'.format(
+                    name, label, metrics['count']))
+        for suffix, kind, key, text in [
+                ('method_call_errors_total', 'counter', 'errors',
+                 'Method calls whose result was an error.'),
+                ('method_call_failures_total', 'counter', 'failures',
+                 'Method calls that timed out or lost their connection.'),
+                ('method_calls_in_flight', 'gauge', 'in_flight',
+                 'Method calls sent and awaiting a result.')]:
+            name = prefix + suffix
+            lines.append('# HELP {} {}'.format(name, text))
+            lines.append('# TYPE {} {}'.format(name, kind))
+            for method, metrics in sorted(snapshot.iteritems()):
+                lines.append('{}{{method="{}"}} {}'.format(
+                        name, _escape(method), metrics[key]))
+        return '\n'.join(lines) + '\n'
+
+
+class _Metrics(object):
+    def __init__(self):
+        self.errors = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.latencies = LatencyHistogram()
+
+    def snapshot(self):
+        snapshot = {
+            'count': self.latencies.count,
+            'errors': self.errors,
+            'failures': self.failures,
+            'in_flight': self.in_flight,
+            'max': self.latencies.max,
+            'sum': self.latencies.sum,
+        }
+        for quantile in _QUANTILES:
+            percentile = quantile * 100
+            snapshot['p{}'.format(_format(percentile))] = \
+                self.latencies.percentile(percentile)
+        return snapshot
+
+
+def _format(percentile):
+    # 50 -> '50', 99.9 -> '999'
+    return '{:g}'.format(percentile).replace('.', '')
+
+
+def _escape(value):
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+                 .replace('\n', '\\n'))
@@ -19,23 +19,33 @@ from __future__ import division
 from __future__ import print_function
 
 from .subscriber import Subscriber
-from .topics import DDPConnected, RawSend, SocketClosed
+from .topics import DDPConnected, RawSend, SocketClosed, SocketOpened
 
 __all__ = ['Outbox']
 
 
 class Outbox(Subscriber):
+    '''Holds the frames sent while the socket is closed and sends them
+    once the client is connected again.
+
+    Frames sent once the socket has opened (e.g., ``connect``) reach the
+    server, so they are not held.
+    '''
+
     def __init__(self, board):
         super(Outbox, self).__init__(board, {
             DDPConnected: self._on_connected,
             SocketClosed: self._on_closed,
+            SocketOpened: self._on_opened,
         })
         self._board = board
         self._outbox = []
         self._raw_subscriber = Subscriber(board, {RawSend: self._on_send})
 
-    def _on_connected(self, topic):
+    def _on_opened(self, topic):
         self._raw_subscriber.unsubscribe()
+
+    def _on_connected(self, topic):
         for raw in self._outbox:
             self._board.publish(RawSend, raw)
         self._outbox = []
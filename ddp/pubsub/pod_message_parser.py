@@ -18,6 +18,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import deque
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
 from .subscriber import Subscriber
 from .topics import PodReceived, RawReceived
 
@@ -25,12 +32,61 @@ __all__ = ['PodMessageParser']
 
 
 class PodMessageParser(Subscriber):
-    def __init__(self, board, parser):
+    '''Parses each raw message received into a pod.
+
+    If ``offload_threshold`` is given, messages at least that many
+    characters long are parsed on ``executor`` (the loop's default
+    executor if ``None``) instead of on the loop. Pods are still
+    published in the order their messages were received; smaller
+    messages received meanwhile wait for the larger ones ahead of them.
+
+    CPython's JSON decoder holds the GIL, so a thread pool only keeps the
+    loop running between messages. A ``ProcessPoolExecutor`` also keeps it
+    running while a message is parsed.
+    '''
+
+    def __init__(self, board, parser, loop=None, offload_threshold=None,
+                 executor=None):
+        if offload_threshold is not None and loop is None:
+            raise ValueError('loop must be given to offload parsing')
         super(PodMessageParser, self).__init__(board, {
                 RawReceived: self._on_received})
         self._board = board
+        self._executor = executor
+        self._loop = loop
+        self._offload_threshold = offload_threshold
         self._parser = parser
+        self._pending = deque()
 
     def _on_received(self, topic, raw):
-        self._board.publish(PodReceived, self._parser.parse(raw))
+        threshold = self._offload_threshold
+        if threshold is None or len(raw) < threshold:
+            pod = self._parser.parse(raw)
+            if not self._pending:
+                self._board.publish(PodReceived, pod)
+                return
+            future = asyncio.Future(loop=self._loop)
+            future.set_result(pod)
+        else:
+            future = self._loop.run_in_executor(self._executor, _parse,
+                                                self._parser, raw)
+            future.add_done_callback(self._on_parsed)
+        self._pending.append(future)
+
+    def _on_parsed(self, future):
+        while self._pending and self._pending[0].done():
+            parsed = self._pending.popleft()
+            error = parsed.exception()
+            if error is None:
+                self._board.publish(PodReceived, parsed.result())
+            else:
+                self._loop.call_exception_handler({
+                    'message': 'Failed to parse a message',
+                    'exception': error,
+                })
+
 
+def _parse(parser, raw):
+    # A function rather than a bound method, so that it can be pickled
+    # for a process pool.
+    return parser.parse(raw)
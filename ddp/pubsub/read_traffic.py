@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+
+from .constants import TRAFFIC_FRAME_FORMAT, TRAFFIC_MAGIC
+
+__all__ = ['read_traffic']
+
+
+def read_traffic(file):
+    '''Yield ``(timestamp, direction, raw)`` for each frame of a capture
+    written by a ``TrafficRecorder``.
+
+    A frame cut short, e.g., because the recording process died, ends the
+    capture.
+    '''
+    if file.read(len(TRAFFIC_MAGIC)) != TRAFFIC_MAGIC:
+        raise ValueError('not a traffic capture')
+    frame = struct.Struct(TRAFFIC_FRAME_FORMAT)
+    while True:
+        header = file.read(frame.size)
+        if len(header) < frame.size:
+            return
+        timestamp, direction, length = frame.unpack(header)
+        raw = file.read(length)
+        if len(raw) < length:
+            return
+        yield timestamp, direction, raw
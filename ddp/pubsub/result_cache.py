@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+from collections import OrderedDict
+
+__all__ = ['ResultCache']
+
+
+class ResultCache(object):
+    '''A least-recently-used cache of method results, each of which
+    expires after its own time to live.
+
+    The cache holds at most ``max_entries`` results, whose sizes add up to
+    at most ``max_bytes``; the least recently used results are evicted to
+    make room.
+    '''
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        super(ResultCache, self).__init__()
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._misses = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self._misses += 1
+            return default
+        expires_at, result, size = entry
+        if expires_at <= time.time():
+            self._bytes -= size
+            self._misses += 1
+            return default
+        # Move the entry to the most recently used end.
+        self._entries[key] = entry
+        self._hits += 1
+        return result
+
+    def put(self, key, result, ttl, size):
+        self.discard(key)
+        if size > self._max_bytes or self._max_entries < 1:
+            return
+        while (len(self._entries) >= self._max_entries
+               or self._bytes + size > self._max_bytes):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+        self._entries[key] = (time.time() + ttl, result, size)
+        self._bytes += size
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    @property
+    def hits(self):
+        '''The number of lookups answered from the cache.'''
+        return self._hits
+
+    @property
+    def misses(self):
+        '''The number of lookups not answered from the cache.'''
+        return self._misses
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .subscriber import Subscriber
+from .topics import SubscriptionsReady
+
+__all__ = ['Snapshotter']
+
+
+class Snapshotter(Subscriber):
+    '''Periodically writes the contents of a store to a snapshot.
+
+    Snapshots are written on the loop's default executor so that large
+    stores do not block the loop. A snapshot is also written as soon as
+    all subscriptions are ready.
+    '''
+
+    def __init__(self, board, loop, store, snapshot, interval):
+        super(Snapshotter, self).__init__(board, {
+                SubscriptionsReady: self._on_ready})
+        self._handle = None
+        self._interval = interval
+        self._loop = loop
+        self._saved_version = store.version
+        self._saving = False
+        self._snapshot = snapshot
+        self._store = store
+
+    def _on_ready(self, topic):
+        self.save()
+
+    def _on_interval(self):
+        self._handle = self._loop.call_later(self._interval,
+                                             self._on_interval)
+        self.save()
+
+    def save(self):
+        version = self._store.version
+        if self._saving or version == self._saved_version:
+            return
+        self._saving = True
+        future = self._loop.run_in_executor(None, self._snapshot.save,
+                                            self._store.documents())
+        def on_saved(future):
+            self._saving = False
+            if future.exception() is None:
+                self._saved_version = version
+        future.add_done_callback(on_saved)
+
+    def subscribe(self):
+        super(Snapshotter, self).subscribe()
+        self._handle = self._loop.call_later(self._interval,
+                                             self._on_interval)
+
+    def unsubscribe(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        super(Snapshotter, self).unsubscribe()
@@ -24,8 +24,8 @@ ensure_asyncio()
 from autobahn.asyncio.websocket import WebSocketClientProtocol
 
 from .subscriber import Subscriber
-from .topics import (RawReceived, RawSend, SocketClose, SocketClosed,
-                     SocketOpened)
+from .topics import (RawReceived, RawSend, SocketAbort, SocketClose,
+                     SocketClosed, SocketOpened)
 
 __all__ = ['SocketPublisher']
 
@@ -35,6 +35,7 @@ class SocketPublisher(WebSocketClientProtocol):
         super(SocketPublisher, self).__init__()
         self._board = board
         self._close_subscriber = Subscriber(board, {
+                SocketAbort: self._on_abort,
                 SocketClose: self._on_close})
         self._close_subscriber.subscribe()
         self._send_subscriber = Subscriber(board, {
@@ -46,6 +47,9 @@ class SocketPublisher(WebSocketClientProtocol):
     def _on_close(self, topic):
         self.sendClose()
 
+    def _on_abort(self, topic):
+        self.dropConnection(abort=True)
+
     def _publish(self, topic, *args, **kwargs):
         self._board.publish(topic, *args, **kwargs)
 
@@ -57,6 +61,7 @@ class SocketPublisher(WebSocketClientProtocol):
         self._publish(RawReceived, payload)
 
     def onClose(self, wasClean, code, reason):
+        self._close_subscriber.unsubscribe()
         self._send_subscriber.unsubscribe()
         self._publish(SocketClosed, wasClean, code, reason)
 
@@ -18,25 +18,65 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from .backoff import Backoff
 from .subscriber import Subscriber
-from .topics import SocketClosed, SocketError, SocketOpen
+from .topics import DDPConnected, SocketClosed, SocketError, SocketOpen
 
 __all__ = ['SocketReconnector']
 
 
 class SocketReconnector(Subscriber):
-    def __init__(self, board):
+    def __init__(self, board, loop, backoff=None):
         super(SocketReconnector, self).__init__( board, {
+                DDPConnected: self._on_connected,
                 SocketClosed: self._on_close,
                 SocketError: self._on_error})
+        self._attempts = 0
+        self._backoff = Backoff() if backoff is None else backoff
         self._board = board
+        self._handle = None
+        self._loop = loop
+
+    def _on_connected(self, topic):
+        self._backoff.reset()
 
     def _on_close(self, topic, was_clean, code, reason):
-        self._publish_socket_open()
+        self._schedule_socket_open()
 
     def _on_error(self, topic, error):
-        self._publish_socket_open()
+        self._schedule_socket_open()
+
+    def _schedule_socket_open(self):
+        if self._handle is None:
+            self._handle = self._loop.call_later(self._backoff.next_delay(),
+                                                 self._publish_socket_open)
 
     def _publish_socket_open(self):
+        self._handle = None
+        self._attempts += 1
         self._board.publish(SocketOpen)
 
+    def retry_now(self):
+        '''Reconnect now if a reconnection is waiting on its delay.'''
+        if self._handle is not None:
+            self._handle.cancel()
+            self._publish_socket_open()
+
+    def is_waiting(self):
+        return self._handle is not None
+
+    @property
+    def attempts(self):
+        '''The total number of reconnection attempts.'''
+        return self._attempts
+
+    @property
+    def failures(self):
+        '''The number of reconnection attempts since the last success.'''
+        return self._backoff.attempts
+
+    def unsubscribe(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        super(SocketReconnector, self).unsubscribe()
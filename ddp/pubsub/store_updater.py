@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.store.store import Store
+from .subscriber import Subscriber
+from .topics import (
+    DDPConnected,
+    DocumentAdded,
+    DocumentChanged,
+    DocumentRemoved,
+    MessageReceivedAdded,
+    MessageReceivedChanged,
+    MessageReceivedRemoved,
+    MessageSendUnsub,
+    SocketClosed,
+    SubscriptionsReady,
+)
+
+__all__ = ['StoreUpdater']
+
+
+class StoreUpdater(Subscriber):
+    '''Applies the ``added``, ``changed`` and ``removed`` messages to a
+    store and publishes each change to the store's documents.
+
+    After the socket closes, the server will send every document again
+    once the client reconnects. Rather than wiping the store, the
+    documents are kept and the resent ones are buffered. When all
+    subscriptions are ready, only the difference between the buffer and
+    the store is applied and published.
+
+    Given ``has_subscriptions``, a callable, no resync is begun when the
+    socket closes without subscriptions, and one is ended once the last
+    subscription is gone (as it will never become ready).
+    '''
+
+    def __init__(self, board, store, has_subscriptions=None):
+        super(StoreUpdater, self).__init__(board, {
+                DDPConnected: self._on_connected,
+                MessageReceivedAdded: self._on_added,
+                MessageReceivedChanged: self._on_changed,
+                MessageReceivedRemoved: self._on_removed,
+                MessageSendUnsub: self._on_unsub,
+                SocketClosed: self._on_closed,
+                SubscriptionsReady: self._on_ready})
+        self._board = board
+        self._buffer = None
+        self._has_subscriptions = has_subscriptions
+        self._resync_on_close = False
+        self._store = store
+
+    def _on_added(self, topic, message):
+        if self._buffer is not None:
+            self._buffer.add(message.collection, message.id, message.fields)
+            return
+        self._store.add(message.collection, message.id, message.fields)
+        self._board.publish(DocumentAdded, message.collection, message.id,
+                            message.fields)
+
+    def _on_changed(self, topic, message):
+        if self._buffer is not None:
+            self._buffer.change(message.collection, message.id,
+                                fields=message.fields,
+                                cleared=message.cleared)
+            return
+        self._store.change(message.collection, message.id,
+                           fields=message.fields, cleared=message.cleared)
+        self._board.publish(DocumentChanged, message.collection, message.id,
+                            message.fields, message.cleared)
+
+    def _on_removed(self, topic, message):
+        if self._buffer is not None:
+            self._buffer.remove(message.collection, message.id)
+            return
+        self._store.remove(message.collection, message.id)
+        self._board.publish(DocumentRemoved, message.collection, message.id)
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        if self._has_subscriptions is None or self._has_subscriptions():
+            self.begin_resync()
+            self._resync_on_close = True
+
+    def _on_connected(self, topic):
+        # Subscriptions dropped while disconnected. (A resync begun for a
+        # warm start waits for subscriptions made once connected.)
+        if self._resync_on_close:
+            self._end_resync_if_unsubscribed()
+
+    def _on_unsub(self, topic, message):
+        self._end_resync_if_unsubscribed()
+
+    def _end_resync_if_unsubscribed(self):
+        if self._has_subscriptions is not None \
+                and not self._has_subscriptions():
+            self._end_resync()
+
+    def _on_ready(self, topic):
+        self._end_resync()
+
+    def _end_resync(self):
+        self._resync_on_close = False
+        if self._buffer is None:
+            return
+        added, changed, removed = self._store.diff(self._buffer)
+        self._buffer = None
+        for collection, id, fields in added:
+            self._store.add(collection, id, fields)
+            self._board.publish(DocumentAdded, collection, id, fields)
+        for collection, id, fields, cleared in changed:
+            self._store.change(collection, id, fields=fields,
+                               cleared=cleared)
+            self._board.publish(DocumentChanged, collection, id, fields,
+                                cleared)
+        for collection, id in removed:
+            self._store.remove(collection, id)
+            self._board.publish(DocumentRemoved, collection, id)
+
+    def begin_resync(self):
+        '''Buffer documents until all subscriptions are ready.'''
+        self._buffer = Store()
+
+    def is_resyncing(self):
+        return self._buffer is not None
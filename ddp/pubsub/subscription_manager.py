@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.messages.client.sub_message import SubMessage
+from ddp.messages.client.unsub_message import UnsubMessage
+from .subscriber import Subscriber
+from .subscription_error import SubscriptionError
+from .topics import (
+    DDPConnected,
+    MessageReceivedNosub,
+    MessageReceivedReady,
+    MessageSendSub,
+    MessageSendUnsub,
+    SocketClosed,
+    SubscriptionsReady,
+)
+
+__all__ = ['SubscriptionManager']
+
+
+class SubscriptionManager(Subscriber):
+    '''Keeps track of the DDP subscriptions a client has made.
+
+    Subscriptions made while disconnected are sent once the client is
+    connected, and every subscription is sent again after a reconnect.
+    ``SubscriptionsReady`` is published each time all of the active
+    subscriptions have become ready.
+
+    A future passed to ``sub`` gets the subscription's ID once it is first
+    ready, or fails with ``SubscriptionError`` if the server refuses it.
+    '''
+
+    def __init__(self, board, ids):
+        super(SubscriptionManager, self).__init__(board, {
+                DDPConnected: self._on_connected,
+                MessageReceivedNosub: self._on_nosub,
+                MessageReceivedReady: self._on_ready,
+                SocketClosed: self._on_closed})
+        self._board = board
+        self._connected = False
+        self._futures = {}
+        self._ids = ids
+        self._pending = set()
+        self._subs = {}
+
+    def _on_connected(self, topic):
+        self._connected = True
+        self._pending = set(self._subs)
+        for message in self._subs.itervalues():
+            self._board.publish(MessageSendSub, message)
+
+    def _on_closed(self, topic, was_clean, code, reason):
+        self._connected = False
+
+    def _on_nosub(self, topic, message):
+        self._subs.pop(message.id, None)
+        future = self._futures.pop(message.id, None)
+        if future is not None and not future.done():
+            if message.has_error():
+                future.set_exception(SubscriptionError(message.error))
+            else:
+                future.set_result(message.id)
+        self._mark_ready([message.id])
+
+    def _on_ready(self, topic, message):
+        self._mark_ready(message.subs)
+
+    def _mark_ready(self, sub_ids):
+        for id in sub_ids:
+            future = self._futures.pop(id, None)
+            if future is not None and not future.done():
+                future.set_result(id)
+        if not self._pending:
+            return
+        self._pending.difference_update(sub_ids)
+        if not self._pending and self._subs:
+            self._board.publish(SubscriptionsReady)
+
+    def sub(self, name, params=None, future=None):
+        message = SubMessage(next(self._ids), name, params=params)
+        self._subs[message.id] = message
+        if future is not None:
+            self._futures[message.id] = future
+        if self._connected:
+            self._pending.add(message.id)
+            self._board.publish(MessageSendSub, message)
+        return message.id
+
+    def unsub(self, id):
+        if self._subs.pop(id, None) is None:
+            return
+        future = self._futures.pop(id, None)
+        if future is not None and not future.done():
+            future.cancel()
+        if self._connected:
+            self._board.publish(MessageSendUnsub, UnsubMessage(id))
+        self._mark_ready([id])
+
+    def has_subscriptions(self):
+        return bool(self._subs)
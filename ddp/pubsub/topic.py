@@ -40,6 +40,8 @@ class Topic(object):
         super(Topic, self).__init__()
         self._name = name
         self._parent = parent
+        # Topics are immutable and hashed on every publish and subscribe.
+        self._hash = hash(name) ^ hash(parent)
 
     def __eq__(self, other):
         if isinstance(other, Topic):
@@ -55,7 +57,7 @@ class Topic(object):
         return NotImplemented
 
     def __hash__(self):
-        return hash(self._name) ^ hash(self._parent)
+        return self._hash
 
     def __iter__(self):
         topic = self
@@ -19,21 +19,39 @@ from __future__ import division
 from __future__ import print_function
 
 from ddp.messages.constants import MSG_PING, MSG_PONG
-from ddp.messages.client.constants import MSG_CONNECT, MSG_METHOD
-from ddp.messages.server.constants import MSG_CONNECTED, MSG_RESULT
+from ddp.messages.client.constants import (MSG_CONNECT, MSG_METHOD, MSG_SUB,
+                                           MSG_UNSUB)
+from ddp.messages.server.constants import (MSG_ADDED, MSG_CHANGED,
+                                           MSG_CONNECTED, MSG_FAILED,
+                                           MSG_NOSUB, MSG_READY, MSG_REMOVED,
+                                           MSG_RESULT)
 from .topic import Topic
 
 __all__ = [
+    'Document',
+    'DocumentAdded',
+    'DocumentChanged',
+    'DocumentRemoved',
     'Message',
     'MessageReceived',
+    'MessageReceivedAdded',
+    'MessageReceivedChanged',
     'MessageReceivedConnected',
+    'MessageReceivedFailed',
     'MessageReceivedMethod',
+    'MessageReceivedNosub',
     'MessageReceivedPing',
+    'MessageReceivedPong',
+    'MessageReceivedReady',
+    'MessageReceivedRemoved',
     'MessageReceivedResult',
     'MessageSend',
     'MessageSendConnect',
     'MessageSendMethod',
+    'MessageSendPing',
     'MessageSendPong',
+    'MessageSendSub',
+    'MessageSendUnsub',
     'Pod',
     'PodAccepted',
     'PodReceived',
@@ -43,28 +61,46 @@ __all__ = [
     'RawReceived',
     'RawSend',
     'Socket',
+    'SocketAbort',
     'SocketClose',
     'SocketClosed',
     'SocketError',
     'SocketOpen',
     'SocketOpened',
+    'Subscriptions',
+    'SubscriptionsReady',
 ]
 
 DDP = Topic('ddp')
 DDPConnected = DDP + 'connected'
 
+Document = Topic('document')
+DocumentAdded = Document + 'added'
+DocumentChanged = Document + 'changed'
+DocumentRemoved = Document + 'removed'
+
 Message = Topic('message')
 
 MessageReceived = Message + 'received'
+MessageReceivedAdded = MessageReceived + MSG_ADDED
+MessageReceivedChanged = MessageReceived + MSG_CHANGED
 MessageReceivedConnected = MessageReceived + MSG_CONNECTED
+MessageReceivedFailed = MessageReceived + MSG_FAILED
 MessageReceivedMethod = MessageReceived + MSG_METHOD
+MessageReceivedNosub = MessageReceived + MSG_NOSUB
 MessageReceivedPing = MessageReceived + MSG_PING
+MessageReceivedPong = MessageReceived + MSG_PONG
+MessageReceivedReady = MessageReceived + MSG_READY
+MessageReceivedRemoved = MessageReceived + MSG_REMOVED
 MessageReceivedResult = MessageReceived + MSG_RESULT
 
 MessageSend = Message + 'send'
 MessageSendConnect = MessageSend + MSG_CONNECT
 MessageSendMethod = MessageSend + MSG_METHOD
+MessageSendPing = MessageSend + MSG_PING
 MessageSendPong = MessageSend + MSG_PONG
+MessageSendSub = MessageSend + MSG_SUB
+MessageSendUnsub = MessageSend + MSG_UNSUB
 
 Pod = Topic('pod')
 PodAccepted = Pod + 'accepted'
@@ -77,9 +113,12 @@ RawReceived = Raw + 'received'
 RawSend = Raw + 'send'
 
 Socket = Topic('socket')
+SocketAbort = Socket + 'abort'
 SocketClose = Socket + 'close'
 SocketClosed = Socket + 'closed'
 SocketError = Socket + 'error'
 SocketOpen = Socket + 'open'
 SocketOpened = Socket + 'opened'
 
+Subscriptions = Topic('subscriptions')
+SubscriptionsReady = Subscriptions + 'ready'
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+import time
+
+from .constants import (TRAFFIC_FRAME_FORMAT, TRAFFIC_MAGIC,
+                        TRAFFIC_RECEIVED, TRAFFIC_SENT)
+from .subscriber import Subscriber
+from .topics import RawReceived, RawSend
+
+__all__ = ['TrafficRecorder']
+
+
+class TrafficRecorder(Subscriber):
+    '''Appends every raw message received and sent, with the time, to a
+    capture that ``read_traffic`` can read back.
+
+    :param file: A binary file open for appending. The capture header is
+                 written if the file is empty.
+    '''
+
+    def __init__(self, board, file, clock=time.time):
+        super(TrafficRecorder, self).__init__(board, {
+                RawReceived: self._on_received,
+                RawSend: self._on_send})
+        self._clock = clock
+        self._file = file
+        self._frame = struct.Struct(TRAFFIC_FRAME_FORMAT)
+        if file.tell() == 0:
+            file.write(TRAFFIC_MAGIC)
+
+    def _on_received(self, topic, raw):
+        self._write(TRAFFIC_RECEIVED, raw)
+
+    def _on_send(self, topic, raw):
+        self._write(TRAFFIC_SENT, raw)
+
+    def _write(self, direction, raw):
+        if isinstance(raw, unicode):
+            raw = raw.encode('utf-8')
+        self._file.write(self._frame.pack(self._clock(), direction, len(raw)))
+        self._file.write(raw)
+
+    def close(self):
+        self.unsubscribe()
+        self._file.close()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From, Return
+
+from .constants import TRAFFIC_RECEIVED
+from .topics import RawReceived
+
+__all__ = ['TrafficReplayer']
+
+
+class TrafficReplayer(object):
+    '''Publishes the messages received in a capture as if a socket had just
+    received them, so that they go through the rest of the pipeline.
+    Messages that were sent are skipped; the pipeline sends its own.
+
+    Messages are replayed as fast as the pipeline handles them or, if
+    ``realtime`` is true, with the gaps between them as recorded, divided
+    by ``speed``.
+    '''
+
+    def __init__(self, board, loop):
+        super(TrafficReplayer, self).__init__()
+        self._board = board
+        self._loop = loop
+
+    @asyncio.coroutine
+    def replay(self, frames, realtime=False, speed=1, batch=100):
+        '''Replay ``frames``, as yielded by ``read_traffic``, and return the
+        number of messages replayed once the board has dispatched them all.
+
+        At most ``batch`` messages are published before waiting for the
+        board, so that a large capture is not queued all at once. Messages
+        being parsed on an executor are not waited for.
+        '''
+        count = 0
+        first = None
+        for timestamp, direction, raw in frames:
+            if direction != TRAFFIC_RECEIVED:
+                continue
+            if realtime:
+                if first is None:
+                    first = (timestamp, self._loop.time())
+                delay = (first[1] + (timestamp - first[0]) / speed
+                         - self._loop.time())
+                if delay > 0:
+                    yield From(self._drain())
+                    yield From(asyncio.sleep(delay, loop=self._loop))
+            self._board.publish(RawReceived, raw)
+            count += 1
+            if count % batch == 0:
+                yield From(self._drain())
+        yield From(self._drain())
+        raise Return(count)
+
+    @asyncio.coroutine
+    def _drain(self):
+        while self._board.pending:
+            yield From(asyncio.sleep(0, loop=self._loop))
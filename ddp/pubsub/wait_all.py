@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .as_completed import as_completed
+
+__all__ = ['wait_all']
+
+
+def wait_all(futures, timeout=None):
+    '''Wait for every future to complete and return them in order.
+
+    :raises TimeoutError: If ``timeout`` seconds pass first.
+    '''
+    futures = list(futures)
+    for _ in as_completed(futures, timeout=timeout):
+        pass
+    return futures
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp import pubsub
+from ddp.ddp_client import DDPClient
+
+__all__ = ['ShardWorker']
+
+
+class ShardWorker(pubsub.Subscriber):
+    '''Runs a ``DDPClient`` in a worker process of a ``ShardedDDPClient``
+    and sends the changes to its store up a pipe in batches.
+
+    Each batch is a list of changes; ``('added', collection, id,
+    fields)``, ``('changed', collection, id, fields, cleared)`` or
+    ``('removed', collection, id)``. Once every subscription is ready
+    (after any resent documents have been sent), ``('ready',)`` is sent.
+    The worker stops when it receives ``('stop',)`` or the pipe closes.
+    '''
+
+    def __init__(self, loop, connection, url, subscriptions, batch_interval,
+                 client_kwargs):
+        self._client = client = DDPClient(loop, url, **client_kwargs)
+        super(ShardWorker, self).__init__(client.board, {
+                pubsub.DocumentAdded: self._on_added,
+                pubsub.DocumentChanged: self._on_changed,
+                pubsub.DocumentRemoved: self._on_removed,
+                pubsub.SubscriptionsReady: self._on_ready})
+        self._batch = []
+        self._batch_interval = batch_interval
+        self._connection = connection
+        self._flush_handle = None
+        self._loop = loop
+        self._ready = False
+        self._subs = subscriptions
+
+    @classmethod
+    def run(cls, connection, url, subscriptions, batch_interval,
+            client_kwargs):
+        '''The target of the worker process.'''
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        worker = cls(loop, connection, url, subscriptions, batch_interval,
+                     client_kwargs)
+        worker.start()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+            connection.close()
+
+    def start(self):
+        self.subscribe()
+        self._loop.add_reader(self._connection.fileno(), self._on_command)
+        for name, params in self._subs:
+            self._client.subscribe(name, *params)
+        self._client.open()
+
+    def _on_command(self):
+        try:
+            command = self._connection.recv()
+        except EOFError:
+            command = ('stop',)
+        if command[0] == 'stop':
+            self._loop.remove_reader(self._connection.fileno())
+            self._client.close(drain=False).add_done_callback(
+                    lambda future: self._loop.stop())
+
+    def _on_added(self, topic, collection, id, fields):
+        self._add(('added', collection, id, fields))
+
+    def _on_changed(self, topic, collection, id, fields, cleared):
+        self._add(('changed', collection, id, fields, cleared))
+
+    def _on_removed(self, topic, collection, id):
+        self._add(('removed', collection, id))
+
+    def _on_ready(self, topic):
+        # Documents resent while reconnecting are published after this,
+        # so ready is sent after the next batch.
+        self._ready = True
+        self._schedule_flush()
+
+    def _add(self, change):
+        self._batch.append(change)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._batch_interval,
+                                                       self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        if self._batch:
+            batch = self._batch
+            self._batch = []
+            self._connection.send(('changes', batch))
+        if self._ready:
+            self._ready = False
+            self._connection.send(('ready',))
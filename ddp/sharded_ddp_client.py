@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import multiprocessing
+import select
+import threading
+
+from .pubsub.future import Future
+from .pubsub.wait_all import wait_all
+from .shard_worker import ShardWorker
+from .store import Store
+
+__all__ = ['ShardedDDPClient']
+
+
+class ShardedDDPClient(object):
+    '''Spreads subscriptions over several worker processes, each with its
+    own connection, so decoding and applying documents can use more than
+    one core.
+
+    ``subscriptions`` is a list of subscription names or of ``(name,
+    params)`` pairs, dealt out in turn to ``shards`` workers (one per CPU
+    by default). The workers send the changes to their stores back in
+    batches, at most one every ``batch_interval`` seconds, and the
+    documents can be read from this process with ``get``, ``find``,
+    etc. A document published by more than one shard has the fields from
+    all of them.
+
+    Extra keyword arguments are passed to each worker's ``DDPClient``,
+    except ``snapshot_path``; the documents a worker loads from a snapshot
+    would never reach this process.
+    '''
+
+    def __init__(self, url, subscriptions, shards=None, batch_interval=0.05,
+                 **kwargs):
+        if kwargs.get('snapshot_path') is not None:
+            raise ValueError('ShardedDDPClient does not support '
+                             'snapshot_path')
+        super(ShardedDDPClient, self).__init__()
+        subscriptions = [_normalize(subscription)
+                         for subscription in subscriptions]
+        if shards is None:
+            shards = multiprocessing.cpu_count()
+        shards = max(1, min(shards, len(subscriptions)))
+        self._batch_interval = batch_interval
+        self._callbacks = []
+        self._client_kwargs = kwargs
+        self._connections = []
+        self._lock = threading.Lock()
+        self._processes = []
+        self._ready = [Future() for _ in range(shards)]
+        self._reader = threading.Thread(target=self._read,
+                                        name='ShardedDDPClient')
+        self._reader.daemon = True
+        self._stores = [Store() for _ in range(shards)]
+        self._subscriptions = [subscriptions[index::shards]
+                               for index in range(shards)]
+        self._url = url
+        if not subscriptions:
+            # Nothing will ever become ready.
+            for ready in self._ready:
+                ready.set(None)
+
+    def start(self):
+        for subscriptions in self._subscriptions:
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=ShardWorker.run,
+                name='DDPClient shard',
+                args=(child_connection, self._url, subscriptions,
+                      self._batch_interval, self._client_kwargs),
+            )
+            process.daemon = True
+            process.start()
+            child_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self._reader.start()
+
+    def stop(self):
+        for connection in self._connections:
+            try:
+                connection.send(('stop',))
+            except (IOError, OSError):
+                pass
+
+    def join(self):
+        for process in self._processes:
+            process.join()
+        self._reader.join()
+
+    def wait_ready(self, timeout=None):
+        '''Block until every shard's subscriptions are ready.
+
+        :raises TimeoutError: If ``timeout`` seconds pass first.
+        '''
+        wait_all(self._ready, timeout=timeout)
+
+    def on_changes(self, callback):
+        '''Call ``callback`` with each batch of changes (see
+        ``ShardWorker``) once it has been applied.
+
+        ``callback`` is called on a background thread.
+        '''
+        self._callbacks.append(callback)
+
+    def get(self, collection, id):
+        with self._lock:
+            documents = [store.get(collection, id) for store in self._stores
+                         if store.has(collection, id)]
+        return _merge(documents)
+
+    def has(self, collection, id):
+        with self._lock:
+            return any(store.has(collection, id) for store in self._stores)
+
+    def find(self, collection):
+        merged = {}
+        with self._lock:
+            for store in self._stores:
+                for id, fields in store.find(collection).iteritems():
+                    merged.setdefault(id, {}).update(fields)
+        return merged
+
+    def collections(self):
+        with self._lock:
+            return list(set(collection for store in self._stores
+                            for collection in store.collections()))
+
+    def __len__(self):
+        with self._lock:
+            return len(set().union(*[store.keys() for store in self._stores]))
+
+    def _read(self):
+        shards = {connection.fileno(): (index, connection)
+                  for index, connection in enumerate(self._connections)}
+        while shards:
+            readable, _, _ = select.select(list(shards), [], [])
+            for fd in readable:
+                index, connection = shards[fd]
+                try:
+                    message = connection.recv()
+                except EOFError:
+                    del shards[fd]
+                    connection.close()
+                    continue
+                if message[0] == 'changes':
+                    self._apply(index, message[1])
+                elif message[0] == 'ready':
+                    if not self._ready[index].done():
+                        self._ready[index].set(None)
+
+    def _apply(self, index, changes):
+        store = self._stores[index]
+        with self._lock:
+            for change in changes:
+                kind = change[0]
+                if kind == 'added':
+                    store.add(*change[1:])
+                elif kind == 'changed':
+                    store.change(*change[1:])
+                elif kind == 'removed':
+                    store.remove(*change[1:])
+        for callback in self._callbacks:
+            callback(changes)
+
+
+def _normalize(subscription):
+    if isinstance(subscription, basestring):
+        return subscription, []
+    name, params = subscription
+    return name, list(params)
+
+
+def _merge(documents):
+    if not documents:
+        return None
+    merged = {}
+    for fields in documents:
+        merged.update(fields)
+    return merged
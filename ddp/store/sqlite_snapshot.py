@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import sqlite3
+
+__all__ = ['SQLiteSnapshot']
+
+
+class SQLiteSnapshot(object):
+    '''Saves and loads the contents of a store to and from a SQLite file.
+
+    A snapshot is written to a temporary file that then replaces the
+    previous snapshot, so the file on disk is always complete and
+    compact.
+    '''
+
+    def __init__(self, path):
+        super(SQLiteSnapshot, self).__init__()
+        self._path = path
+
+    @property
+    def path(self):
+        return self._path
+
+    def exists(self):
+        return os.path.exists(self._path)
+
+    def load(self, store):
+        if not self.exists():
+            return 0
+        connection = sqlite3.connect(self._path)
+        try:
+            rows = connection.execute(
+                    'SELECT collection, id, fields FROM documents')
+            count = 0
+            for collection, id, fields in rows:
+                store.add(collection, id, json.loads(fields))
+                count += 1
+            return count
+        finally:
+            connection.close()
+
+    def save(self, documents):
+        '''Replace the snapshot with ``documents``.
+
+        :param documents: (collection, id, fields) tuples, e.g., as
+                          returned by ``Store.documents``.
+        '''
+        temp_path = self._path + '.tmp'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        connection = sqlite3.connect(temp_path)
+        try:
+            with connection:
+                connection.execute('CREATE TABLE documents ('
+                                   'collection TEXT NOT NULL, '
+                                   'id TEXT NOT NULL, '
+                                   'fields TEXT NOT NULL, '
+                                   'PRIMARY KEY (collection, id))')
+                connection.executemany(
+                        'INSERT INTO documents VALUES (?, ?, ?)',
+                        ((collection, id, json.dumps(fields))
+                         for collection, id, fields in documents))
+        finally:
+            connection.close()
+        os.rename(temp_path, self._path)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from copy import copy
+
+__all__ = ['Store']
+
+
+_MISSING = object()
+
+
+class Store(object):
+    '''The client-side copy of the documents in each collection.
+
+    Documents are never modified in place; each change replaces a
+    document's fields with a new dictionary. Callers may therefore hold
+    on to the fields returned by ``documents`` (e.g., to write a snapshot
+    from another thread) without copying them.
+    '''
+
+    def __init__(self):
+        super(Store, self).__init__()
+        self._collections = {}
+        self._version = 0
+
+    def add(self, collection, id, fields=None):
+        documents = self._collections.setdefault(collection, {})
+        documents[id] = copy(fields) if fields is not None else {}
+        self._version += 1
+
+    def change(self, collection, id, fields=None, cleared=None):
+        documents = self._collections.setdefault(collection, {})
+        document = dict(documents.get(id, {}))
+        if fields is not None:
+            document.update(fields)
+        if cleared is not None:
+            for field in cleared:
+                document.pop(field, None)
+        documents[id] = document
+        self._version += 1
+
+    def remove(self, collection, id):
+        documents = self._collections.get(collection)
+        if documents is None or id not in documents:
+            return
+        del documents[id]
+        if not documents:
+            del self._collections[collection]
+        self._version += 1
+
+    def clear(self):
+        self._collections = {}
+        self._version += 1
+
+    def get(self, collection, id):
+        document = self._collections.get(collection, {}).get(id)
+        return copy(document)
+
+    def has(self, collection, id):
+        return id in self._collections.get(collection, {})
+
+    def find(self, collection):
+        documents = self._collections.get(collection, {})
+        return {id: copy(fields) for id, fields in documents.iteritems()}
+
+    def collections(self):
+        return self._collections.keys()
+
+    def documents(self):
+        return [(collection, id, fields)
+                for collection, documents in self._collections.iteritems()
+                for id, fields in documents.iteritems()]
+
+    def diff(self, other):
+        '''Describe the changes that turn this store into ``other``.
+
+        :returns: A tuple of three lists; the (collection, id, fields) of
+                  added documents, the (collection, id, fields, cleared)
+                  of changed documents and the (collection, id) of
+                  removed documents.
+        '''
+        added = []
+        changed = []
+        removed = []
+        for collection, documents in other._collections.iteritems():
+            old_documents = self._collections.get(collection, {})
+            for id, fields in documents.iteritems():
+                if id not in old_documents:
+                    added.append((collection, id, fields))
+                    continue
+                old_fields = old_documents[id]
+                if old_fields == fields:
+                    continue
+                changed_fields = {key: value
+                                  for key, value in fields.iteritems()
+                                  if old_fields.get(key, _MISSING) != value}
+                cleared = [key for key in old_fields if key not in fields]
+                changed.append((collection, id, changed_fields, cleared))
+        for collection, documents in self._collections.iteritems():
+            new_documents = other._collections.get(collection, {})
+            for id in documents:
+                if id not in new_documents:
+                    removed.append((collection, id))
+        return added, changed, removed
+
+    def keys(self):
+        return set((collection, id)
+                   for collection, documents in self._collections.iteritems()
+                   for id in documents)
+
+    def __len__(self):
+        return sum(len(documents)
+                   for documents in self._collections.itervalues())
+
+    @property
+    def version(self):
+        '''Incremented each time the store is modified.'''
+        return self._version
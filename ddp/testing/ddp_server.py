@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From, Return
+
+from autobahn.asyncio.websocket import (
+    WebSocketServerFactory,
+    WebSocketServerProtocol,
+)
+
+from ddp.messages import (
+    ConnectMessageParser,
+    MethodMessageParser,
+    PingMessageParser,
+    PongMessageParser,
+    SubMessageParser,
+    UnsubMessageParser,
+
+    AddedMessage,
+    ChangedMessage,
+    ConnectedMessage,
+    ErrorMessage,
+    FailedMessage,
+    NosubMessage,
+    PongMessage,
+    ReadyMessage,
+    RemovedMessage,
+    ResultMessage,
+    UpdatedMessage,
+
+    AddedMessageSerializer,
+    ChangedMessageSerializer,
+    ConnectedMessageSerializer,
+    ErrorMessageSerializer,
+    FailedMessageSerializer,
+    NosubMessageSerializer,
+    PongMessageSerializer,
+    ReadyMessageSerializer,
+    RemovedMessageSerializer,
+    ResultMessageSerializer,
+    UpdatedMessageSerializer,
+)
+from ddp.pod import PodMessageFilter, PodMessageParser, PodMessageSerializer
+
+__all__ = ['DDPServer']
+
+_VERSIONS = ('1', 'pre2', 'pre1')
+
+_PARSERS = {parser.MESSAGE_TYPE: parser for parser in [
+    ConnectMessageParser(),
+    MethodMessageParser(),
+    PingMessageParser(),
+    PongMessageParser(),
+    SubMessageParser(),
+    UnsubMessageParser(),
+]}
+
+_SERIALIZERS = {
+    AddedMessage: AddedMessageSerializer(),
+    ChangedMessage: ChangedMessageSerializer(),
+    ConnectedMessage: ConnectedMessageSerializer(),
+    ErrorMessage: ErrorMessageSerializer(),
+    FailedMessage: FailedMessageSerializer(),
+    NosubMessage: NosubMessageSerializer(),
+    PongMessage: PongMessageSerializer(),
+    ReadyMessage: ReadyMessageSerializer(),
+    RemovedMessage: RemovedMessageSerializer(),
+    ResultMessage: ResultMessageSerializer(),
+    UpdatedMessage: UpdatedMessageSerializer(),
+}
+
+
+class DDPServer(object):
+    '''A small DDP server, standing in for Meteor in tests and benchmarks.
+
+    Methods and publications are plain functions. A method is called with
+    the call's parameters and returns its result, which is sent after the
+    method's ``delay``. A publication is called with the session and the
+    subscription's parameters and returns the ``(collection, id,
+    fields)`` of its documents, which are sent before the subscription is
+    ready. Unknown methods and publications get a 404 error, as in
+    Meteor.
+
+    ``echo`` (returns its parameters) and ``flood`` (``count``
+    documents, each then changed ``changes`` times) are added by
+    ``add_echo_method`` and ``add_flood_publication``.
+    '''
+
+    def __init__(self, loop, host='127.0.0.1', port=0):
+        super(DDPServer, self).__init__()
+        self._host = host
+        self._loop = loop
+        self._methods = {}
+        self._port = port
+        self._publications = {}
+        self._server = None
+        self.sessions = []
+
+    @asyncio.coroutine
+    def start(self):
+        factory = WebSocketServerFactory(self.url, loop=self._loop)
+        factory.protocol = lambda: DDPServerSession(self)
+        self._server = yield From(self._loop.create_server(
+                factory, self._host, self._port))
+        # The port may have been picked by the OS and the handshake checks
+        # it against the URL.
+        self._port = self._server.sockets[0].getsockname()[1]
+        factory.setSessionParameters(url=self.url)
+        raise Return(self)
+
+    def close(self):
+        for session in list(self.sessions):
+            session.sendClose()
+        self._server.close()
+
+    @property
+    def url(self):
+        return 'ws://{}:{}/websocket'.format(self._host, self._port)
+
+    def add_method(self, name, method, delay=0):
+        self._methods[name] = (method, delay)
+
+    def add_echo_method(self, name='echo', delay=0):
+        self.add_method(name, lambda *params: list(params), delay=delay)
+
+    def add_publication(self, name, publication):
+        self._publications[name] = publication
+
+    def add_flood_publication(self, name='flood', collection='flood',
+                              size=64):
+        '''Add a publication whose parameters are the number of documents
+        and how many times to change each one. Each document has a string
+        field of ``size`` characters.
+        '''
+        def flood(session, count, changes=0):
+            value = 'x' * size
+            for id in xrange(count):
+                yield collection, str(id), {'value': value, 'version': 0}
+            for version, id in itertools.product(xrange(1, changes + 1),
+                                                 xrange(count)):
+                session.send(ChangedMessage(collection, str(id),
+                                            fields={'version': version}))
+        self.add_publication(name, flood)
+
+    def get_method(self, name):
+        return self._methods.get(name)
+
+    def get_publication(self, name):
+        return self._publications.get(name)
+
+    @property
+    def loop(self):
+        return self._loop
+
+
+class DDPServerSession(WebSocketServerProtocol):
+    '''A connection to the ``DDPServer``.'''
+
+    _ids = itertools.count()
+
+    def __init__(self, server):
+        WebSocketServerProtocol.__init__(self)
+        self._connected = False
+        self._filter = PodMessageFilter()
+        self._parser = PodMessageParser()
+        self._serializer = PodMessageSerializer()
+        self._server = server
+        self.id = str(next(self._ids))
+
+    def onOpen(self):
+        self._server.sessions.append(self)
+
+    def onClose(self, was_clean, code, reason):
+        if self in self._server.sessions:
+            self._server.sessions.remove(self)
+
+    def onMessage(self, payload, is_binary):
+        pod = self._parser.parse(payload)
+        if not self._filter.accept(pod):
+            return
+        parser = _PARSERS.get(self._filter.get_type(pod))
+        if parser is None:
+            return
+        message = parser.parse(pod)
+        handler = getattr(self, '_on_' + parser.MESSAGE_TYPE)
+        handler(message, pod)
+
+    def send(self, message):
+        pod = _SERIALIZERS[type(message)].serialize(message)
+        self.sendMessage(self._serializer.serialize(pod))
+
+    def added(self, collection, id, fields=None):
+        self.send(AddedMessage(collection, id, fields=fields))
+
+    def changed(self, collection, id, fields=None, cleared=None):
+        self.send(ChangedMessage(collection, id, cleared=cleared,
+                                 fields=fields))
+
+    def removed(self, collection, id):
+        self.send(RemovedMessage(collection, id))
+
+    def _on_connect(self, message, pod):
+        if self._connected:
+            # Meteor answers with an error, which a client could ignore;
+            # a client that connects twice is broken, so drop it.
+            self.dropConnection(abort=True)
+        elif message.version in _VERSIONS:
+            self._connected = True
+            self.send(ConnectedMessage(self.id))
+        else:
+            self.send(FailedMessage(_VERSIONS[0]))
+
+    def _on_method(self, message, pod):
+        method = self._server.get_method(message.method)
+        if method is None:
+            result = ResultMessage(message.id, error=_not_found(
+                    'Method', message.method))
+            delay = 0
+        else:
+            method, delay = method
+            result = ResultMessage(message.id,
+                                   result=method(*message.params))
+        def reply():
+            self.send(result)
+            self.send(UpdatedMessage([message.id]))
+        if delay:
+            self._server.loop.call_later(delay, reply)
+        else:
+            reply()
+
+    def _on_ping(self, message, pod):
+        self.send(PongMessage(message.id if message.has_id() else None))
+
+    def _on_pong(self, message, pod):
+        pass
+
+    def _on_sub(self, message, pod):
+        publication = self._server.get_publication(message.name)
+        if publication is None:
+            self.send(NosubMessage(message.id, error=_not_found(
+                    'Subscription', message.name)))
+            return
+        params = message.params if message.has_params() else []
+        for collection, id, fields in publication(self, *params):
+            self.added(collection, id, fields)
+        self.send(ReadyMessage([message.id]))
+
+    def _on_unsub(self, message, pod):
+        self.send(NosubMessage(message.id))
+
+
+def _not_found(kind, name):
+    return {
+        'error': 404,
+        'reason': "{} '{}' not found".format(kind, name),
+        'errorType': 'Meteor.Error',
+    }
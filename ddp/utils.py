@@ -19,10 +19,13 @@ from __future__ import division
 from __future__ import print_function
 
 import imp
+import importlib
 import sys
+import types
+from functools import partial
 
 
-__all__ = ['default', 'ensure_asyncio']
+__all__ = ['LazyModule', 'default', 'ensure_asyncio', 'lazy_exports']
 
 
 def default(obj, value=None, factory=None):
@@ -37,6 +40,8 @@ def default(obj, value=None, factory=None):
 
 
 def ensure_asyncio():
+    if 'asyncio' in sys.modules:
+        return
     try:
         import asyncio
     except ImportError:
@@ -51,3 +56,76 @@ def ensure_asyncio():
                     pass
         sys.modules['asyncio'] = asyncio
 
+
+class LazyModule(types.ModuleType):
+    '''Stands in for ``module`` and imports each name it exports from its
+    submodule when the name is first used.
+
+    :param exports: The names each submodule (relative to ``module``, e.g.,
+                    ``'.topic'``) exports.
+    '''
+
+    def __init__(self, module, exports):
+        super(LazyModule, self).__init__(module.__name__)
+        self.__dict__.update(module.__dict__)
+        # Keep the module alive; Python 2 clears a module's globals when the
+        # module is freed.
+        self.__dict__['_module'] = module
+        self.__dict__['_exports'] = {}
+        for submodule, names in exports.iteritems():
+            self._add_exports(submodule, names)
+
+    def _add_exports(self, submodule, names):
+        lazy = self.__dict__['_exports']
+        for name in names:
+            lazy[name] = submodule
+        self.__dict__['__all__'] = sorted(lazy)
+
+    def __getattr__(self, name):
+        submodule = self.__dict__.get('_exports', {}).get(name)
+        if submodule is None:
+            raise AttributeError("'module' object has no attribute "
+                                 "'{}'".format(name))
+        value = getattr(importlib.import_module(submodule, self.__name__),
+                        name)
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._exports))
+
+
+def lazy_exports(name, exports):
+    '''Replace the module ``name`` with a ``LazyModule``. Call this at the
+    end of a package's ``__init__``, instead of star-importing submodules.
+
+    A submodule given ``'*'`` instead of names is imported, and exports its
+    ``__all__``.
+    '''
+    # Importing a submodule binds it to its name in its package's
+    # dictionary, which would hide an export of the same name (e.g.,
+    # wait_all). Properties of the module's class take precedence.
+    shadowed = {}
+    for submodule, names in exports.iteritems():
+        export = submodule.lstrip('.')
+        if names != '*' and export in names:
+            shadowed[export] = property(partial(_get_export, submodule,
+                                                export))
+    cls = LazyModule
+    if shadowed:
+        cls = type(str('LazyModule'), (LazyModule,), shadowed)
+    module = cls(sys.modules[name],
+                 {submodule: names for submodule, names in exports.iteritems()
+                  if names != '*'})
+    sys.modules[name] = module
+    # Only import these once the LazyModule is in sys.modules, so that
+    # they are bound to it rather than to the module it replaced.
+    for submodule, names in exports.iteritems():
+        if names == '*':
+            module._add_exports(
+                    submodule,
+                    importlib.import_module(submodule, name).__all__)
+
+
+def _get_export(submodule, name, module):
+    return getattr(importlib.import_module(submodule, module.__name__), name)
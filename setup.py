@@ -37,12 +37,15 @@ setup(
         'ddp.messages.server',
         'ddp.pod',
         'ddp.pubsub',
+        'ddp.store',
+        'ddp.testing',
     ],
     package_data={
         '': ['LICENSE.txt'],
     },
     install_requires=[
         'autobahn[asyncio,accelerate]',
+        'futures',
         'trollius==0.3',
     ],
     test_suite='tests',
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.subscriber import Subscriber
+from ddp.testing.ddp_server import DDPServer
+
+__all__ = ['BoardTestCase', 'DDPServerTestCase', 'run_loop', 'sleep']
+
+
+class BoardTestCase(unittest.TestCase):
+    '''Gives each test a ``MessageBoard`` on a new event loop, and records
+    what is published to the topics passed to ``record``.
+    '''
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.published = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    def record(self, topic):
+        def subscriber(topic, *args):
+            self.published.append((topic, ) + args)
+        Subscriber(self.board, {topic: subscriber}).subscribe()
+
+
+class DDPServerTestCase(unittest.TestCase):
+    '''Starts a ``DDPServer`` on a new event loop for each test.
+
+    Subclasses add the server's methods and publications in
+    ``set_up_server``.
+    '''
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        # autobahn looks up the current event loop.
+        asyncio.set_event_loop(self.loop)
+        self.server = DDPServer(self.loop)
+        self.set_up_server(self.server)
+        self.loop.run_until_complete(self.server.start())
+
+    def tearDown(self):
+        self.server.close()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def set_up_server(self, server):
+        pass
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(
+                asyncio.wait_for(coroutine, 5, loop=self.loop))
+
+
+def run_loop(loop):
+    '''Run ``loop`` until the callbacks scheduled so far, and a few
+    rounds of those they schedule, have run.
+    '''
+    for _ in range(10):
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+
+def sleep(loop, duration):
+    '''Run ``loop`` for ``duration`` seconds.'''
+    loop.run_until_complete(asyncio.sleep(duration, loop=loop))
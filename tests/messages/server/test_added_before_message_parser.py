@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.messages.server.added_before_message import AddedBeforeMessage
+from ddp.messages.server.added_before_message_parser import (
+    AddedBeforeMessageParser,
+)
+
+
+class AddedBeforeMessageParserTestCase(unittest.TestCase):
+    def setUp(self):
+        self.parser = AddedBeforeMessageParser()
+
+    def test_with_fields(self):
+        message = self.parser.parse({'msg': 'addedBefore',
+                                     'collection': 'collection', 'id': 'id',
+                                     'before': 'before', 'fields': {'a': 1}})
+        self.assertEqual(message, AddedBeforeMessage(
+                'collection', 'id', 'before', fields={'a': 1}))
+
+    def test_without_fields(self):
+        message = self.parser.parse({'msg': 'addedBefore',
+                                     'collection': 'collection', 'id': 'id',
+                                     'before': 'before'})
+        self.assertEqual(message, AddedBeforeMessage('collection', 'id',
+                                                     'before'))
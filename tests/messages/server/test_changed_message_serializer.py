@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.messages.server.changed_message import ChangedMessage
+from ddp.messages.server.changed_message_serializer import (
+    ChangedMessageSerializer,
+)
+
+
+class ChangedMessageSerializerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.serializer = ChangedMessageSerializer()
+
+    def test_with_cleared_with_fields(self):
+        pod = self.serializer.serialize(ChangedMessage(
+                'collection', 'id', cleared=['a'], fields={'b': 1}))
+        self.assertEqual(pod, {'msg': 'changed', 'collection': 'collection',
+                               'id': 'id', 'cleared': ['a'],
+                               'fields': {'b': 1}})
+
+    def test_without_cleared_without_fields(self):
+        pod = self.serializer.serialize(ChangedMessage('collection', 'id'))
+        self.assertEqual(pod, {'msg': 'changed', 'collection': 'collection',
+                               'id': 'id'})
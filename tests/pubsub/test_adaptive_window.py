@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.pubsub.adaptive_window import AdaptiveWindow
+
+
+class AdaptiveWindowTestCase(unittest.TestCase):
+    def test_grows_while_rtt_is_low(self):
+        window = AdaptiveWindow(initial=4, maximum=8)
+        for _ in range(100):
+            window.update('method', 0.01)
+        self.assertEqual(window.limit, 8)
+
+    def test_shrinks_when_rtt_rises(self):
+        window = AdaptiveWindow(initial=16, minimum=2, period=1000)
+        window.update('method', 0.01)
+        for _ in range(500):
+            window.update('method', 0.1)
+        self.assertEqual(window.limit, 2)
+
+    def test_slow_method(self):
+        window = AdaptiveWindow(initial=16)
+        for index in range(2000):
+            if index % 10:
+                window.update('fast', 0.01)
+            else:
+                window.update('slow', 0.1)
+        self.assertEqual(window.min_rtt('fast'), 0.01)
+        self.assertEqual(window.min_rtt('slow'), 0.1)
+        self.assertGreater(window.limit, 32)
+
+    def test_lasting_slowdown(self):
+        window = AdaptiveWindow(initial=16)
+        for _ in range(100):
+            window.update('method', 0.01)
+        for _ in range(1000):
+            window.update('method', 0.1)
+        self.assertEqual(window.min_rtt('method'), 0.1)
+        self.assertGreater(window.limit, 16)
+
+    def test_fast_outlier(self):
+        window = AdaptiveWindow(initial=16)
+        window.update('method', 0.05)
+        window.update('method', 0.001)
+        for _ in range(500):
+            window.update('method', 0.05)
+        self.assertEqual(window.min_rtt('method'), 0.05)
+        self.assertGreater(window.limit, 16)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            AdaptiveWindow(initial=8, maximum=4)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import unittest
+
+from ddp.pubsub.as_completed import as_completed
+from ddp.pubsub.future import Future
+from ddp.pubsub.timeout_error import TimeoutError
+from ddp.pubsub.wait_all import wait_all
+
+
+class AsCompletedTestCase(unittest.TestCase):
+    def test_yields_in_completion_order(self):
+        futures = [Future() for _ in range(3)]
+        futures[2].set(2)
+        completed = as_completed(futures)
+        self.assertIs(next(completed), futures[2])
+        futures[0].set(0)
+        self.assertIs(next(completed), futures[0])
+        threading.Timer(0.01, futures[1].set, args=(1,)).start()
+        self.assertIs(next(completed), futures[1])
+        with self.assertRaises(StopIteration):
+            next(completed)
+
+    def test_timeout(self):
+        futures = [Future(), Future()]
+        futures[0].set(0)
+        completed = as_completed(futures, timeout=0.01)
+        self.assertIs(next(completed), futures[0])
+        with self.assertRaises(TimeoutError):
+            next(completed)
+
+    def test_empty(self):
+        self.assertEqual(list(as_completed([])), [])
+
+
+class WaitAllTestCase(unittest.TestCase):
+    def test_wait_all(self):
+        futures = [Future() for _ in range(100)]
+        def set_results():
+            for index, future in enumerate(futures):
+                future.set(index)
+        setter = threading.Thread(target=set_results)
+        setter.start()
+        self.assertEqual(
+            [future.get() for future in wait_all(futures, timeout=5)],
+            list(range(100)))
+        setter.join()
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            wait_all([Future()], timeout=0.01)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pstats
+import threading
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.board_profiler import BoardProfiler
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.topic import Topic
+from tests.helpers import run_loop
+
+
+class Slow(Subscriber):
+    def __init__(self, board, topic, clock):
+        super(Slow, self).__init__(board, {topic: self._on_publish})
+        self._clock = clock
+
+    def _on_publish(self, topic, value):
+        self._clock[0] += value
+
+
+class BoardProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.clock = [0]
+        self.parent = Topic('parent')
+        self.child = self.parent + 'child'
+        Slow(self.board, self.parent, self.clock).subscribe()
+        self.calls = []
+        def on_child(topic, value):
+            self.calls.append(value)
+        self.board.subscribe(self.child, on_child)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_entries(self):
+        profiler = BoardProfiler(clock=lambda: self.clock[0])
+        self.board.set_profiler(profiler)
+        self.board.publish(self.child, 2)
+        self.board.publish(self.child, 3)
+        self.board.publish(self.parent, 1)
+        run_loop(self.loop)
+        self.assertEqual(self.calls, [2, 3])
+        entries = profiler.entries()
+        self.assertEqual(entries[0], {
+            'subscriber': 'Slow._on_publish', 'topic': 'parent:child',
+            'calls': 2, 'total': 5, 'max': 3})
+        self.assertEqual(entries[1]['topic'], 'parent')
+        self.assertEqual(entries[1]['total'], 1)
+        self.assertEqual(entries[2]['subscriber'],
+                         __name__ + '.on_child')
+        self.assertEqual(entries[2]['total'], 0)
+        report = profiler.report(limit=1)
+        self.assertIn('Slow._on_publish (parent:child)', report)
+        self.assertNotIn('on_child', report)
+
+    def test_switch(self):
+        profiler = BoardProfiler()
+        self.board.publish(self.child, 1)
+        run_loop(self.loop)
+        self.board.set_profiler(profiler)
+        self.board.publish(self.child, 1)
+        run_loop(self.loop)
+        self.board.set_profiler(None)
+        self.board.publish(self.child, 1)
+        run_loop(self.loop)
+        self.assertEqual(self.calls, [1, 1, 1])
+        self.assertEqual([entry['calls'] for entry in profiler.entries()],
+                         [1, 1])
+        profiler.reset()
+        self.assertEqual(profiler.entries(), [])
+
+    def test_sampled(self):
+        profiler = BoardProfiler(sample_rate=1)
+        self.board.set_profiler(profiler)
+        self.board.publish(self.child, 1)
+        run_loop(self.loop)
+        self.assertEqual(self.calls, [1])
+        report = profiler.report()
+        self.assertIn('Sampled 2 calls:', report)
+        self.assertIn('_on_publish', report.split('Sampled')[1])
+
+    def test_report_while_sampling(self):
+        profiler = BoardProfiler(sample_rate=1)
+        # Seed the profile, so that the report below reads it.
+        profiler.dispatch(lambda topic: None, self.child)
+        started = threading.Event()
+        proceed = threading.Event()
+        def subscriber(topic):
+            started.set()
+            proceed.wait()
+        dispatcher = threading.Thread(target=profiler.dispatch,
+                                      args=(subscriber, self.child))
+        dispatcher.start()
+        started.wait()
+        reporter = threading.Thread(target=profiler.report)
+        reporter.start()
+        reporter.join(0.05)
+        proceed.set()
+        dispatcher.join()
+        reporter.join()
+        # The report waited for the call, rather than cutting its profile
+        # short.
+        stats = pstats.Stats(profiler._profile).stats
+        cumulative, = [ct for (_, _, name), (_, _, _, ct, _)
+                       in stats.iteritems() if name == 'subscriber']
+        self.assertGreaterEqual(cumulative, 0.04)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.messages.client.connect_message import ConnectMessage
+from ddp.messages.server.failed_message import FailedMessage
+from ddp.pubsub.ddp_connector import DDPConnector
+from ddp.pubsub.topics import (MessageReceivedFailed, MessageSendConnect,
+                               SocketOpened)
+from tests.helpers import BoardTestCase, sleep
+
+__all__ = ['DDPConnectorTestCase']
+
+
+class DDPConnectorTestCase(BoardTestCase):
+    def test_version_negotiation(self):
+        DDPConnector(self.board).subscribe()
+        self.record(MessageSendConnect)
+        self.board.publish(SocketOpened)
+        sleep(self.loop, 0)
+        self.board.publish(MessageReceivedFailed, FailedMessage('pre2'))
+        self.board.publish(SocketOpened)
+        sleep(self.loop, 0)
+        versions = ['1', 'pre2', 'pre1']
+        self.assertEqual(self.published, [
+            (MessageSendConnect, ConnectMessage('1', support=versions)),
+            (MessageSendConnect, ConnectMessage('pre2', support=versions)),
+        ])
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.deadline_heap import DeadlineHeap
+from tests.helpers import sleep
+
+__all__ = ['DeadlineHeapTestCase']
+
+
+class DeadlineHeapTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.expired = []
+        self.deadlines = DeadlineHeap(self.loop, self.expired.extend)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_expires_in_order(self):
+        self.deadlines.add('b', 0.02)
+        self.deadlines.add('a', 0.01)
+        self.deadlines.add('c', 10)
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.expired, ['a', 'b'])
+        self.assertEqual(len(self.deadlines), 1)
+
+    def test_discard(self):
+        self.deadlines.add('a', 0.01)
+        self.deadlines.discard('a')
+        self.deadlines.discard('missing')
+        sleep(self.loop, 0.02)
+        self.assertEqual(self.expired, [])
+        self.assertNotIn('a', self.deadlines)
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import threading
+import time
 import unittest
 
 from ddp.pubsub.future import Future
@@ -48,3 +49,51 @@ class FutureTestCase(unittest.TestCase):
     def test_get_interruptable(self):
         Future().get()
 
+    def test_set_exception(self):
+        future = Future()
+        future.set_exception(ValueError('error'))
+        with self.assertRaises(ValueError):
+            future.get()
+
+    def test_callback(self):
+        future = Future()
+        results = []
+        future.add_done_callback(lambda future: results.append(future.get()))
+        future.set('result')
+        self.assertEqual(results, ['result'])
+
+    def test_wakes_waiter(self):
+        future = Future()
+        timer = threading.Timer(0.01, future.set, args=('result',))
+        timer.start()
+        self.assertEqual(future.get(timeout=5), 'result')
+        timer.join()
+
+    def test_wakes_waiter_in_other_thread(self):
+        future = Future()
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(future.get(timeout=5)))
+        waiter.start()
+        future.set('result')
+        waiter.join()
+        self.assertEqual(results, ['result'])
+
+    def test_shared_condition(self):
+        condition = threading.Condition()
+        first = Future(condition)
+        second = Future(condition)
+        results = []
+        def wait():
+            try:
+                results.append(first.get())
+            except TimeoutError as error:
+                results.append(error)
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.01)
+        second.set('second')
+        time.sleep(0.01)
+        first.set('first')
+        waiter.join(5)
+        self.assertEqual(results, ['first'])
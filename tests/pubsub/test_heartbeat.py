@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.messages.client.connect_message import ConnectMessage
+from ddp.messages.pong_message import PongMessage
+from ddp.pubsub.heartbeat import Heartbeat
+from ddp.pubsub.topics import (DDPConnected, MessageReceivedPong,
+                               MessageSendConnect, MessageSendPing,
+                               RawReceived, SocketAbort)
+from tests.helpers import BoardTestCase, sleep
+
+__all__ = ['HeartbeatTestCase']
+
+
+class HeartbeatTestCase(BoardTestCase):
+    def setUp(self):
+        super(HeartbeatTestCase, self).setUp()
+        self.heartbeat = Heartbeat(self.board, self.loop, interval=0.02,
+                                   timeout=0.02)
+        self.heartbeat.subscribe()
+        self.record(MessageSendPing)
+        self.record(SocketAbort)
+
+    def connect(self, version):
+        self.board.publish(MessageSendConnect, ConnectMessage(version))
+        self.board.publish(DDPConnected)
+
+    def test_pong(self):
+        self.connect('1')
+        sleep(self.loop, 0.03)
+        self.assertEqual(len(self.published), 1)
+        topic, ping = self.published[0]
+        self.board.publish(MessageReceivedPong, PongMessage(id=ping.id))
+        sleep(self.loop, 0.01)
+        self.assertIsNotNone(self.heartbeat.latency)
+        self.assertEqual(self.heartbeat.timeouts, 0)
+
+    def test_received_defers_ping(self):
+        self.connect('1')
+        for _ in range(3):
+            sleep(self.loop, 0.01)
+            self.board.publish(RawReceived, '{}')
+        self.assertEqual(self.published, [])
+
+    def test_received_keeps_timer(self):
+        self.connect('1')
+        sleep(self.loop, 0)
+        handle = self.heartbeat._idle_handle
+        for _ in range(3):
+            self.board.publish(RawReceived, '{}')
+        sleep(self.loop, 0)
+        self.assertIs(self.heartbeat._idle_handle, handle)
+
+    def test_timeout(self):
+        self.connect('1')
+        sleep(self.loop, 0.06)
+        self.assertEqual([p[0] for p in self.published],
+                         [MessageSendPing, SocketAbort])
+        self.assertEqual(self.heartbeat.timeouts, 1)
+
+    def test_pre1(self):
+        self.connect('pre1')
+        sleep(self.loop, 0.03)
+        self.assertEqual(self.published, [])
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.backoff import Backoff
+from ddp.pubsub.idle_suspender import IdleSuspender
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.socket_reconnector import SocketReconnector
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.topics import (DDPConnected, MessageReceivedResult,
+                               SocketClose, SocketClosed, SocketOpen)
+from tests.helpers import sleep
+
+__all__ = ['IdleSuspenderTestCase']
+
+
+class HoldingCaller(object):
+    def __init__(self):
+        self.holds = 0
+
+    def hold(self):
+        self.holds += 1
+
+
+class IdleSuspenderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.busy = False
+        self.published = []
+        backoff = Backoff(initial=0, jitter=False)
+        self.reconnector = SocketReconnector(self.board, self.loop,
+                                             backoff=backoff)
+        self.reconnector.subscribe()
+        self.caller = HoldingCaller()
+        self.suspender = IdleSuspender(self.board, self.loop,
+                                       self.reconnector, self.caller,
+                                       lambda: self.busy, 0.02)
+        self.suspender.subscribe()
+        for topic in [SocketClose, SocketOpen]:
+            self.record(topic)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def record(self, topic):
+        def subscriber(topic, *args):
+            self.published.append(topic)
+        Subscriber(self.board, {topic: subscriber}).subscribe()
+
+    def close(self):
+        self.board.publish(SocketClosed, True, 1000, None)
+        sleep(self.loop, 0.01)
+
+    def test_suspend(self):
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0.04)
+        self.assertEqual(self.published, [SocketClose])
+        self.assertTrue(self.suspender.is_suspended())
+        self.assertEqual(self.caller.holds, 1)
+        self.close()
+        # The reconnector does not reopen the socket.
+        self.assertEqual(self.published, [SocketClose])
+        self.assertTrue(self.suspender.is_suspended())
+        self.assertEqual(self.suspender.suspensions, 1)
+
+    def test_busy(self):
+        self.busy = True
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.published, [])
+        self.busy = False
+        sleep(self.loop, 0.03)
+        self.assertEqual(self.published, [SocketClose])
+
+    def test_activity_defers(self):
+        self.board.publish(DDPConnected)
+        for _ in range(4):
+            sleep(self.loop, 0.01)
+            self.suspender.touch()
+        self.board.publish(MessageReceivedResult, None)
+        sleep(self.loop, 0.01)
+        self.assertEqual(self.published, [])
+        sleep(self.loop, 0.03)
+        self.assertEqual(self.published, [SocketClose])
+
+    def test_touch_resumes(self):
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0.04)
+        self.close()
+        self.suspender.touch()
+        sleep(self.loop, 0.01)
+        self.assertEqual(self.published, [SocketClose, SocketOpen])
+        self.assertFalse(self.suspender.is_suspended())
+        # The reconnector is back.
+        self.published = []
+        self.close()
+        self.assertEqual(self.published, [SocketOpen])
+
+    def test_touch_while_closing(self):
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0.04)
+        self.suspender.touch()
+        sleep(self.loop, 0.01)
+        self.assertEqual(self.published, [SocketClose])
+        self.close()
+        self.assertEqual(self.published, [SocketClose, SocketOpen])
+
+    def test_touch_while_connected(self):
+        self.board.publish(DDPConnected)
+        self.suspender.touch()
+        sleep(self.loop, 0.01)
+        self.assertEqual(self.published, [])
+
+    def test_unsubscribe(self):
+        self.board.publish(DDPConnected)
+        self.suspender.unsubscribe()
+        sleep(self.loop, 0.04)
+        self.assertEqual(self.published, [])
+
+    def test_unsubscribe_while_resuming(self):
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0.04)
+        self.close()
+        self.suspender.touch()
+        self.suspender.unsubscribe()
+        sleep(self.loop, 0.01)
+        self.assertEqual(self.published, [SocketClose])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.messages.server.added_message import AddedMessage
+from ddp.messages.server.added_message_parser import AddedMessageParser
+from ddp.messages.server.ready_message import ReadyMessage
+from ddp.messages.server.ready_message_parser import ReadyMessageParser
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.message_parsers import MessageParsers
+from ddp.pubsub.topics import (MessageReceived, MessageReceivedAdded,
+                               MessageReceivedReady, PodAccepted)
+from tests.helpers import run_loop
+
+
+class MessageParsersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.table = MessageParsers.table([AddedMessageParser(),
+                                           ReadyMessageParser()])
+        self.received = []
+        self.boards = [MessageBoard(self.loop) for _ in range(2)]
+        for board in self.boards:
+            MessageParsers(board, self.table).subscribe()
+            board.subscribe(MessageReceived, lambda topic, message:
+                            self.received.append((topic, message)))
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_parse(self):
+        first, second = self.boards
+        first.publish(PodAccepted + 'added', {'msg': 'added', 'id': 'a',
+                                              'collection': 'c'})
+        second.publish(PodAccepted + 'ready', {'msg': 'ready',
+                                               'subs': ['1']})
+        second.publish(PodAccepted + 'unknown', {'msg': 'unknown'})
+        run_loop(self.loop)
+        self.assertEqual(self.received, [
+            (MessageReceivedAdded, AddedMessage('c', 'a')),
+            (MessageReceivedReady, ReadyMessage(['1'])),
+        ])
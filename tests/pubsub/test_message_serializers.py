@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.messages.client.sub_message import SubMessage
+from ddp.messages.client.sub_message_serializer import SubMessageSerializer
+from ddp.messages.client.unsub_message import UnsubMessage
+from ddp.messages.client.unsub_message_serializer import (
+    UnsubMessageSerializer,
+)
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.message_serializers import MessageSerializers
+from ddp.pubsub.topics import (MessageSend, MessageSendSub,
+                               MessageSendUnsub, PodSend)
+from tests.helpers import run_loop
+
+
+class MessageSerializersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        MessageSerializers(self.board, MessageSerializers.table([
+                SubMessageSerializer(), UnsubMessageSerializer()
+        ])).subscribe()
+        self.sent = []
+        self.board.subscribe(PodSend, lambda topic, pod:
+                             self.sent.append((topic, pod)))
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_serialize(self):
+        self.board.publish(MessageSendSub, SubMessage('1', 'tasks'))
+        self.board.publish(MessageSendUnsub, UnsubMessage('1'))
+        self.board.publish(MessageSend + 'unknown', object())
+        run_loop(self.loop)
+        self.assertEqual(self.sent, [
+            (PodSend + 'sub', {'msg': 'sub', 'id': '1', 'name': 'tasks'}),
+            (PodSend + 'unsub', {'msg': 'unsub', 'id': '1'}),
+        ])
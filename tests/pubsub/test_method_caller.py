@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.id_generator import build_id_generator
+from ddp.messages.client.method_message_factory import MethodMessageFactory
+from ddp.messages.server.result_message import ResultMessage
+from ddp.pubsub.connection_lost_error import ConnectionLostError
+from ddp.pubsub.constants import DISCONNECT_FAIL
+from ddp.pubsub.fixed_window import FixedWindow
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.method_caller import MethodCaller
+from ddp.pubsub.method_metrics import MethodMetrics
+from ddp.pubsub.result_cache import ResultCache
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.timeout_error import TimeoutError
+from ddp.pubsub.topics import (DDPConnected, MessageReceivedResult,
+                               MessageSendMethod, SocketClosed)
+from tests.helpers import run_loop
+
+__all__ = ['MethodCallerTestCase']
+
+
+class MethodCallerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.sent = []
+        Subscriber(self.board, {
+                MessageSendMethod: lambda topic, message:
+                        self.sent.append(message)}).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def build_caller(self, **kwargs):
+        caller = MethodCaller(self.board,
+                              MethodMessageFactory(build_id_generator()),
+                              **kwargs)
+        caller.subscribe()
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        return caller
+
+    def reply(self, message, **kwargs):
+        self.board.publish(MessageReceivedResult,
+                           ResultMessage(message.id, **kwargs))
+
+    def test_call(self):
+        caller = self.build_caller()
+        future = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(caller.in_flight, 1)
+        self.reply(self.sent[0], result=2)
+        run_loop(self.loop)
+        self.assertEqual(future.result(), ResultMessage(self.sent[0].id,
+                                                        result=2))
+        self.assertEqual(caller.in_flight, 0)
+
+    def test_window(self):
+        caller = self.build_caller(window=FixedWindow(2))
+        futures = [caller.call(asyncio.Future(loop=self.loop), 'm', [i])
+                   for i in range(5)]
+        run_loop(self.loop)
+        self.assertEqual([m.params for m in self.sent], [[0], [1]])
+        self.assertEqual(caller.in_flight, 2)
+        self.assertEqual(caller.queued, 3)
+
+        self.reply(self.sent[1], result=None)
+        run_loop(self.loop)
+        self.assertEqual([m.params for m in self.sent], [[0], [1], [2]])
+        self.assertTrue(futures[1].done())
+        self.assertEqual(caller.queued, 2)
+
+    def test_timeout(self):
+        caller = self.build_caller(window=FixedWindow(1), loop=self.loop,
+                                   timeout=0.01)
+        sent = caller.call(asyncio.Future(loop=self.loop), 'm', [0])
+        queued = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        kept = caller.call(asyncio.Future(loop=self.loop), 'm', [2],
+                           timeout=10)
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        self.assertIsInstance(sent.exception(), TimeoutError)
+        self.assertIsInstance(queued.exception(), TimeoutError)
+        self.assertFalse(kept.done())
+        self.assertEqual(caller.timed_out, 2)
+        self.assertEqual(caller.queued, 0)
+        self.assertEqual([m.params for m in self.sent], [[0], [2]])
+
+        # A late result for an expired call is ignored.
+        self.reply(self.sent[0], result=None)
+        run_loop(self.loop)
+        self.assertFalse(kept.done())
+
+    def test_resend_after_reconnect(self):
+        caller = self.build_caller()
+        future = caller.call(asyncio.Future(loop=self.loop), 'm', [0])
+        run_loop(self.loop)
+        self.board.publish(SocketClosed, False, 1006, None)
+        run_loop(self.loop)
+        queued = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(caller.awaiting_resend, 1)
+
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(self.sent[1], self.sent[0])
+        self.assertEqual(self.sent[2].params, [1])
+        self.reply(self.sent[1], result=None)
+        run_loop(self.loop)
+        self.assertTrue(future.done())
+        self.assertFalse(queued.done())
+
+    def test_fail_on_disconnect(self):
+        caller = self.build_caller(on_disconnect=DISCONNECT_FAIL)
+        failed = caller.call(asyncio.Future(loop=self.loop), 'm', [0])
+        resent = caller.call(asyncio.Future(loop=self.loop), 'm', [1],
+                             on_disconnect='resend')
+        run_loop(self.loop)
+        self.board.publish(SocketClosed, False, 1006, None)
+        run_loop(self.loop)
+        self.assertIsInstance(failed.exception(), ConnectionLostError)
+        self.assertFalse(resent.done())
+        self.assertEqual(caller.in_flight, 1)
+
+    def test_fail_all(self):
+        caller = self.build_caller(window=FixedWindow(1))
+        resent = caller.call(asyncio.Future(loop=self.loop), 'm', [0])
+        run_loop(self.loop)
+        self.board.publish(SocketClosed, False, 1006, None)
+        run_loop(self.loop)
+        queued = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        self.assertEqual(caller.awaiting_resend, 1)
+        caller.fail_all(ConnectionLostError('closed'))
+        for future in [resent, queued]:
+            self.assertIsInstance(future.exception(), ConnectionLostError)
+        self.assertEqual(caller.awaiting_resend, 0)
+        self.assertEqual(caller.in_flight, 0)
+        self.assertEqual(caller.queued, 0)
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 1)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            self.build_caller(on_disconnect='ignore')
+
+    def test_when_drained(self):
+        caller = self.build_caller()
+        drained = []
+        caller.call(asyncio.Future(loop=self.loop), 'm', [0])
+        caller.when_drained(lambda: drained.append(True))
+        run_loop(self.loop)
+        self.assertEqual(drained, [])
+        self.reply(self.sent[0], result=None)
+        run_loop(self.loop)
+        self.assertEqual(drained, [True])
+
+    def test_cache(self):
+        caller = self.build_caller(cache=ResultCache())
+        caller.cache_method('m', 60)
+        first = caller.call(asyncio.Future(loop=self.loop), 'm',
+                            [{'a': 1, 'b': 2}])
+        run_loop(self.loop)
+        self.reply(self.sent[0], result=3)
+        run_loop(self.loop)
+        second = caller.call(asyncio.Future(loop=self.loop), 'm',
+                             [{'b': 2, 'a': 1}])
+        self.assertTrue(second.done())
+        self.assertEqual(second.result(), first.result())
+        caller.call(asyncio.Future(loop=self.loop), 'm', [{'a': 2}])
+        caller.call(asyncio.Future(loop=self.loop), 'n', [{'a': 1, 'b': 2}])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 3)
+
+    def test_cache_skips_errors(self):
+        caller = self.build_caller(cache=ResultCache())
+        caller.cache_method('m', 60)
+        caller.call(asyncio.Future(loop=self.loop), 'm', [])
+        run_loop(self.loop)
+        self.reply(self.sent[0], error='error')
+        run_loop(self.loop)
+        caller.call(asyncio.Future(loop=self.loop), 'm', [])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 2)
+
+    def test_cache_method_without_cache(self):
+        caller = self.build_caller()
+        with self.assertRaises(ValueError):
+            caller.cache_method('m', 60)
+
+    def test_coalesce(self):
+        caller = self.build_caller(coalesce=True)
+        first = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        second = caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        other = caller.call(asyncio.Future(loop=self.loop), 'm', [2])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(caller.coalesced, 1)
+        self.reply(self.sent[0], result=1)
+        run_loop(self.loop)
+        self.assertEqual(first.result(), second.result())
+        self.assertFalse(other.done())
+        caller.call(asyncio.Future(loop=self.loop), 'm', [1])
+        run_loop(self.loop)
+        self.assertEqual(len(self.sent), 3)
+
+    def test_coalesce_timeout(self):
+        caller = self.build_caller(coalesce=True, loop=self.loop)
+        first = caller.call(asyncio.Future(loop=self.loop), 'm', [],
+                            timeout=0.01)
+        second = caller.call(asyncio.Future(loop=self.loop), 'm', [])
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        self.assertIsInstance(first.exception(), TimeoutError)
+        self.assertIsInstance(second.exception(), TimeoutError)
+        self.assertEqual(len(self.sent), 1)
+
+    def test_metrics(self):
+        metrics = MethodMetrics()
+        caller = self.build_caller(metrics=metrics, loop=self.loop)
+        caller.call(asyncio.Future(loop=self.loop), 'm', [])
+        caller.call(asyncio.Future(loop=self.loop), 'm', [], timeout=0.01)
+        run_loop(self.loop)
+        self.assertEqual(metrics.snapshot()['m']['in_flight'], 2)
+        self.reply(self.sent[0], result=1)
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        snapshot = metrics.snapshot()['m']
+        self.assertEqual(snapshot['in_flight'], 0)
+        self.assertEqual(snapshot['count'], 1)
+        self.assertEqual(snapshot['failures'], 1)
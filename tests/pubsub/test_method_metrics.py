@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import random
+import unittest
+
+from ddp.pubsub.latency_histogram import LatencyHistogram
+from ddp.pubsub.method_metrics import MethodMetrics
+
+
+class LatencyHistogramTestCase(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram(precision=0.01)
+        generator = random.Random(0)
+        values = [generator.uniform(0.001, 10) for _ in range(10000)]
+        for value in values:
+            histogram.record(value)
+        values.sort()
+        for percentile in (50, 99, 99.9):
+            expected = values[int(percentile / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percentile) / expected,
+                                   1, delta=0.02)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.max, values[-1])
+        self.assertEqual(histogram.percentile(100), values[-1])
+
+    def test_merge(self):
+        histogram = LatencyHistogram()
+        other = LatencyHistogram()
+        for value in (1, 2, 3):
+            histogram.record(value)
+        for value in (0.5, 4):
+            other.record(value)
+        histogram.merge(other)
+        histogram.merge(LatencyHistogram())
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.sum, 10.5)
+        self.assertEqual(histogram.min, 0.5)
+        self.assertEqual(histogram.max, 4)
+        self.assertAlmostEqual(histogram.percentile(50), 2, delta=0.02)
+        with self.assertRaises(ValueError):
+            histogram.merge(LatencyHistogram(precision=0.1))
+
+    def test_zero(self):
+        histogram = LatencyHistogram()
+        histogram.record(0)
+        self.assertEqual(histogram.percentile(50), 0)
+
+
+class MethodMetricsTestCase(unittest.TestCase):
+    def test_snapshot(self):
+        metrics = MethodMetrics()
+        for _ in range(3):
+            metrics.sent('m')
+        metrics.result('m', 0.5, error=False)
+        metrics.result('m', 0.5, error=True)
+        metrics.failed('n', sent=False)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['m']['in_flight'], 1)
+        self.assertEqual(snapshot['m']['count'], 2)
+        self.assertEqual(snapshot['m']['errors'], 1)
+        self.assertEqual(snapshot['m']['p50'], 0.5)
+        self.assertEqual(snapshot['n']['failures'], 1)
+        self.assertEqual(snapshot['n']['in_flight'], 0)
+
+    def test_prometheus(self):
+        metrics = MethodMetrics()
+        metrics.sent('say "hi"')
+        metrics.result('say "hi"', 0.25, error=False)
+        text = metrics.prometheus()
+        self.assertIn('# TYPE ddp_method_call_duration_seconds summary\n',
+                      text)
+        self.assertIn('ddp_method_call_duration_seconds{method="say \\"hi\\"",'
+                      'quantile="0.99"} 0.25\n', text)
+        self.assertIn('ddp_method_call_duration_seconds_count'
+                      '{method="say \\"hi\\""} 1\n', text)
+        self.assertIn('ddp_method_calls_in_flight{method="say \\"hi\\""} 0\n',
+                      text)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.outbox import Outbox
+from ddp.pubsub.socket_publisher import SocketPublisher
+from ddp.pubsub.topics import DDPConnected, RawSend, SocketClosed
+from tests.helpers import run_loop
+
+__all__ = ['OutboxTestCase']
+
+
+class RecordingSocket(SocketPublisher):
+    def __init__(self, board):
+        super(RecordingSocket, self).__init__(board)
+        self.sent = []
+
+    def sendMessage(self, payload, isBinary=False):
+        self.sent.append(payload)
+
+
+class OutboxTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        Outbox(self.board).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def open_socket(self):
+        socket = RecordingSocket(self.board)
+        socket.onOpen()
+        run_loop(self.loop)
+        return socket
+
+    def test_held_until_connected(self):
+        self.board.publish(RawSend, 'method')
+        run_loop(self.loop)
+        socket = self.open_socket()
+        self.board.publish(RawSend, 'connect')
+        run_loop(self.loop)
+        self.assertEqual(socket.sent, ['connect'])
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(socket.sent, ['connect', 'method'])
+
+    def test_connect_not_resent(self):
+        socket = self.open_socket()
+        self.board.publish(RawSend, 'connect')
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.board.publish(SocketClosed, False, 1006, None)
+        run_loop(self.loop)
+        socket = self.open_socket()
+        self.board.publish(RawSend, 'connect')
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(socket.sent, ['connect'])
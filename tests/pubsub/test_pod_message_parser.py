@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pod.pod_message_parser import PodMessageParser
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.pod_message_parser import PodMessageParser as Parser
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.topics import PodReceived, RawReceived
+from tests.helpers import run_loop, sleep
+
+
+class SlowPodMessageParser(PodMessageParser):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def parse(self, raw):
+        if len(raw) >= 10:
+            self.release.wait(5)
+        return super(SlowPodMessageParser, self).parse(raw)
+
+
+class PodMessageParserTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.pods = []
+        Subscriber(self.board, {
+            PodReceived: lambda topic, pod: self.pods.append(pod),
+        }).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_inline(self):
+        Parser(self.board, PodMessageParser()).subscribe()
+        self.board.publish(RawReceived, '{"msg": "ping"}')
+        run_loop(self.loop)
+        self.assertEqual(self.pods, [{'msg': 'ping'}])
+
+    def test_offload_keeps_order(self):
+        parser = SlowPodMessageParser()
+        Parser(self.board, parser, loop=self.loop,
+               offload_threshold=10).subscribe()
+        self.board.publish(RawReceived, '[1]')
+        self.board.publish(RawReceived, '[2, 2, 2, 2]')
+        self.board.publish(RawReceived, '[3]')
+        run_loop(self.loop)
+        # The loop keeps running while the large message is parsed.
+        self.assertEqual(self.pods, [[1]])
+        parser.release.set()
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.pods, [[1], [2, 2, 2, 2], [3]])
+
+    def test_offload_error(self):
+        errors = []
+        self.loop.set_exception_handler(
+                lambda loop, context: errors.append(context['exception']))
+        Parser(self.board, PodMessageParser(), loop=self.loop,
+               offload_threshold=10).subscribe()
+        self.board.publish(RawReceived, '[not json]')
+        self.board.publish(RawReceived, '[3]')
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.pods, [[3]])
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
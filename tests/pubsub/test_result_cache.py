@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+import unittest
+
+from ddp.pubsub.call_key import call_key
+from ddp.pubsub.result_cache import ResultCache
+
+
+class CallKeyTestCase(unittest.TestCase):
+    def test_canonical(self):
+        self.assertEqual(call_key('m', [{'a': 1, 'b': [2, 3]}]),
+                         call_key('m', [{'b': [2, 3], 'a': 1}]))
+        self.assertNotEqual(call_key('m', [1]), call_key('n', [1]))
+        self.assertNotEqual(call_key('m', [1, 2]), call_key('m', [2, 1]))
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = ResultCache()
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 'result', 60, 1)
+        self.assertEqual(cache.get('a'), 'result')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        with self.assertRaises(AttributeError):
+            cache.hits = 0
+
+    def test_expires(self):
+        cache = ResultCache()
+        cache.put('a', 'result', 0.001, 1)
+        time.sleep(0.002)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual((len(cache), cache.bytes), (0, 0))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1, 60, 1)
+        cache.put('b', 2, 60, 1)
+        cache.get('a')
+        cache.put('c', 3, 60, 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_bounded_by_bytes(self):
+        cache = ResultCache(max_bytes=10)
+        cache.put('a', 1, 60, 6)
+        cache.put('b', 2, 60, 6)
+        self.assertEqual((len(cache), cache.bytes), (1, 6))
+        self.assertEqual(cache.get('b'), 2)
+        cache.put('c', 3, 60, 11)
+        self.assertIsNone(cache.get('c'))
+        cache.put('b', 4, 60, 2)
+        self.assertEqual(cache.bytes, 2)
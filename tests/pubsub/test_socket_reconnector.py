@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.backoff import Backoff
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.socket_reconnector import SocketReconnector
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.topics import DDPConnected, SocketError, SocketOpen
+from tests.helpers import sleep
+
+__all__ = ['BackoffTestCase', 'SocketReconnectorTestCase']
+
+
+class BackoffTestCase(unittest.TestCase):
+    def test_without_jitter(self):
+        backoff = Backoff(initial=1, maximum=5, multiplier=2, jitter=False)
+        delays = [backoff.next_delay() for _ in range(5)]
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+        self.assertEqual(backoff.attempts, 5)
+        backoff.reset()
+        self.assertEqual(backoff.next_delay(), 1)
+
+    def test_with_jitter(self):
+        backoff = Backoff(initial=1, maximum=5, multiplier=2)
+        for bound in [1, 2, 4, 5, 5]:
+            self.assertTrue(0 <= backoff.next_delay() <= bound)
+
+
+class SocketReconnectorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.opens = []
+        Subscriber(self.board, {
+                SocketOpen: lambda topic: self.opens.append(
+                        self.loop.time())}).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_backs_off_and_resets(self):
+        backoff = Backoff(initial=0.01, multiplier=4, jitter=False)
+        reconnector = SocketReconnector(self.board, self.loop, backoff)
+        reconnector.subscribe()
+        self.board.publish(SocketError, None)
+        self.board.publish(SocketError, None)
+        sleep(self.loop, 0.03)
+        self.assertEqual(len(self.opens), 1)
+        self.board.publish(SocketError, None)
+        sleep(self.loop, 0.02)
+        self.assertEqual(len(self.opens), 1)
+        self.assertTrue(reconnector.is_waiting())
+        sleep(self.loop, 0.04)
+        self.assertEqual(len(self.opens), 2)
+        self.assertEqual(reconnector.failures, 2)
+
+        self.board.publish(DDPConnected)
+        sleep(self.loop, 0)
+        self.assertEqual(reconnector.failures, 0)
+        self.assertEqual(reconnector.attempts, 2)
+
+    def test_retry_now(self):
+        backoff = Backoff(initial=10, jitter=False)
+        reconnector = SocketReconnector(self.board, self.loop, backoff)
+        reconnector.subscribe()
+        self.board.publish(SocketError, None)
+        sleep(self.loop, 0)
+        self.assertTrue(reconnector.is_waiting())
+        reconnector.retry_now()
+        sleep(self.loop, 0)
+        self.assertEqual(len(self.opens), 1)
+        self.assertFalse(reconnector.is_waiting())
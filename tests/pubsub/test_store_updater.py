@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.id_generator import build_id_generator
+from ddp.messages.client.sub_message import SubMessage
+from ddp.messages.server.added_message import AddedMessage
+from ddp.messages.server.changed_message import ChangedMessage
+from ddp.messages.server.ready_message import ReadyMessage
+from ddp.messages.server.removed_message import RemovedMessage
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.store_updater import StoreUpdater
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.subscription_manager import SubscriptionManager
+from ddp.pubsub.topics import (DDPConnected, Document, MessageReceivedAdded,
+                               MessageReceivedChanged, MessageReceivedReady,
+                               MessageReceivedRemoved, MessageSendSub,
+                               SocketClosed)
+from ddp.store.store import Store
+from tests.helpers import run_loop
+
+__all__ = ['StoreUpdaterTestCase']
+
+
+class StoreUpdaterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.store = Store()
+        self.subs = SubscriptionManager(self.board, build_id_generator())
+        self.subs.subscribe()
+        self.updater = StoreUpdater(
+                self.board, self.store,
+                has_subscriptions=self.subs.has_subscriptions)
+        self.updater.subscribe()
+        self.sent = []
+        Subscriber(self.board, {
+                MessageSendSub: lambda topic, message:
+                        self.sent.append(message)}).subscribe()
+        self.changes = []
+        Subscriber(self.board, {
+                Document: lambda topic, *args:
+                        self.changes.append((str(topic),) + args)}).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_reconcile_stale(self):
+        self.store.add('c', 'kept', {'x': 1})
+        self.store.add('c', 'gone', {'x': 2})
+        self.updater.begin_resync()
+        sub_id = self.subs.sub('pub')
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(self.sent, [SubMessage(sub_id, 'pub')])
+
+        self.board.publish(MessageReceivedAdded,
+                           AddedMessage('c', 'kept', {'x': 3}))
+        run_loop(self.loop)
+        # Stale documents remain readable until the subscription is ready.
+        self.assertTrue(self.store.has('c', 'gone'))
+
+        self.board.publish(MessageReceivedReady, ReadyMessage([sub_id]))
+        run_loop(self.loop)
+        self.assertFalse(self.store.has('c', 'gone'))
+        self.assertEqual(self.store.get('c', 'kept'), {'x': 3})
+
+    def test_resync_after_reconnect(self):
+        sub_id = self.subs.sub('pub')
+        self.board.publish(DDPConnected)
+        for id in ['a', 'b', 'c']:
+            self.board.publish(MessageReceivedAdded,
+                               AddedMessage('c', id, {'x': 1, 'y': 2}))
+        self.board.publish(MessageReceivedReady, ReadyMessage([sub_id]))
+        run_loop(self.loop)
+        self.assertEqual(len(self.changes), 3)
+        del self.changes[:]
+
+        self.board.publish(SocketClosed, False, 1006, None)
+        self.board.publish(DDPConnected)
+        self.board.publish(MessageReceivedAdded,
+                           AddedMessage('c', 'a', {'x': 1, 'y': 2}))
+        self.board.publish(MessageReceivedAdded,
+                           AddedMessage('c', 'b', {'x': 1}))
+        self.board.publish(MessageReceivedChanged,
+                           ChangedMessage('c', 'b', fields={'x': 5}))
+        self.board.publish(MessageReceivedAdded,
+                           AddedMessage('c', 'd', {'x': 1}))
+        run_loop(self.loop)
+        # Nothing is published or lost until the subscriptions are ready.
+        self.assertEqual(self.changes, [])
+        self.assertEqual(len(self.store), 3)
+
+        self.board.publish(MessageReceivedReady, ReadyMessage([sub_id]))
+        run_loop(self.loop)
+        self.assertEqual(self.changes, [
+            ('document:added', 'c', 'd', {'x': 1}),
+            ('document:changed', 'c', 'b', {'x': 5}, ['y']),
+            ('document:removed', 'c', 'c'),
+        ])
+        self.assertEqual(self.store.get('c', 'b'), {'x': 5})
+        self.assertEqual(sorted(self.store.find('c')), ['a', 'b', 'd'])
+
+    def reconnect(self, unsub=None):
+        self.board.publish(SocketClosed, False, 1006, None)
+        run_loop(self.loop)
+        if unsub is not None:
+            self.subs.unsub(unsub)
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+
+    def connect_with(self, *ids):
+        sub_id = self.subs.sub('pub')
+        self.board.publish(DDPConnected)
+        for id in ids:
+            self.board.publish(MessageReceivedAdded,
+                               AddedMessage('c', id, {'x': 1}))
+        self.board.publish(MessageReceivedReady, ReadyMessage([sub_id]))
+        run_loop(self.loop)
+        return sub_id
+
+    def test_unsub_during_resync(self):
+        sub_id = self.connect_with('a', 'b')
+        self.reconnect()
+        self.board.publish(MessageReceivedAdded,
+                           AddedMessage('c', 'a', {'x': 1}))
+        run_loop(self.loop)
+        self.assertTrue(self.updater.is_resyncing())
+        self.subs.unsub(sub_id)
+        run_loop(self.loop)
+        self.assertFalse(self.updater.is_resyncing())
+        self.assertEqual(sorted(self.store.find('c')), ['a'])
+        self.board.publish(MessageReceivedRemoved, RemovedMessage('c', 'a'))
+        run_loop(self.loop)
+        self.assertEqual(len(self.store), 0)
+
+    def test_unsub_while_disconnected(self):
+        sub_id = self.connect_with('a')
+        self.reconnect(unsub=sub_id)
+        self.assertFalse(self.updater.is_resyncing())
+        self.assertEqual(len(self.store), 0)
+
+    def test_no_resync_without_subscriptions(self):
+        self.board.publish(DDPConnected)
+        self.reconnect()
+        self.assertFalse(self.updater.is_resyncing())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.id_generator import build_id_generator
+from ddp.messages.server.nosub_message import NosubMessage
+from ddp.messages.server.ready_message import ReadyMessage
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.subscription_error import SubscriptionError
+from ddp.pubsub.subscription_manager import SubscriptionManager
+from ddp.pubsub.topics import (DDPConnected, MessageReceivedNosub,
+                               MessageReceivedReady, MessageSendSub,
+                               MessageSendUnsub, SocketClosed,
+                               SubscriptionsReady)
+from tests.helpers import run_loop
+
+__all__ = ['SubscriptionManagerTestCase']
+
+
+class SubscriptionManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.subs = SubscriptionManager(self.board, build_id_generator())
+        self.subs.subscribe()
+        self.published = []
+        def record(topic, *args):
+            self.published.append(topic)
+        Subscriber(self.board, {
+                MessageSendSub: record,
+                MessageSendUnsub: record,
+                SubscriptionsReady: record}).subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_resubscribe_after_reconnect(self):
+        first = self.subs.sub('a')
+        run_loop(self.loop)
+        self.assertEqual(self.published, [])
+        self.board.publish(DDPConnected)
+        second = self.subs.sub('b')
+        run_loop(self.loop)
+        self.assertEqual(self.published, [MessageSendSub, MessageSendSub])
+
+        self.board.publish(MessageReceivedReady, ReadyMessage([first]))
+        self.board.publish(MessageReceivedReady, ReadyMessage([second]))
+        run_loop(self.loop)
+        self.assertEqual(self.published[-1], SubscriptionsReady)
+
+        del self.published[:]
+        self.board.publish(SocketClosed, False, 1006, None)
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        self.assertEqual(self.published, [MessageSendSub, MessageSendSub])
+
+    def test_futures(self):
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        ready = asyncio.Future(loop=self.loop)
+        refused = asyncio.Future(loop=self.loop)
+        ready_id = self.subs.sub('a', future=ready)
+        refused_id = self.subs.sub('b', future=refused)
+        self.board.publish(MessageReceivedReady, ReadyMessage([ready_id]))
+        self.board.publish(MessageReceivedNosub,
+                           NosubMessage(refused_id, error={'error': 404}))
+        run_loop(self.loop)
+        self.assertEqual(ready.result(), ready_id)
+        self.assertIsInstance(refused.exception(), SubscriptionError)
+        self.assertEqual(refused.exception().error, {'error': 404})
+
+    def test_unsub(self):
+        self.board.publish(DDPConnected)
+        run_loop(self.loop)
+        id = self.subs.sub('a')
+        self.subs.unsub(id)
+        run_loop(self.loop)
+        self.assertEqual(self.published, [MessageSendSub, MessageSendUnsub])
+        self.assertFalse(self.subs.has_subscriptions())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.constants import TRAFFIC_RECEIVED, TRAFFIC_SENT
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.read_traffic import read_traffic
+from ddp.pubsub.topics import RawReceived, RawSend
+from ddp.pubsub.traffic_recorder import TrafficRecorder
+from tests.helpers import run_loop
+
+
+class TrafficRecorderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.file = io.BytesIO()
+        self.times = iter([1.5, 2.5, 3.5])
+        self.recorder = TrafficRecorder(self.board, self.file,
+                                        clock=lambda: next(self.times))
+        self.recorder.subscribe()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def read(self, data):
+        return list(read_traffic(io.BytesIO(data)))
+
+    def test_record(self):
+        self.board.publish(RawReceived, b'{"msg":"connected"}')
+        self.board.publish(RawSend, u'{"msg":"method","params":["\xe9"]}')
+        run_loop(self.loop)
+        self.assertEqual(self.read(self.file.getvalue()), [
+            (1.5, TRAFFIC_RECEIVED, b'{"msg":"connected"}'),
+            (2.5, TRAFFIC_SENT, u'{"msg":"method","params":["\xe9"]}'
+                                .encode('utf-8')),
+        ])
+
+    def test_append(self):
+        self.board.publish(RawReceived, b'a')
+        run_loop(self.loop)
+        self.recorder.unsubscribe()
+        # A second recorder on the same file does not repeat the header.
+        recorder = TrafficRecorder(self.board, self.file, clock=lambda: 9.0)
+        recorder.subscribe()
+        self.board.publish(RawReceived, b'b')
+        run_loop(self.loop)
+        self.assertEqual(self.read(self.file.getvalue()),
+                         [(1.5, TRAFFIC_RECEIVED, b'a'),
+                          (9.0, TRAFFIC_RECEIVED, b'b')])
+
+    def test_truncated(self):
+        self.board.publish(RawReceived, b'complete')
+        self.board.publish(RawReceived, b'cut short')
+        run_loop(self.loop)
+        data = self.file.getvalue()[:-1]
+        self.assertEqual(self.read(data),
+                         [(1.5, TRAFFIC_RECEIVED, b'complete')])
+
+    def test_not_a_capture(self):
+        with self.assertRaises(ValueError):
+            self.read(b'{"msg":"connected"}')
+
+    def test_close(self):
+        self.recorder.close()
+        self.assertTrue(self.file.closed)
+        self.board.publish(RawReceived, b'a')
+        run_loop(self.loop)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.pubsub.constants import TRAFFIC_RECEIVED, TRAFFIC_SENT
+from ddp.pubsub.message_board import MessageBoard
+from ddp.pubsub.topics import PodReceived, RawReceived
+from ddp.pubsub.traffic_replayer import TrafficReplayer
+
+
+class TrafficReplayerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.board = MessageBoard(self.loop)
+        self.received = []
+        # Republish, as a parser would, to check that the replay waits
+        # for messages published by subscribers too.
+        self.board.subscribe(RawReceived, lambda topic, raw:
+                             self.board.publish(PodReceived, raw))
+        self.board.subscribe(PodReceived, lambda topic, raw:
+                             self.received.append((self.loop.time(), raw)))
+        self.replayer = TrafficReplayer(self.board, self.loop)
+        self.frames = [
+            (10.0, TRAFFIC_RECEIVED, b'a'),
+            (10.1, TRAFFIC_SENT, b'b'),
+            (10.2, TRAFFIC_RECEIVED, b'c'),
+            (10.4, TRAFFIC_RECEIVED, b'd'),
+        ]
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_as_fast_as_possible(self):
+        count = self.loop.run_until_complete(
+                self.replayer.replay(self.frames, batch=2))
+        self.assertEqual(count, 3)
+        self.assertEqual([raw for _, raw in self.received],
+                         [b'a', b'c', b'd'])
+
+    def test_realtime(self):
+        count = self.loop.run_until_complete(
+                self.replayer.replay(self.frames, realtime=True, speed=2))
+        self.assertEqual(count, 3)
+        start = self.received[0][0]
+        gaps = [time - start for time, _ in self.received]
+        for gap, expected in zip(gaps, [0, 0.1, 0.2]):
+            self.assertAlmostEqual(gap, expected, delta=0.05)
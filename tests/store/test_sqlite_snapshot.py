@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ddp.store.sqlite_snapshot import SQLiteSnapshot
+from ddp.store.store import Store
+
+
+class SQLiteSnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.snapshot = SQLiteSnapshot(os.path.join(self.directory, 'db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_missing(self):
+        store = Store()
+        self.assertEqual(self.snapshot.load(store), 0)
+        self.assertEqual(len(store), 0)
+
+    def test_save_and_load(self):
+        original = Store()
+        original.add('c', 'a', {'x': [1, 2]})
+        original.add('d', 'b', {'y': {'z': 'text'}})
+        self.snapshot.save(original.documents())
+        original.remove('c', 'a')
+        self.snapshot.save(original.documents())
+
+        store = Store()
+        self.assertEqual(self.snapshot.load(store), 1)
+        self.assertFalse(store.has('c', 'a'))
+        self.assertEqual(store.get('d', 'b'), {'y': {'z': 'text'}})
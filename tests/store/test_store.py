@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.store.store import Store
+
+
+class StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+
+    def test_add(self):
+        self.store.add('c', 'a', {'x': 1})
+        self.assertTrue(self.store.has('c', 'a'))
+        self.assertEqual(self.store.get('c', 'a'), {'x': 1})
+        self.assertEqual(len(self.store), 1)
+
+    def test_change(self):
+        self.store.add('c', 'a', {'x': 1, 'y': 2})
+        fields = self.store.documents()[0][2]
+        self.store.change('c', 'a', fields={'x': 3}, cleared=['y'])
+        self.assertEqual(self.store.get('c', 'a'), {'x': 3})
+        # Documents are replaced, not modified in place.
+        self.assertEqual(fields, {'x': 1, 'y': 2})
+
+    def test_remove(self):
+        self.store.add('c', 'a')
+        self.store.remove('c', 'a')
+        self.store.remove('c', 'missing')
+        self.assertFalse(self.store.has('c', 'a'))
+        self.assertEqual(self.store.collections(), [])
+
+    def test_find(self):
+        self.store.add('c', 'a', {'x': 1})
+        self.store.add('c', 'b', {'x': 2})
+        self.assertEqual(self.store.find('c'), {'a': {'x': 1},
+                                                'b': {'x': 2}})
+        self.assertEqual(self.store.find('missing'), {})
+
+    def test_version(self):
+        version = self.store.version
+        self.store.add('c', 'a')
+        self.assertGreater(self.store.version, version)
+
+    def test_diff(self):
+        self.store.add('c', 'same', {'x': 1})
+        self.store.add('c', 'changed', {'x': 1, 'y': 2})
+        self.store.add('c', 'removed', {'x': 1})
+        other = Store()
+        other.add('c', 'same', {'x': 1})
+        other.add('c', 'changed', {'x': 2, 'z': 3})
+        other.add('d', 'added', {'x': 1})
+        added, changed, removed = self.store.diff(other)
+        self.assertEqual(added, [('d', 'added', {'x': 1})])
+        self.assertEqual(changed, [('c', 'changed', {'x': 2, 'z': 3}, ['y'])])
+        self.assertEqual(removed, [('c', 'removed')])
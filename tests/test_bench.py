@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From
+
+from ddp.bench import LoadGenerator, _split, summarize
+from ddp.pubsub.latency_histogram import LatencyHistogram
+from tests.helpers import DDPServerTestCase
+
+
+class LoadGeneratorTestCase(DDPServerTestCase):
+    def set_up_server(self, server):
+        server.add_echo_method()
+        server.add_flood_publication()
+
+    def run_generator(self, **kwargs):
+        generator = LoadGenerator(self.loop, self.server.url, 3, 'echo',
+                                  params=[1],
+                                  subscriptions=[('flood', [5])],
+                                  client_kwargs={'heartbeat_interval': None},
+                                  **kwargs)
+        @asyncio.coroutine
+        def run():
+            yield From(generator.connect())
+            yield From(generator.run(0.2))
+            yield From(generator.close())
+        self.run_coroutine(run())
+        return generator.result()
+
+    def test_closed_loop(self):
+        result = self.run_generator(concurrency=2)
+        self.assertEqual(result['clients'], 3)
+        self.assertGreater(result['calls'], 6)
+        self.assertEqual(result['latencies'].count, result['calls'])
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['failures'], 0)
+        self.assertEqual(result['reconnects'], 0)
+
+    def test_open_loop(self):
+        result = self.run_generator(rate=50)
+        self.assertEqual(result['calls'], 10)
+        self.assertEqual(result['errors'], 0)
+
+
+class SummarizeTestCase(unittest.TestCase):
+    def result(self, pid, clients, calls, latency, rss_connected):
+        latencies = LatencyHistogram()
+        for _ in range(calls):
+            latencies.record(latency)
+        return {'clients': clients, 'calls': calls, 'errors': 1,
+                'failures': 0, 'latencies': latencies, 'reconnects': 1,
+                'elapsed': 2, 'pid': pid, 'rss_before': 1000,
+                'rss_connected': rss_connected}
+
+    def test_summarize(self):
+        summary = summarize([self.result(1, 2, 10, 0.001, 5000),
+                             self.result(1, 2, 10, 0.003, 6000),
+                             self.result(2, 4, 20, 0.003, 9000)])
+        self.assertEqual(summary['clients'], 8)
+        self.assertEqual(summary['calls'], 40)
+        self.assertEqual(summary['errors'], 3)
+        self.assertEqual(summary['reconnects'], 3)
+        self.assertEqual(summary['calls_per_second'], 20)
+        self.assertAlmostEqual(summary['latency_p50_ms'], 3, delta=0.1)
+        self.assertAlmostEqual(summary['latency_max_ms'], 3)
+        # Threads of one process share its memory.
+        self.assertEqual(summary['memory_per_client'], (5000 + 8000) / 8)
+
+    def test_split(self):
+        self.assertEqual(_split(10, 3), [4, 3, 3])
+        self.assertEqual(_split(2, 4), [1, 1])
+        self.assertEqual(_split(5, 0), [5])
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From
+
+from ddp.ddp_client import DDPClient
+from ddp.pubsub.connection_lost_error import ConnectionLostError
+from ddp.pubsub.constants import (DISCONNECT_FAIL, TRAFFIC_RECEIVED,
+                                   TRAFFIC_SENT)
+from ddp.pubsub.read_traffic import read_traffic
+from ddp.pubsub.subscriber import Subscriber
+from ddp.pubsub.topics import (RawReceived, SocketClose, SocketClosed,
+                               SocketOpened)
+from tests.helpers import DDPServerTestCase, sleep
+
+
+class RecordReplayTestCase(DDPServerTestCase):
+    def setUp(self):
+        super(RecordReplayTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'traffic')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(RecordReplayTestCase, self).tearDown()
+
+    def set_up_server(self, server):
+        server.add_echo_method()
+        server.add_flood_publication()
+
+    def test_record_and_replay(self):
+        client = DDPClient(self.loop, self.server.url,
+                           heartbeat_interval=None, record_path=self.path)
+        @asyncio.coroutine
+        def record():
+            yield From(client.connect())
+            yield From(client.subscribe_async('flood', 10, 2))
+            yield From(client.call_async('echo', 1))
+            yield From(client.close())
+        self.run_coroutine(record())
+
+        with open(self.path, 'rb') as capture:
+            directions = set(direction for _, direction, _
+                             in read_traffic(capture))
+        self.assertEqual(directions, {TRAFFIC_RECEIVED, TRAFFIC_SENT})
+
+        replayed = DDPClient(self.loop, self.server.url,
+                             heartbeat_interval=None)
+        count = self.run_coroutine(replayed.replay_async(self.path))
+        self.assertGreater(count, 30)
+        self.assertEqual(sorted(replayed.store.documents()),
+                         sorted(client.store.documents()))
+        self.assertEqual(replayed.store.get('flood', '9')['version'], 2)
+
+
+class CloseTestCase(DDPServerTestCase):
+    def setUp(self):
+        super(CloseTestCase, self).setUp()
+        self.client = DDPClient(self.loop, self.server.url,
+                                heartbeat_interval=None)
+
+    def set_up_server(self, server):
+        server.add_echo_method(name='slow', delay=5)
+
+    def test_reconnect(self):
+        self.server.add_echo_method()
+        self.run_coroutine(self.client.connect())
+        session, = self.server.sessions
+        session.dropConnection(abort=True)
+        result = self.run_coroutine(self.client.call_async('echo', 1))
+        self.assertEqual(result.result, [1])
+        # The server drops a client that sends connect twice.
+        self.assertEqual(len(self.server.sessions), 1)
+        self.assertIsNot(self.server.sessions[0], session)
+        self.run_coroutine(self.client.close())
+
+    def test_close_while_opening(self):
+        events = []
+        def record(topic, *args):
+            events.append(topic)
+        Subscriber(self.client.board, {SocketClosed: record,
+                                       SocketOpened: record}).subscribe()
+        self.client.open()
+        closed = self.client.close(drain=False)
+        closed.add_done_callback(lambda future: events.append('closed'))
+        self.assertFalse(closed.done())
+        self.run_coroutine(closed)
+        self.assertEqual(events, [SocketOpened, SocketClosed, 'closed'])
+
+    def test_close_while_failing_to_open(self):
+        client = DDPClient(self.loop, 'ws://127.0.0.1:1/websocket',
+                           heartbeat_interval=None)
+        client.open()
+        self.run_coroutine(client.close(drain=False))
+
+    def test_close_twice(self):
+        subscribers = self.client.board._subscribers
+        self.run_coroutine(self.client.connect())
+        opened = len(subscribers[SocketOpened])
+        self.run_coroutine(self.client.close())
+        self.run_coroutine(self.client.close())
+        self.assertEqual(len(subscribers[SocketOpened]), opened + 1)
+
+    def test_close_fails_pending_calls(self):
+        self.run_coroutine(self.client.connect())
+        pending = self.client.call_async('slow', 1)
+        self.run_coroutine(self.client.close(drain=False))
+        self.assertIsInstance(pending.exception(), ConnectionLostError)
+        self.assertEqual(self.client.stats()['method_calls_in_flight'], 0)
+        late = self.client.call_async('slow', 2)
+        self.assertIsInstance(late.exception(), ConnectionLostError)
+
+
+class IdleSuspensionTestCase(DDPServerTestCase):
+    def setUp(self):
+        super(IdleSuspensionTestCase, self).setUp()
+        self.client = DDPClient(self.loop, self.server.url,
+                                heartbeat_interval=None, idle_timeout=0.05)
+
+    def tearDown(self):
+        self.run_coroutine(self.client.close())
+        super(IdleSuspensionTestCase, self).tearDown()
+
+    def set_up_server(self, server):
+        server.add_echo_method()
+        server.add_flood_publication()
+
+    def test_suspend_and_resume(self):
+        self.run_coroutine(self.client.connect())
+        result = self.run_coroutine(self.client.call_async('echo', 1))
+        self.assertEqual(result.result, [1])
+        sleep(self.loop, 0.15)
+        self.assertTrue(self.client.is_suspended())
+        self.assertFalse(self.client.is_connected())
+        self.assertEqual(self.server.sessions, [])
+        # The call waits for the connection to be reopened.
+        result = self.run_coroutine(self.client.call_async('echo', 2))
+        self.assertEqual(result.result, [2])
+        self.assertFalse(self.client.is_suspended())
+        self.assertEqual(self.client.stats()['idle_suspensions'], 1)
+
+    def test_call_while_suspending(self):
+        self.run_coroutine(self.client.connect())
+        futures = []
+        def call(topic):
+            futures.append(self.client.call_async(
+                    'echo', 1, on_disconnect=DISCONNECT_FAIL))
+        closing = Subscriber(self.client.board, {SocketClose: call})
+        closing.subscribe()
+        sleep(self.loop, 0.1)
+        closing.unsubscribe()
+        result = self.run_coroutine(futures[0])
+        self.assertEqual(result.result, [1])
+        self.assertEqual(self.client.stats()['idle_suspensions'], 1)
+
+    def test_subscription_keeps_open(self):
+        self.run_coroutine(self.client.connect())
+        self.run_coroutine(self.client.subscribe_async('flood', 1))
+        sleep(self.loop, 0.15)
+        self.assertFalse(self.client.is_suspended())
+        self.assertTrue(self.client.is_connected())
+
+    def test_warm_up(self):
+        self.run_coroutine(self.client.connect())
+        sleep(self.loop, 0.15)
+        self.assertTrue(self.client.is_suspended())
+        self.run_coroutine(self.client.connect())
+        self.assertTrue(self.client.is_connected())
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = DDPClient(self.loop, 'ws://127.0.0.1:3000/websocket',
+                                heartbeat_interval=None)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_reports(self):
+        reports = []
+        profiler = self.client.start_profiling(report_interval=0.05,
+                                               on_report=reports.append)
+        self.assertIs(self.client.profiler, profiler)
+        self.client.board.publish(RawReceived, '{"msg":"ping"}')
+        self.loop.run_until_complete(asyncio.sleep(0.12, loop=self.loop))
+        self.assertGreaterEqual(len(reports), 2)
+        self.assertIn('PodMessageParser._on_received (raw:received)',
+                      reports[0])
+        self.assertIs(self.client.stop_profiling(), profiler)
+        self.assertIsNone(self.client.profiler)
+        count = len(reports)
+        self.loop.run_until_complete(asyncio.sleep(0.06, loop=self.loop))
+        self.assertEqual(len(reports), count)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import unittest
+
+from ddp.concurrent_ddp_client import ConcurrentDDPClient
+from ddp.ddp_client_hub import DDPClientHub
+from ddp.loop_thread import LoopThread
+from ddp.pubsub.connection_lost_error import ConnectionLostError
+from ddp.testing.ddp_server import DDPServer
+
+
+class DDPClientHubTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server_thread = LoopThread(name='DDPServer')
+        self.server_thread.start()
+        self.server = DDPServer(self.server_thread.loop)
+        self.server.add_echo_method()
+        self.server.add_echo_method(name='slow', delay=5)
+        self.server_thread.call(self.server.start).get(timeout=5)
+        self.hub = DDPClientHub(threads=2, heartbeat_interval=None)
+        self.hub.start()
+
+    def tearDown(self):
+        self.hub.stop()
+        self.hub.join()
+        self.server_thread.call(self.server.close).get(timeout=5)
+        self.server_thread.stop()
+        self.server_thread.join()
+
+    def start_clients(self, count):
+        clients = [self.hub.client(self.server.url) for _ in range(count)]
+        for client in clients:
+            client.start()
+        return clients
+
+    def test_threads(self):
+        clients = self.start_clients(6)
+        names = [thread.name for thread in threading.enumerate()]
+        self.assertEqual(sorted(name for name in names
+                                if name.startswith('DDPClient')),
+                         ['DDPClientHub-0', 'DDPClientHub-1'])
+        loops = [client._loop for client in clients]
+        self.assertEqual(len(set(loops)), 2)
+        self.assertEqual(set(loops),
+                         set(loop_thread.loop
+                             for loop_thread in self.hub.loop_threads))
+
+    def test_call(self):
+        clients = self.start_clients(4)
+        futures = [client.call('echo', index)
+                   for index, client in enumerate(clients)]
+        results = [future.get(timeout=5).result for future in futures]
+        self.assertEqual(results, [[index] for index in range(4)])
+
+    def test_stop_client(self):
+        stopped, running = self.start_clients(2)
+        self.assertEqual(stopped.call('echo', 1).get(timeout=5).result, [1])
+        stopped.stop()
+        stopped.join()
+        self.assertFalse(stopped._client.is_connected())
+        self.assertEqual(running.call('echo', 2).get(timeout=5).result, [2])
+        # The thread that hosted it still hosts new clients.
+        client, = self.start_clients(1)
+        self.assertEqual(client.call('echo', 3).get(timeout=5).result, [3])
+
+    def test_stop_fails_pending_calls(self):
+        client, = self.start_clients(1)
+        pending = client.call('slow', 1)
+        client.stop()
+        client.join()
+        with self.assertRaises(ConnectionLostError):
+            pending.get(timeout=5)
+
+    def test_read_on_loop(self):
+        client = self.hub.client(self.server.url, method_metrics=True)
+        client.start()
+        self.assertEqual(client.call('echo', 1).get(timeout=5).result, [1])
+        self.assertEqual(client.stats()['method_calls_in_flight'], 0)
+        self.assertEqual(client.metrics.snapshot()['echo']['count'], 1)
+        self.assertIsNone(client.profile_report())
+        client.start_profiling()
+        self.assertIn('subscriber (topic)', client.profile_report())
+
+    def test_client_kwargs(self):
+        client = self.hub.client(self.server.url, max_in_flight=1)
+        self.assertEqual(client._client_args[2],
+                         {'heartbeat_interval': None, 'max_in_flight': 1})
+
+    def test_threads_at_least_one(self):
+        with self.assertRaises(ValueError):
+            DDPClientHub(threads=0)
+
+
+class DedicatedThreadTestCase(unittest.TestCase):
+    def test_call(self):
+        server_thread = LoopThread(name='DDPServer')
+        server_thread.start()
+        server = DDPServer(server_thread.loop)
+        server.add_echo_method()
+        server_thread.call(server.start).get(timeout=5)
+        client = ConcurrentDDPClient(server.url, heartbeat_interval=None)
+        client.start()
+        try:
+            result = client.call('echo', 1).get(timeout=5)
+            self.assertEqual(result.result, [1])
+        finally:
+            client.stop()
+            client.join()
+            server_thread.call(server.close).get(timeout=5)
+            server_thread.stop()
+            server_thread.join()
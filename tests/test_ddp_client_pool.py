@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp.ddp_client_pool import (
+    DDPClientPool,
+    ROUTE_LEAST_IN_FLIGHT,
+    ROUTE_ROUND_ROBIN,
+)
+from tests.helpers import DDPServerTestCase, run_loop
+
+
+class RecordingClient(object):
+    def __init__(self, loop):
+        self.calls = []
+        self.closed = False
+        self.connected = False
+        self.opened = False
+        self.suspended = False
+        self._loop = loop
+
+    def open(self):
+        self.opened = True
+
+    def close(self, drain=True):
+        self.closed = True
+        future = asyncio.Future(loop=self._loop)
+        future.set_result(None)
+        return future
+
+    def is_connected(self):
+        return self.connected
+
+    def is_suspended(self):
+        return self.suspended
+
+    def call(self, future, method, *params, **kwargs):
+        self.calls.append((future, method, params))
+
+    def stats(self):
+        return {}
+
+
+class DDPClientPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.clients = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    def build_pool(self, routing=ROUTE_LEAST_IN_FLIGHT, replace_after=30):
+        def client_factory():
+            client = RecordingClient(self.loop)
+            client.connected = True
+            self.clients.append(client)
+            return client
+        return DDPClientPool(self.loop, 'ws://example.com/websocket',
+                             size=3, routing=routing,
+                             replace_after=replace_after,
+                             client_factory=client_factory)
+
+    def call(self, pool, *args, **kwargs):
+        future = asyncio.Future(loop=self.loop)
+        pool.call(future, 'method', *args, **kwargs)
+        return future
+
+    def counts(self):
+        return [len(client.calls) for client in self.clients]
+
+    def test_round_robin(self):
+        pool = self.build_pool(routing=ROUTE_ROUND_ROBIN)
+        for _ in range(6):
+            self.call(pool)
+        self.assertEqual(self.counts(), [2, 2, 2])
+
+    def test_least_in_flight(self):
+        pool = self.build_pool()
+        first = self.call(pool)
+        self.call(pool)
+        self.call(pool)
+        self.clients[0].calls[0][0].set_result(None)
+        run_loop(self.loop)
+        self.assertTrue(first.done())
+        self.call(pool)
+        self.assertEqual(self.counts(), [2, 1, 1])
+
+    def test_skips_disconnected(self):
+        pool = self.build_pool(routing=ROUTE_ROUND_ROBIN)
+        self.clients[1].connected = False
+        for _ in range(4):
+            self.call(pool)
+        self.assertEqual(self.counts(), [2, 0, 2])
+
+    def test_sticky(self):
+        pool = self.build_pool()
+        for _ in range(5):
+            self.call(pool, key='user')
+        self.assertEqual(sorted(self.counts()), [0, 0, 5])
+
+    def test_replace(self):
+        pool = self.build_pool(replace_after=0.01)
+        pool.open()
+        down = self.clients[0]
+        down.connected = False
+        future = self.call(pool, key=0)
+        self.assertEqual(len(down.calls), 1)
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        self.assertTrue(down.closed)
+        self.assertEqual(len(self.clients), 4)
+        replacement = self.clients[3]
+        self.assertIs(pool.clients[0], replacement)
+        self.assertTrue(replacement.opened)
+        self.assertEqual([call[1:] for call in replacement.calls],
+                         [('method', ())])
+        self.assertEqual(pool.stats()['clients_replaced'], 1)
+        # Failing the call on the replaced client does not fail it.
+        down.calls[0][0].set_exception(RuntimeError())
+        replacement.calls[0][0].set_result('result')
+        run_loop(self.loop)
+        self.assertEqual(future.result(), 'result')
+        self.loop.run_until_complete(pool.close())
+
+    def test_suspended_not_replaced(self):
+        pool = self.build_pool(replace_after=0.01)
+        pool.open()
+        self.clients[0].connected = False
+        self.clients[0].suspended = True
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+        self.assertEqual(pool.stats()['clients_replaced'], 0)
+        self.assertFalse(self.clients[0].closed)
+        self.loop.run_until_complete(pool.close())
+
+    def test_invalid_routing(self):
+        with self.assertRaises(ValueError):
+            self.build_pool(routing='random')
+
+
+class IdleSuspensionTestCase(DDPServerTestCase):
+    def set_up_server(self, server):
+        server.add_echo_method()
+
+    def test_suspended_clients_kept(self):
+        pool = DDPClientPool(self.loop, self.server.url, size=2,
+                             replace_after=0.2, idle_timeout=0.1,
+                             heartbeat_interval=None)
+        self.loop.run_until_complete(pool.connect())
+        self.loop.run_until_complete(asyncio.sleep(1, loop=self.loop))
+        self.assertTrue(all(client.is_suspended()
+                            for client in pool.clients))
+        self.assertEqual(pool.stats()['clients_replaced'], 0)
+        result = self.run_coroutine(pool.call_async('echo', 1))
+        self.assertEqual(result.result, [1])
+        self.loop.run_until_complete(pool.close())
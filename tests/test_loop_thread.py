@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From, Return
+
+from ddp.loop_thread import LoopThread
+
+
+class LoopThreadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop_thread = LoopThread()
+        self.loop_thread.start()
+
+    def tearDown(self):
+        self.loop_thread.stop()
+        self.loop_thread.join()
+
+    def test_call(self):
+        future = self.loop_thread.call(asyncio.get_event_loop)
+        self.assertIs(future.get(timeout=5), self.loop_thread.loop)
+
+    def test_call_exception(self):
+        future = self.loop_thread.call(int, 'x')
+        with self.assertRaises(ValueError):
+            future.get(timeout=5)
+
+    def test_call_coroutine(self):
+        @asyncio.coroutine
+        def add(a, b):
+            yield From(asyncio.sleep(0, loop=self.loop_thread.loop))
+            raise Return(a + b)
+        self.assertEqual(self.loop_thread.call(add, 1, 2).get(timeout=5), 3)
+
+    def test_stop(self):
+        self.loop_thread.stop()
+        self.loop_thread.join()
+        self.assertFalse(self.loop_thread.is_alive())
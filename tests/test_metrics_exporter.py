@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+import urllib2
+
+from ddp.metrics_exporter import MetricsExporter
+
+
+class MetricsExporterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exporter = MetricsExporter(lambda: 'metric 1\n', port=0)
+        self.exporter.start()
+        self.url = 'http://{}:{}'.format(*self.exporter.address)
+
+    def tearDown(self):
+        self.exporter.stop()
+
+    def test_serves_metrics(self):
+        response = urllib2.urlopen(self.url + '/metrics')
+        self.assertEqual(response.read(), 'metric 1\n')
+        self.assertTrue(
+            response.info()['Content-Type'].startswith('text/plain'))
+
+    def test_not_found(self):
+        with self.assertRaises(urllib2.HTTPError):
+            urllib2.urlopen(self.url + '/other')
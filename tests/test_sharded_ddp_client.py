@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import multiprocessing
+import unittest
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+
+from ddp import pubsub
+from ddp.shard_worker import ShardWorker
+from ddp.sharded_ddp_client import ShardedDDPClient
+from tests.helpers import sleep
+
+URL = 'ws://example.com/websocket'
+
+
+class ShardWorkerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.worker = ShardWorker(self.loop, child_connection, URL, [], 0.01,
+                                  {'heartbeat_interval': None})
+        self.worker.subscribe()
+        self.board = self.worker._client.board
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_batches_changes(self):
+        self.board.publish(pubsub.DocumentAdded, 'c', '1', {'a': 1})
+        self.board.publish(pubsub.DocumentChanged, 'c', '1', {'b': 2}, ['a'])
+        self.board.publish(pubsub.DocumentRemoved, 'c', '2')
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.connection.recv(), ('changes', [
+            ('added', 'c', '1', {'a': 1}),
+            ('changed', 'c', '1', {'b': 2}, ['a']),
+            ('removed', 'c', '2'),
+        ]))
+        self.assertFalse(self.connection.poll())
+
+    def test_ready_after_changes(self):
+        self.board.publish(pubsub.SubscriptionsReady)
+        self.board.publish(pubsub.DocumentAdded, 'c', '1', {'a': 1})
+        sleep(self.loop, 0.05)
+        self.assertEqual(self.connection.recv()[0], 'changes')
+        self.assertEqual(self.connection.recv(), ('ready',))
+
+
+class ShardedDDPClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = ShardedDDPClient(URL, ['a', ('b', [1]), 'c'], shards=2)
+
+    def test_deals_subscriptions(self):
+        self.assertEqual(self.client._subscriptions, [
+            [('a', []), ('c', [])],
+            [('b', [1])],
+        ])
+
+    def test_merged_reads(self):
+        batches = []
+        self.client.on_changes(batches.append)
+        self.client._apply(0, [('added', 'c', '1', {'a': 1}),
+                               ('added', 'c', '2', {'a': 2})])
+        self.client._apply(1, [('added', 'c', '1', {'b': 2}),
+                               ('added', 'd', '1', {})])
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(self.client.get('c', '1'), {'a': 1, 'b': 2})
+        self.assertEqual(self.client.find('c'), {
+            '1': {'a': 1, 'b': 2},
+            '2': {'a': 2},
+        })
+        self.assertEqual(sorted(self.client.collections()), ['c', 'd'])
+        self.assertEqual(len(self.client), 3)
+        self.client._apply(1, [('changed', 'c', '1', {}, ['b']),
+                               ('removed', 'd', '1')])
+        self.assertEqual(self.client.get('c', '1'), {'a': 1})
+        self.assertFalse(self.client.has('d', '1'))
+        self.assertIsNone(self.client.get('d', '1'))
+
+    def test_ready_without_subscriptions(self):
+        client = ShardedDDPClient(URL, [])
+        client.wait_ready(timeout=0)
+
+    def test_snapshot_path(self):
+        with self.assertRaises(ValueError):
+            ShardedDDPClient(URL, ['a'], snapshot_path='tasks.db')
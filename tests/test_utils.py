@@ -18,9 +18,24 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import importlib
+import os
+import subprocess
+import sys
+import types
 import unittest
 
-from ddp.utils import default
+from ddp.utils import LazyModule, default
+
+_LAZY_PACKAGES = [
+    'ddp',
+    'ddp.messages',
+    'ddp.messages.client',
+    'ddp.messages.server',
+    'ddp.pod',
+    'ddp.pubsub',
+    'ddp.store',
+]
 
 
 class DefaultTestCase(unittest.TestCase):
@@ -51,3 +66,62 @@ class DefaultTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             default(self.obj, value=self.value, factory=self.factory)
 
+
+class LazyExportsTestCase(unittest.TestCase):
+    def test_exports(self):
+        for name in _LAZY_PACKAGES:
+            package = importlib.import_module(name)
+            self.assertIsInstance(package, LazyModule)
+            for export in package.__all__:
+                value = getattr(package, export)
+                self.assertNotIsInstance(value, types.ModuleType)
+                submodule = importlib.import_module(package._exports[export],
+                                                    name)
+                self.assertIn(export, submodule.__all__)
+                self.assertIs(getattr(submodule, export), value)
+
+    def test_submodules_exported(self):
+        # Every module of a subpackage is exported (ddp picks its own).
+        for name in _LAZY_PACKAGES[1:]:
+            package = importlib.import_module(name)
+            directory = os.path.dirname(package.__file__)
+            exported = set(package._exports.values())
+            for filename in os.listdir(directory):
+                module, extension = os.path.splitext(filename)
+                if extension == '.py' and module != '__init__':
+                    if (name, module) != ('ddp.messages', 'constants'):
+                        self.assertIn('.' + module, exported,
+                                      (name, module))
+
+    def test_submodule_named_like_export(self):
+        importlib.import_module('ddp.pubsub.wait_all')
+        from ddp import pubsub
+        self.assertIsInstance(pubsub.wait_all, types.FunctionType)
+
+    def test_star_submodule(self):
+        # In a fresh interpreter, as the first import of the package matters.
+        code = ('import ddp.messages.client.constants as constants; '
+                'import ddp.messages.server; '
+                "print(' '.join([constants.__name__, "
+                'ddp.messages.client.__name__, '
+                'ddp.messages.server.__name__]))')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=root)
+        self.assertEqual(output.split(), ['ddp.messages.client.constants',
+                                          'ddp.messages.client',
+                                          'ddp.messages.server'])
+
+    def test_missing(self):
+        from ddp import pubsub
+        with self.assertRaises(AttributeError):
+            pubsub.Missing
+
+    def test_import_is_lazy(self):
+        code = ('import sys, ddp.messages; '
+                'print(sorted(name for name in sys.modules '
+                "if name.startswith(('autobahn', 'ddp.pubsub'))))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=root)
+        self.assertEqual(output.strip(), '[]')
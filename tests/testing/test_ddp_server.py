@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2014 Foxdog Studios
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ddp.utils import ensure_asyncio
+ensure_asyncio()
+
+import asyncio
+from asyncio import From
+
+from ddp.ddp_client import DDPClient
+from ddp.pubsub.subscription_error import SubscriptionError
+from tests import helpers
+
+
+class DDPServerTestCase(helpers.DDPServerTestCase):
+    def setUp(self):
+        super(DDPServerTestCase, self).setUp()
+        self.client = DDPClient(self.loop, self.server.url,
+                                heartbeat_interval=None)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.client.close(drain=False))
+        super(DDPServerTestCase, self).tearDown()
+
+    def set_up_server(self, server):
+        server.add_echo_method()
+        server.add_echo_method('slow', delay=0.2)
+        server.add_flood_publication()
+
+    def test_methods(self):
+        @asyncio.coroutine
+        def run():
+            yield From(self.client.connect())
+            slow = self.client.call_async('slow', 1)
+            echo = yield From(self.client.call_async('echo', 2, 'a'))
+            self.assertFalse(slow.done())
+            self.assertEqual(echo.result, [2, 'a'])
+            slow = yield From(slow)
+            self.assertEqual(slow.result, [1])
+            missing = yield From(self.client.call_async('missing'))
+            self.assertEqual(missing.error['error'], 404)
+        self.run_coroutine(run())
+
+    def test_flood(self):
+        @asyncio.coroutine
+        def run():
+            yield From(self.client.connect())
+            yield From(self.client.subscribe_async('flood', 10, 2))
+            store = self.client.store
+            self.assertEqual(len(store), 10)
+            self.assertEqual(store.get('flood', '9')['version'], 2)
+            with self.assertRaises(SubscriptionError):
+                yield From(self.client.subscribe_async('missing'))
+        self.run_coroutine(run())